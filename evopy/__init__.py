@@ -1,4 +1,14 @@
 """The evopy evolutionary strategy algorithm package."""
 from evopy.evopy import EvoPy
 from evopy.strategy import Strategy
+from evopy.repair import Repair
 from evopy.progress_report import ProgressReport
+from evopy.selection import CommaSelection, PlusSelection, TournamentSelection, \
+    TruncationSelection
+from evopy.checkpoint import Checkpointer
+from evopy.history import History
+from evopy.islands import IslandModel, Topology
+from evopy.surrogate import Surrogate
+from evopy.termination import Termination
+from evopy.batch import BatchEvoPy
+from evopy.coordinator import Coordinator
@@ -0,0 +1,256 @@
+"""Module containing the BatchEvoPy class, which evolves many independent runs at once."""
+import time
+
+import numpy as np
+
+from evopy.population import Population
+from evopy.strategy import Strategy
+from evopy.utils import random_with_seed, spawn_generators
+
+
+class BatchEvoPy:  # pylint: disable=too-many-instance-attributes
+    """Evolves R independent runs as one stacked array computation, e.g. for seed sweeps.
+
+    The populations of all runs are kept in arrays of shape (R, P, d), where P is the largest
+    population size of any run. Runs with a smaller population are padded, and their padding is
+    never selected. Each generation, the vectorized fitness function is called once for all runs
+    with an (R, M, d) array of genotypes, and should return an (R, M) array of fitness values, so
+    that problem instances may differ per run.
+
+    Every run draws its random numbers from its own generator, only for its own individuals, so
+    that a run seeded with an integer evolves exactly like a vectorized EvoPy run with the same
+    seed and settings. Runs stop on their own once they reach their fitness target or their
+    maximum run time. The padding of smaller populations, which is filled with the warm start and
+    mutated without randomness, and the genotypes of stopped runs are still passed to the fitness
+    function, to keep the stacked shape, but their results are ignored. Survivors are selected as
+    with PlusSelection.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, fitness_function, individual_length, num_runs, warm_start=None,
+                 generations=100, population_size=30, num_children=1, mean=0, std=1,
+                 maximize=False, strategy=Strategy.SINGLE_VARIANCE, random_seed=None,
+                 target_fitness_value=None, max_run_time=None):
+        """Initializes a BatchEvoPy instance.
+
+        The warm start, population size, mean, standard deviation, fitness target and maximum run
+        time can either be given once for all runs, or per run as a sequence of length num_runs.
+
+        :param fitness_function: the vectorized fitness function, mapping an (R, M, d) array of
+                                 genotypes to an (R, M) array of fitness values
+        :param individual_length: the length of each individual
+        :param num_runs: the number of independent runs R
+        :param warm_start: the individual to start from, or an (R, d) array with one per run
+        :param generations: the number of generations to execute
+        :param population_size: the population size of each generation
+        :param num_children: the number of children generated per parent individual
+        :param mean: the mean for sampling the random offsets of the initial population
+        :param std: the standard deviation for sampling the random offsets of the initial population
+        :param maximize: whether the fitness function should be maximized or minimized
+        :param strategy: the strategy used to generate offspring by individuals. Strategy.CMA is not
+                         supported
+        :param random_seed: either an integer or SeedSequence from which independent Generators
+                            are spawned for all runs, or a sequence of num_runs seeds, one per
+                            run, each of which may be any seed accepted by
+                            evopy.utils.random_with_seed. A single RandomState or Generator can
+                            not be split over the runs, and is therefore not accepted
+        :param target_fitness_value: target fitness value for early stopping
+        :param max_run_time: maximum time allowed to run in seconds
+        """
+        if strategy == Strategy.CMA:
+            raise ValueError("The CMA strategy is not supported by BatchEvoPy.")
+        if num_runs < 1:
+            raise ValueError("There should be at least one run.")
+        if isinstance(random_seed, (np.random.RandomState, np.random.Generator)):
+            raise ValueError("A single RandomState or Generator can not be shared by the runs, "
+                             "pass a seed or one RandomState or Generator per run instead.")
+        self.fitness_function = fitness_function
+        self.individual_length = individual_length
+        self.num_runs = num_runs
+        self.strategy = strategy
+        self.generations = generations
+        self.population_size = population_size
+        self.num_children = num_children
+        self.warm_start = np.zeros(individual_length) if warm_start is None else warm_start
+        self.mean = mean
+        self.std = std
+        self.random_seed = random_seed
+        self.maximize = maximize
+        self.target_fitness_value = target_fitness_value
+        self.max_run_time = max_run_time
+        self.best_fitness = None
+        self.generations_run = None
+
+    def _per_run(self, value, dtype=float):
+        """Broadcast a setting to one value per run.
+
+        :param value: the setting, either a single value or a sequence of num_runs values
+        :param dtype: the type of the values
+        :return: an array holding the value of the setting for each run
+        """
+        return np.broadcast_to(np.asarray(value, dtype=dtype), (self.num_runs,))
+
+    def _randoms(self):
+        """Create the random number generators of all runs.
+
+        :return: a list holding a RandomState or Generator for each run
+        """
+        if self.random_seed is None or isinstance(
+                self.random_seed, (int, np.integer, np.random.SeedSequence)):
+            return spawn_generators(self.random_seed, self.num_runs)
+        if len(self.random_seed) != self.num_runs:
+            raise ValueError("There should be one random seed per run.")
+        return [random_with_seed(seed) for seed in self.random_seed]
+
+    def _scores(self, fitness):
+        """Convert fitness values to scores, of which lower is better.
+
+        :param fitness: the array of fitness values
+        :return: the array of scores
+        """
+        return -fitness if self.maximize else fitness
+
+    def _evaluate(self, genotypes):
+        """Evaluate the stacked genotypes of all runs.
+
+        :param genotypes: the (R, M, d) array of genotypes
+        :return: the (R, M) array of fitness values
+        """
+        fitness = np.asarray(self.fitness_function(genotypes), dtype=float)
+        if fitness.shape != genotypes.shape[:2]:
+            raise ValueError("The fitness function returned an array of shape %s for genotypes of "
+                             "shape %s." % (fitness.shape, genotypes.shape))
+        return fitness
+
+    def _should_stop(self, best_fitness, run_time):
+        """Check which runs can stop early, based on time and fitness target.
+
+        :param best_fitness: the best fitness of each run
+        :param run_time: the time in seconds since the runs started
+        :return: a boolean array holding whether each run should be terminated early
+        """
+        stop = np.zeros(self.num_runs, dtype=bool)
+        if self.max_run_time is not None:
+            stop |= run_time > self._per_run(self.max_run_time)
+        if self.target_fitness_value is not None:
+            stop |= np.abs(best_fitness - self._per_run(self.target_fitness_value)) \
+                < np.finfo(float).eps
+        return stop
+
+    def _init_populations(self, randoms, sizes):
+        """Sample the initial populations of all runs, setting the padding to the warm start.
+
+        :param randoms: the random number generators of the runs
+        :param sizes: the population size of each run
+        :return: the (R, P, d) array of genotypes and the (R, P, k) array of strategy parameters
+        """
+        size = int(np.max(sizes))
+        length = self.individual_length
+        warm_starts = np.broadcast_to(np.asarray(self.warm_start, dtype=float),
+                                      (self.num_runs, length))
+        means, stds = self._per_run(self.mean), self._per_run(self.std)
+        num_parameters = Population.num_strategy_parameters(self.strategy, length)
+        genotypes = np.empty((self.num_runs, size, length))
+        parameters = np.empty((self.num_runs, size, num_parameters))
+        for run, random in enumerate(randoms):
+            parameters[run] = random.standard_normal(num_parameters)
+            genotypes[run, :sizes[run]] = warm_starts[run] + random.normal(
+                loc=means[run], scale=stds[run], size=(sizes[run], length))
+            genotypes[run, sizes[run]:] = warm_starts[run]
+        return genotypes, parameters
+
+    def _reproduce(self, genotypes, parameters, randoms, sizes):
+        """Create the children of all runs at once.
+
+        As in Population.reproduce, the children of each run are ordered by round, and each run
+        draws the normal samples of its children in a single block from its own generator. The
+        children of the padding get zero samples.
+
+        :param genotypes: the (R, P, d) array of parent genotypes
+        :param parameters: the (R, P, k) array of parent strategy parameters
+        :param randoms: the random number generators of the runs
+        :param sizes: the population size of each run
+        :return: the (R, C * P, d) array of child genotypes and (R, C * P, k) array of child
+                 strategy parameters
+        """
+        num_runs, size, length = genotypes.shape
+        num_children = self.num_children * size
+        num_normals = Population.num_normals(self.strategy, length)
+        normals = np.zeros((num_runs, self.num_children, size, num_normals))
+        for run, random in enumerate(randoms):
+            normals[run, :, :sizes[run]] = random.standard_normal(
+                (self.num_children * sizes[run], num_normals)).reshape(self.num_children,
+                                                                       sizes[run], num_normals)
+        genotypes, parameters = Population.mutate(
+            self.strategy,
+            np.tile(genotypes, (1, self.num_children, 1)).reshape(num_runs * num_children, -1),
+            np.tile(parameters, (1, self.num_children, 1)).reshape(num_runs * num_children, -1),
+            normals.reshape(num_runs * num_children, -1))
+        return genotypes.reshape(num_runs, num_children, -1), \
+            parameters.reshape(num_runs, num_children, -1)
+
+    def _rank(self, fitness, valid):
+        """Order the individuals of each run from best to worst, with the padding last.
+
+        :param fitness: the (R, M) array of fitness values
+        :param valid: the (R, M) boolean array which is False for padding
+        :return: the (R, M) array of indices ordering each run
+        """
+        return np.lexsort((self._scores(fitness), ~valid), axis=-1)
+
+    # pylint: disable=too-many-locals
+    def run(self):
+        """Run all evolutionary strategy runs until each has finished or stopped early.
+
+        :return: the (R, d) array of the best genotype of each run, and an (R, generations)
+                 array holding the best fitness so far of each run after each generation, which
+                 is NaN for the generations after the run stopped
+        """
+        if self.individual_length == 0:
+            return np.empty((self.num_runs, 0)), np.full((self.num_runs, self.generations), np.nan)
+
+        sizes = self._per_run(self.population_size, dtype=int)
+        size = int(np.max(sizes))
+        randoms = self._randoms()
+        runs = np.arange(self.num_runs)[:, None]
+
+        genotypes, parameters = self._init_populations(randoms, sizes)
+        valid = np.arange(size) < sizes[:, None]
+        fitness = self._evaluate(genotypes)
+        best = self._rank(fitness, valid)[:, 0]
+        best_genotypes = genotypes[runs[:, 0], best]
+        best_fitness = fitness[runs[:, 0], best]
+
+        history = np.full((self.num_runs, self.generations), np.nan)
+        active = np.ones(self.num_runs, dtype=bool)
+        self.generations_run = np.zeros(self.num_runs, dtype=int)
+        start_time = time.time()
+        for generation in range(self.generations):
+            child_genotypes, child_parameters = self._reproduce(genotypes, parameters, randoms,
+                                                               sizes)
+            child_fitness = self._evaluate(child_genotypes)
+
+            candidates = np.concatenate((child_genotypes, genotypes), axis=1)
+            candidate_fitness = np.concatenate((child_fitness, fitness), axis=1)
+            candidate_valid = np.concatenate((np.tile(valid, (1, self.num_children)), valid),
+                                             axis=1)
+            survivors = self._rank(candidate_fitness, candidate_valid)[:, :size]
+            keep = active[:, None, None]
+            genotypes = np.where(keep, candidates[runs, survivors], genotypes)
+            parameters = np.where(keep, np.concatenate((child_parameters, parameters), axis=1)[
+                runs, survivors], parameters)
+            fitness = np.where(keep[:, :, 0], candidate_fitness[runs, survivors], fitness)
+
+            better = active & (fitness[:, 0] > best_fitness if self.maximize
+                               else fitness[:, 0] < best_fitness)
+            best_genotypes[better] = genotypes[better, 0]
+            best_fitness[better] = fitness[better, 0]
+            history[active, generation] = best_fitness[active]
+            self.generations_run[active] += 1
+
+            active &= ~self._should_stop(best_fitness, time.time() - start_time)
+            if not np.any(active):
+                break
+
+        self.best_fitness = best_fitness
+        return best_genotypes, history
@@ -0,0 +1,249 @@
+"""Benchmark suite measuring the throughput and memory use of evopy.
+
+Run the benchmarks and write the results to a JSON file with::
+
+    python -m evopy.bench run --output results.json
+
+and compare two result files, flagging slowdowns and memory growth, with::
+
+    python -m evopy.bench compare baseline.json results.json
+
+The compare mode exits with status 1 if any benchmark got slower, in generations or evaluations
+per second, or used more peak memory than the allowed thresholds.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from evopy.evopy import EvoPy
+from evopy.strategy import Strategy
+
+
+def sphere(genotypes):
+    """The sphere function, with its minimum of 0 at the origin."""
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def rastrigin(genotypes):
+    """The Rastrigin function, with its minimum of 0 at the origin."""
+    return 10 * genotypes.shape[1] \
+        + np.sum(genotypes ** 2 - 10 * np.cos(2 * np.pi * genotypes), axis=1)
+
+
+def rosenbrock(genotypes):
+    """The Rosenbrock function, with its minimum of 0 at (1, ..., 1)."""
+    return np.sum(100 * (genotypes[:, 1:] - genotypes[:, :-1] ** 2) ** 2
+                  + (1 - genotypes[:, :-1]) ** 2, axis=1)
+
+
+def ackley(genotypes):
+    """The Ackley function, with its minimum of 0 at the origin."""
+    length = genotypes.shape[1]
+    return -20 * np.exp(-0.2 * np.sqrt(np.sum(genotypes ** 2, axis=1) / length)) \
+        - np.exp(np.sum(np.cos(2 * np.pi * genotypes), axis=1) / length) + 20 + np.e
+
+
+PROBLEMS = {
+    'sphere': sphere,
+    'rastrigin': rastrigin,
+    'rosenbrock': rosenbrock,
+    'ackley': ackley,
+}
+
+
+def benchmark(problem, strategy, individual_length, population_size, generations=50,
+              target_fitness_value=1e-2, measure_memory=True, repeats=3, random_seed=0):
+    """Run a single benchmark.
+
+    :param problem: the name of the problem, see PROBLEMS
+    :param strategy: the strategy to benchmark
+    :param individual_length: the dimensionality of the problem
+    :param population_size: the population size
+    :param generations: the number of generations to run
+    :param target_fitness_value: the fitness value of which the time to reach it is measured
+    :param measure_memory: whether to measure the peak memory use, in a separate run
+    :param repeats: the number of timed runs, of which the fastest is reported
+    :param random_seed: the seed to use for the random number generator
+    :return: a dict with the configuration and the measurements of the benchmark
+    """
+    fitness_function = PROBLEMS[problem]
+    counters = {}
+
+    def counting_fitness_function(genotypes):
+        counters['evaluations'] += len(genotypes)
+        return fitness_function(genotypes)
+
+    def reporter(report):
+        counters['generations'] = report.generation + 1
+        if counters['time_to_target'] is None and report.best_fitness <= target_fitness_value:
+            counters['time_to_target'] = time.perf_counter() - counters['start_time']
+
+    def create(fitness, report=None):
+        return EvoPy(fitness, individual_length, generations=generations,
+                     population_size=population_size, strategy=strategy,
+                     random_seed=random_seed, reporter=report, vectorized=True)
+
+    runs = []
+    for _ in range(repeats):
+        counters.update(evaluations=0, generations=0, time_to_target=None)
+        evopy = create(counting_fitness_function, reporter)
+        counters['start_time'] = time.perf_counter()
+        evopy.run()
+        counters['run_time'] = time.perf_counter() - counters['start_time']
+        runs.append(dict(counters))
+    fastest = min(runs, key=lambda run: run['run_time'])
+
+    peak_memory = None
+    if measure_memory:
+        evopy = create(fitness_function)
+        tracemalloc.start()
+        evopy.run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'problem': problem,
+        'strategy': strategy.name,
+        'individual_length': individual_length,
+        'population_size': population_size,
+        'generations': fastest['generations'],
+        'run_time': fastest['run_time'],
+        'generations_per_second': fastest['generations'] / fastest['run_time'],
+        'evaluations_per_second': fastest['evaluations'] / fastest['run_time'],
+        'time_to_target': fastest['time_to_target'],
+        'peak_memory': peak_memory,
+    }
+
+
+def run_suite(problems=None, strategies=None, individual_lengths=(10, 100),
+              population_sizes=(30, 300), **options):
+    """Run a benchmark for every combination of the given configurations.
+
+    :param problems: the names of the problems, defaults to all problems
+    :param strategies: the strategies, defaults to all strategies
+    :param individual_lengths: the dimensionalities of the problems
+    :param population_sizes: the population sizes
+    :param options: further keyword arguments passed to benchmark
+    :return: a dict with the environment and a list of benchmark results
+    """
+    results = [benchmark(problem, strategy, individual_length, population_size, **options)
+               for problem in (problems or sorted(PROBLEMS))
+               for strategy in (strategies or list(Strategy))
+               for individual_length in individual_lengths
+               for population_size in population_sizes]
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+
+def compare(baseline, results, threshold=0.1, memory_threshold=0.1):
+    """Compare two benchmark result sets and find the benchmarks that regressed.
+
+    A benchmark regressed if its generations or evaluations per second dropped by more than the
+    threshold, or if its peak memory use grew by more than the memory threshold. Peak memory is
+    only compared if it was measured in both sets.
+
+    :param baseline: the benchmark results to compare against, see run_suite
+    :param results: the new benchmark results, see run_suite
+    :param threshold: the allowed relative drop in generations and evaluations per second
+    :param memory_threshold: the allowed relative growth in peak memory use
+    :return: a list of (configuration, measurement, baseline, new) tuples, one for each
+             measurement that regressed in a benchmark present in both sets
+    """
+    def key(result):
+        return (result['problem'], result['strategy'], result['individual_length'],
+                result['population_size'])
+
+    baselines = {key(result): result for result in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        before = baselines.get(key(result))
+        if before is None:
+            continue
+        for measurement in ('generations_per_second', 'evaluations_per_second'):
+            if result[measurement] < (1 - threshold) * before[measurement]:
+                regressions.append((key(result), measurement, before[measurement],
+                                    result[measurement]))
+        if before['peak_memory'] is not None and result['peak_memory'] is not None \
+                and result['peak_memory'] > (1 + memory_threshold) * before['peak_memory']:
+            regressions.append((key(result), 'peak_memory', before['peak_memory'],
+                                result['peak_memory']))
+    return regressions
+
+
+def main(arguments=None):
+    """Run the benchmark command line interface.
+
+    :param arguments: the command line arguments, defaults to sys.argv
+    :return: the exit status
+    """
+    parser = argparse.ArgumentParser(prog='python -m evopy.bench', description=__doc__.split(
+        '\n', maxsplit=1)[0])
+    commands = parser.add_subparsers(dest='command')
+    run_parser = commands.add_parser('run', help='run the benchmark suite')
+    run_parser.add_argument('--problems', nargs='+', choices=sorted(PROBLEMS))
+    run_parser.add_argument('--strategies', nargs='+', choices=[s.name for s in Strategy])
+    run_parser.add_argument('--dimensions', nargs='+', type=int, default=[10, 100])
+    run_parser.add_argument('--population-sizes', nargs='+', type=int, default=[30, 300])
+    run_parser.add_argument('--generations', type=int, default=50)
+    run_parser.add_argument('--target', type=float, default=1e-2)
+    run_parser.add_argument('--repeats', type=int, default=3,
+                            help='the number of timed runs per benchmark, the fastest is kept')
+    run_parser.add_argument('--no-memory', action='store_true',
+                            help='skip the second run measuring peak memory use')
+    run_parser.add_argument('--output', help='the JSON file to write, defaults to stdout')
+    compare_parser = commands.add_parser(
+        'compare', help='flag slowdowns and memory growth between two results')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='the allowed relative drop in generations and evaluations '
+                                     'per second')
+    compare_parser.add_argument('--memory-threshold', type=float, default=0.1,
+                                help='the allowed relative growth in peak memory use')
+    options = parser.parse_args(arguments)
+
+    if options.command == 'run':
+        results = run_suite(
+            problems=options.problems,
+            strategies=options.strategies and [Strategy[name] for name in options.strategies],
+            individual_lengths=options.dimensions, population_sizes=options.population_sizes,
+            generations=options.generations, target_fitness_value=options.target,
+            measure_memory=not options.no_memory, repeats=options.repeats)
+        if options.output is None:
+            json.dump(results, sys.stdout, indent=2)
+        else:
+            with open(options.output, 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+        return 0
+
+    if options.command == 'compare':
+        with open(options.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        with open(options.results, encoding='utf-8') as file:
+            results = json.load(file)
+        regressions = compare(baseline, results, options.threshold, options.memory_threshold)
+        for configuration, measurement, before, after in regressions:
+            print('%s %s: %.2f -> %.2f %s' % (
+                'LARGER' if measurement == 'peak_memory' else 'SLOWER',
+                ' '.join(str(value) for value in configuration), before, after,
+                {'generations_per_second': 'generations/s', 'evaluations_per_second':
+                 'evaluations/s', 'peak_memory': 'bytes'}[measurement]))
+        return 1 if regressions else 0
+
+    parser.print_help()
+    return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
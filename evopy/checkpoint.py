@@ -0,0 +1,92 @@
+"""Module containing the Checkpointer class, used to save the state of a run to disk."""
+import json
+import os
+import time
+
+import numpy as np
+
+
+class Checkpointer:
+    """Periodically saves the state of a run, so that it can be resumed with EvoPy.resume.
+
+    Each checkpoint is a single uncompressed .npz file holding the population arrays, the
+    generation counter, the best individual so far and the full random number generator state.
+    The file is written next to its destination first and then moved into place, so a crash
+    while saving never leaves a corrupt checkpoint behind.
+    """
+
+    def __init__(self, path, every=None, interval=None):
+        """Initializes the checkpointer.
+
+        :param path: the file to write checkpoints to, which is overwritten by each checkpoint
+        :param every: save a checkpoint every this many generations
+        :param interval: save a checkpoint when this many seconds have passed since the last one
+        """
+        if every is None and interval is None:
+            raise ValueError("Either the number of generations or the time interval between "
+                             "checkpoints should be given.")
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self._last_time = time.time()
+
+    def due(self, generation):
+        """Check whether a checkpoint should be saved after the given generation.
+
+        :param generation: the number of generations completed so far
+        :return: whether a checkpoint should be saved
+        """
+        return (self.every is not None and generation % self.every == 0) \
+            or (self.interval is not None and time.time() - self._last_time >= self.interval)
+
+    def save(self, state):
+        """Save a checkpoint, atomically replacing the previous one.
+
+        :param state: a dict mapping names to arrays, see save_checkpoint
+        """
+        save_checkpoint(self.path, state)
+        self._last_time = time.time()
+
+
+def save_checkpoint(path, state):
+    """Atomically write a checkpoint to disk.
+
+    :param path: the file to write the checkpoint to
+    :param state: a dict mapping names to arrays or scalars. The value of 'random_state', if
+                  present, is the state dict of a numpy bit generator and is stored as JSON
+    """
+    arrays = dict(state)
+    if 'random_state' in arrays:
+        arrays['random_state'] = np.array(json.dumps(arrays['random_state'], cls=_StateEncoder))
+    temporary_path = '%s.tmp' % path
+    with open(temporary_path, 'wb') as file:
+        np.savez(file, **arrays)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by save_checkpoint.
+
+    :param path: the file to read the checkpoint from
+    :return: a dict mapping names to arrays, with 'random_state' decoded from JSON
+    """
+    with np.load(path, allow_pickle=False) as checkpoint:
+        state = {name: checkpoint[name] for name in checkpoint.files}
+    if 'random_state' in state:
+        state['random_state'] = json.loads(str(state['random_state']))
+    return state
+
+
+class _StateEncoder(json.JSONEncoder):
+    """Encodes the NumPy arrays and integers found in random number generator states."""
+
+    def default(self, o):  # pylint: disable=method-hidden
+        if isinstance(o, np.ndarray):
+            return o.tolist()
+        if isinstance(o, np.integer):
+            return int(o)
+        if isinstance(o, np.floating):
+            return float(o)
+        return json.JSONEncoder.default(self, o)
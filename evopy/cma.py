@@ -0,0 +1,151 @@
+"""Module containing the shared search distribution of the CMA strategy.
+
+The implementation follows the (mu/mu_w, lambda)-CMA-ES as described in:
+[1] Hansen, Nikolaus. (2016). The CMA Evolution Strategy: A Tutorial. arXiv:1604.00772.
+"""
+import numpy as np
+
+
+class CovarianceMatrixAdaptation:  # pylint: disable=too-many-instance-attributes
+    """The search distribution shared by all individuals of the CMA strategy.
+
+    Offspring are sampled from a normal distribution with mean m, step size sigma and covariance
+    matrix C. After each generation, the mean moves to the weighted average of the best mu
+    offspring, C is adapted with a rank-one and a rank-mu update, and sigma with cumulative
+    step-size adaptation. Sampling uses the eigendecomposition C = B D^2 B^T, which is only
+    recomputed once every n / 10 generations, or less often if C adapts slowly. Its O(n^3) cost
+    is then spread out to O(n^2) per generation, while sampling costs O(n^2) per offspring.
+
+    On a problem which is unbounded in the direction of search, sigma grows without limit. Once
+    the adapted distribution or its samples would no longer be finite, the update is skipped and
+    the distribution is marked as diverged, after which the run should stop.
+    """
+
+    def __init__(self, mean, sigma, num_offspring):
+        """Initializes the search distribution, using the default parameters of [1].
+
+        :param mean: the initial mean of the distribution
+        :param sigma: the initial step size
+        :param num_offspring: the number of offspring lambda sampled per generation
+        """
+        self.mean = np.array(mean, dtype=float)
+        self.sigma = float(sigma)
+        self.num_offspring = num_offspring
+        self.length = length = len(self.mean)
+
+        self.num_parents = num_parents = max(num_offspring // 2, 1)
+        weights = np.log(num_parents + 1 / 2) - np.log(np.arange(1, num_parents + 1))
+        self.weights = weights / np.sum(weights)
+        self.mu_eff = mu_eff = 1 / np.sum(self.weights ** 2)
+
+        self.c_c = (4 + mu_eff / length) / (length + 4 + 2 * mu_eff / length)
+        self.c_sigma = (mu_eff + 2) / (length + mu_eff + 5)
+        self.c_1 = 2 / ((length + 1.3) ** 2 + mu_eff)
+        self.c_mu = min(1 - self.c_1,
+                        2 * (mu_eff - 2 + 1 / mu_eff) / ((length + 2) ** 2 + mu_eff))
+        self.d_sigma = 1 + 2 * max(0, np.sqrt((mu_eff - 1) / (length + 1)) - 1) + self.c_sigma
+        self.chi_n = np.sqrt(length) * (1 - 1 / (4 * length) + 1 / (21 * length ** 2))
+        self.eigen_interval = max(num_offspring / (self.c_1 + self.c_mu) / length / 10,
+                                  length // 10 * num_offspring)
+
+        self.p_c = np.zeros(length)
+        self.p_sigma = np.zeros(length)
+        self.covariance = np.identity(length)
+        self.eigenvectors = np.identity(length)
+        self.eigenvalues = np.ones(length)
+        self.evaluations = 0
+        self.eigen_evaluations = 0
+        self.diverged = False
+
+    def sample(self, random, num_offspring=None):
+        """Sample a generation of offspring from the search distribution.
+
+        :param random: the RandomState or Generator to sample with
+        :param num_offspring: the number of offspring to sample, defaults to lambda
+        :return: the (num_offspring, n) array of offspring genotypes
+        """
+        num_offspring = self.num_offspring if num_offspring is None else num_offspring
+        normals = random.standard_normal((num_offspring, self.length))
+        with np.errstate(over='ignore', invalid='ignore'):
+            offspring = self.mean + self.sigma * (normals * self.eigenvalues) @ self.eigenvectors.T
+        if not np.all(np.isfinite(offspring)):
+            self.diverged = True
+        return offspring
+
+    def update(self, genotypes, scores):
+        """Adapt the search distribution to a generation of evaluated offspring.
+
+        :param genotypes: the (lambda, n) array of offspring genotypes
+        :param scores: the scores of the offspring, of which lower is better
+        """
+        self.evaluations += len(genotypes)
+        selected = genotypes[np.argsort(scores, kind='stable')[:self.num_parents]]
+        with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+            mean = self.weights @ selected
+            step = (mean - self.mean) / self.sigma
+
+            inverse_root = (self.eigenvectors / self.eigenvalues) @ self.eigenvectors.T
+            p_sigma = (1 - self.c_sigma) * self.p_sigma + np.sqrt(
+                self.c_sigma * (2 - self.c_sigma) * self.mu_eff) * (inverse_root @ step)
+            norm_p_sigma = np.linalg.norm(p_sigma)
+            h_sigma = norm_p_sigma / np.sqrt(
+                1 - (1 - self.c_sigma) ** (2 * self.evaluations / self.num_offspring)) \
+                / self.chi_n < 1.4 + 2 / (self.length + 1)
+            p_c = (1 - self.c_c) * self.p_c \
+                + h_sigma * np.sqrt(self.c_c * (2 - self.c_c) * self.mu_eff) * step
+
+            steps = (selected - self.mean) / self.sigma
+            covariance = (1 - self.c_1 - self.c_mu) * self.covariance \
+                + self.c_1 * (np.outer(p_c, p_c)
+                              + (1 - h_sigma) * self.c_c * (2 - self.c_c) * self.covariance) \
+                + self.c_mu * (steps.T * self.weights) @ steps
+            sigma = self.sigma * np.exp(self.c_sigma / self.d_sigma
+                                        * (norm_p_sigma / self.chi_n - 1))
+        if not (np.isfinite(sigma) and np.all(np.isfinite(mean))
+                and np.all(np.isfinite(covariance))):
+            self.diverged = True
+            return
+        self.mean, self.p_sigma, self.p_c, self.covariance, self.sigma = \
+            mean, p_sigma, p_c, covariance, float(sigma)
+
+        if self.evaluations - self.eigen_evaluations >= self.eigen_interval:
+            self._decompose()
+
+    def _decompose(self):
+        """Recompute the eigendecomposition of the covariance matrix used for sampling."""
+        self.eigen_evaluations = self.evaluations
+        self.covariance = np.triu(self.covariance) + np.triu(self.covariance, 1).T
+        eigenvalues, self.eigenvectors = np.linalg.eigh(self.covariance)
+        self.eigenvalues = np.sqrt(np.maximum(eigenvalues, np.finfo(float).tiny))
+
+    def state(self):
+        """Return the adaptive state of the distribution, for checkpointing.
+
+        :return: a dict mapping names to arrays
+        """
+        return {
+            'cma_mean': self.mean,
+            'cma_sigma': self.sigma,
+            'cma_p_c': self.p_c,
+            'cma_p_sigma': self.p_sigma,
+            'cma_covariance': self.covariance,
+            'cma_eigenvectors': self.eigenvectors,
+            'cma_eigenvalues': self.eigenvalues,
+            'cma_evaluations': self.evaluations,
+            'cma_eigen_evaluations': self.eigen_evaluations,
+        }
+
+    def restore(self, state):
+        """Restore the adaptive state of the distribution from a checkpoint.
+
+        :param state: a dict holding the arrays returned by state
+        """
+        self.mean = np.array(state['cma_mean'], dtype=float)
+        self.sigma = float(state['cma_sigma'])
+        self.p_c = np.array(state['cma_p_c'], dtype=float)
+        self.p_sigma = np.array(state['cma_p_sigma'], dtype=float)
+        self.covariance = np.array(state['cma_covariance'], dtype=float)
+        self.eigenvectors = np.array(state['cma_eigenvectors'], dtype=float)
+        self.eigenvalues = np.array(state['cma_eigenvalues'], dtype=float)
+        self.evaluations = int(state['cma_evaluations'])
+        self.eigen_evaluations = int(state['cma_eigen_evaluations'])
@@ -0,0 +1,72 @@
+"""Module containing the Constraints class, used to keep infeasible children from evaluation."""
+import numpy as np
+
+from evopy.repair import Repair
+from evopy.utils import reflect
+
+
+class Constraints:
+    """Box constraints and a feasibility predicate, checked for a whole generation at once.
+
+    The bounds are stored in the floating point type of the genotypes, so that repaired alleles
+    always compare as within bounds.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, individual_length, bounds=None, constraint=None, repair=Repair.CLIP,
+                 dtype=np.float64):
+        """Initializes the constraints.
+
+        :param individual_length: the length of each individual
+        :param bounds: a (lower, upper) tuple of the bounds of each allele, which are either single
+                       values or arrays of length individual_length. Infinite bounds are allowed
+        :param constraint: a predicate mapping an (N, individual_length) array of genotypes to N
+                           booleans, which are True for feasible genotypes
+        :param repair: the way infeasible children are handled, see the Repair enum
+        :param dtype: the floating point type of the genotypes
+        """
+        if not isinstance(repair, Repair):
+            raise ValueError("Provided repair parameter was not an instance of Repair")
+        lower, upper = (-np.inf, np.inf) if bounds is None else bounds
+        self.lower = np.broadcast_to(np.asarray(lower, dtype=dtype), (individual_length,))
+        self.upper = np.broadcast_to(np.asarray(upper, dtype=dtype), (individual_length,))
+        if np.any(self.lower > self.upper):
+            raise ValueError("The lower bounds should not exceed the upper bounds.")
+        self.bounded = bounds is not None
+        self.constraint = constraint
+        self.repair = repair
+
+    def feasible(self, genotypes):
+        """Check which genotypes lie within the bounds and satisfy the constraint.
+
+        :param genotypes: the (N, d) array of genotypes
+        :return: an array of N booleans, which are True for feasible genotypes
+        """
+        feasible = np.ones(len(genotypes), dtype=bool)
+        if self.bounded:
+            feasible &= np.all((genotypes >= self.lower) & (genotypes <= self.upper), axis=1)
+        if self.constraint is not None and len(genotypes) > 0:
+            satisfied = np.asarray(self.constraint(genotypes), dtype=bool).reshape(-1)
+            if len(satisfied) != len(genotypes):
+                raise ValueError("The constraint returned %d values for %d genotypes."
+                                 % (len(satisfied), len(genotypes)))
+            feasible &= satisfied
+        return feasible
+
+    def repair_bounds(self, genotypes):
+        """Move out of bounds alleles back into the bounds in place, when clipping or reflecting.
+
+        :param genotypes: the (N, d) array of genotypes, which is modified in place
+        :return: an array of N booleans, which are True for the repaired genotypes
+        """
+        if not self.bounded or self.repair not in (Repair.CLIP, Repair.REFLECT):
+            return np.zeros(len(genotypes), dtype=bool)
+        outside = (genotypes < self.lower) | (genotypes > self.upper)
+        repaired = np.any(outside, axis=1)
+        if self.repair == Repair.REFLECT:
+            rows = np.flatnonzero(repaired)
+            values = genotypes[rows]
+            genotypes[rows] = np.where(outside[rows], reflect(values, self.lower, self.upper),
+                                       values)
+        np.clip(genotypes, self.lower, self.upper, out=genotypes)
+        return repaired
@@ -0,0 +1,270 @@
+"""Module containing the Coordinator class, which evaluates genotypes on remote workers."""
+import math
+import os
+import pickle
+import selectors
+import socket
+import time
+from collections import Counter, deque
+
+import numpy as np
+
+from evopy.protocol import ERROR, FUNCTION, HELLO, RESULT, TASK, MessageReader, send_message
+
+# The idle time, probe interval and number of failed probes after which TCP keepalive reports
+# a worker host which dropped off the network, where the platform allows to set them.
+_KEEPALIVE = (('TCP_KEEPIDLE', 10), ('TCP_KEEPINTVL', 5), ('TCP_KEEPCNT', 3))
+
+
+class Coordinator:  # pylint: disable=too-many-instance-attributes
+    """Evaluates the genotypes of each generation on workers connected over TCP.
+
+    Workers are started with ``python -m evopy.worker HOST:PORT``, see evopy.worker, and may join
+    or leave at any time. Pass the coordinator as the executor of an EvoPy instance to evaluate
+    every generation on the connected workers.
+
+    The genotypes of a generation are split into tasks, which are sent to the workers as raw
+    array buffers. Faster workers get larger tasks: each idle worker gets a share of the
+    genotypes which have not been dispatched yet, proportional to its measured evaluation rate,
+    and halved so that the last tasks are small enough to even out the finishing times. The
+    tasks of workers which disconnect or time out are dispatched again to the other workers.
+    Connections which do not greet the coordinator as a worker within the handshake timeout, or
+    which send anything that does not follow the protocol, are dropped. Messages are received
+    piece by piece without blocking, and workers which stall halfway through a message are
+    dropped after the message timeout. TCP keepalive detects worker hosts which dropped off the
+    network without closing their connection.
+    Since the fitness values are gathered in the order of the genotypes, runs are reproducible
+    regardless of which worker evaluated what.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, host='localhost', port=0, worker_timeout=60.0, task_timeout=None,
+                 min_chunksize=1, handshake_timeout=1.0, message_timeout=10.0):
+        """Start listening for workers.
+
+        :param host: the host name or address to listen on. Use '' to accept workers from other
+                     machines
+        :param port: the port to listen on, defaults to a free port. See the address attribute
+        :param worker_timeout: the time in seconds to wait for a worker to connect, when there is
+                               work to do but no worker is connected
+        :param task_timeout: the time in seconds after which a worker is considered lost if it has
+                             not returned the result of its task, or None to wait indefinitely
+        :param min_chunksize: the minimum number of genotypes sent to a worker per task
+        :param handshake_timeout: the time in seconds a connection may take to send its first
+                                  message, after which it is dropped
+        :param message_timeout: the time in seconds a worker may take to send the rest of a
+                                message it has started, or to accept a message sent to it, after
+                                which it is dropped
+        """
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        if os.name not in ('nt', 'cygwin'):
+            self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self._server.setblocking(False)
+        self.address = self._server.getsockname()[:2]
+        self.worker_timeout = worker_timeout
+        self.task_timeout = task_timeout
+        self.min_chunksize = min_chunksize
+        self.handshake_timeout = handshake_timeout
+        self.message_timeout = message_timeout
+        self.evaluations = Counter()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._server, selectors.EVENT_READ)
+        self._workers = {}
+        self._num_tasks = 0
+        self._first_task = 0
+        self._genotypes = None
+        self._fitnesses = None
+        self._next_row = 0
+        self._lost = deque()
+
+    @property
+    def num_workers(self):
+        """Return the number of connected workers.
+
+        :return: the number of workers which have greeted the coordinator
+        """
+        return sum(worker['ready'] for worker in self._workers.values())
+
+    def evaluate(self, fitness_function, genotypes, vectorized=False):
+        """Evaluate a batch of genotypes on the connected workers.
+
+        :param fitness_function: the fitness function, which is pickled and sent to each worker
+                                 once, and should therefore be importable by the workers
+        :param genotypes: the (N, d) array of genotypes to evaluate
+        :param vectorized: whether the workers call the fitness function once per task with an
+                           (n, d) array of genotypes, or once per genotype
+        :return: the array of N fitness values, in the order of the genotypes
+        """
+        function = pickle.dumps((fitness_function, vectorized))
+        self._genotypes = np.ascontiguousarray(genotypes)
+        self._fitnesses = np.full(len(genotypes), np.nan)
+        self._next_row = 0
+        self._lost.clear()
+        self._first_task = self._num_tasks
+        remaining = len(genotypes)
+        waiting_since = time.time()
+        while remaining > 0:
+            self._dispatch(function)
+            if self.num_workers > 0:
+                waiting_since = time.time()
+            elif time.time() - waiting_since > self.worker_timeout:
+                raise TimeoutError("No worker connected to %s:%d within %g seconds."
+                                   % (self.address + (self.worker_timeout,)))
+            for key, _ in self._selector.select(0.1):
+                if key.fileobj is self._server:
+                    self._accept()
+                else:
+                    remaining -= self._receive(key.fileobj)
+            self._expire()
+        return self._fitnesses
+
+    def close(self):
+        """Disconnect all workers, which makes them exit, and stop listening."""
+        for connection in list(self._workers):
+            self._drop(connection)
+        self._selector.close()
+        self._server.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _accept(self):
+        """Accept a worker which is connecting."""
+        try:
+            connection, peer = self._server.accept()
+        except BlockingIOError:
+            return
+        connection.settimeout(self.message_timeout)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in _KEEPALIVE:
+            if hasattr(socket, option):
+                connection.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        self._selector.register(connection, selectors.EVENT_READ)
+        self._workers[connection] = {'name': '%s:%d' % peer[:2], 'function': None, 'task': None,
+                                     'rate': None, 'ready': False, 'reader': MessageReader(),
+                                     'connected_at': time.time()}
+
+    def _drop(self, connection):
+        """Disconnect a worker, and dispatch its unfinished task again.
+
+        :param connection: the socket connected to the worker
+        """
+        worker = self._workers.pop(connection)
+        self._selector.unregister(connection)
+        connection.close()
+        if worker['task'] is not None and worker['task'][0] >= self._first_task:
+            self._lost.append(worker['task'][1:3])
+
+    def _chunksize(self, worker):
+        """Return the number of genotypes to send to an idle worker in its next task.
+
+        :param worker: the state of the worker
+        :return: the number of genotypes
+        """
+        workers = [other for other in self._workers.values() if other['ready']]
+        rates = [other['rate'] for other in workers if other['rate'] is not None]
+        default = np.mean(rates) if rates else 1.0
+        total = sum(default if other['rate'] is None else other['rate'] for other in workers)
+        rate = default if worker['rate'] is None else worker['rate']
+        share = (len(self._genotypes) - self._next_row) * rate / total
+        return max(self.min_chunksize, math.ceil(share / 2))
+
+    def _dispatch(self, function):
+        """Send tasks to all idle workers, as long as there are genotypes left to dispatch.
+
+        :param function: the pickled fitness function and vectorized flag
+        """
+        for connection, worker in list(self._workers.items()):
+            if worker['task'] is not None or not worker['ready']:
+                continue
+            if self._lost:
+                start, end = self._lost.popleft()
+            elif self._next_row < len(self._genotypes):
+                start = self._next_row
+                end = min(len(self._genotypes), start + self._chunksize(worker))
+                self._next_row = end
+            else:
+                return
+            worker['task'] = (self._num_tasks, start, end, time.time())
+            self._num_tasks += 1
+            try:
+                if worker['function'] != function:
+                    send_message(connection, FUNCTION, function)
+                    worker['function'] = function
+                send_message(connection, TASK, self._genotypes[start:end], worker['task'][0])
+            except OSError:
+                self._drop(connection)
+
+    def _read(self, connection):
+        """Receive from a readable connection, dropping it if it does not follow the protocol.
+
+        The first message of a connection should be a HELLO, after which it is a worker and only
+        sends RESULT and ERROR messages.
+
+        :param connection: the socket connected to the worker
+        :return: the (kind, payload, task, seconds) tuple of a RESULT or ERROR message, or None if
+                 there is nothing more to handle
+        """
+        worker = self._workers[connection]
+        try:
+            message = worker['reader'].receive(connection)
+        except OSError:
+            self._drop(connection)
+            return None
+        if message is None:
+            return None
+        if message[0] == HELLO and not worker['ready']:
+            worker['name'] = message[1].decode(errors='replace')
+            worker['ready'] = True
+            return None
+        if not worker['ready'] or message[0] not in (RESULT, ERROR):
+            self._drop(connection)
+            return None
+        return message
+
+    def _receive(self, connection):
+        """Handle a message sent by a worker.
+
+        :param connection: the socket connected to the worker
+        :return: the number of genotypes of which the fitness was received
+        """
+        message = self._read(connection)
+        if message is None or self._workers[connection]['task'] is None:
+            return 0
+        kind, payload, task, seconds = message
+        worker = self._workers[connection]
+        current, start, end, _ = worker['task']
+        worker['task'] = None
+        if task != current or task < self._first_task:
+            return 0
+        if kind == ERROR:
+            raise RuntimeError("Worker %s failed to evaluate its genotypes:\n%s"
+                               % (worker['name'], payload.decode()))
+        if kind != RESULT or payload.size != end - start:
+            self._drop(connection)
+            self._lost.append((start, end))
+            return 0
+        self._fitnesses[start:end] = payload.reshape(-1)
+        rate = (end - start) / max(seconds, 1e-9)
+        worker['rate'] = rate if worker['rate'] is None else (worker['rate'] + rate) / 2
+        self.evaluations[worker['name']] += end - start
+        return end - start
+
+    def _expire(self):
+        """Drop connections which did not greet in time, stalled mid-message or timed out a task."""
+        now = time.time()
+        for connection, worker in list(self._workers.items()):
+            started = worker['reader'].started
+            if not worker['ready'] and worker['connected_at'] < now - self.handshake_timeout:
+                self._drop(connection)
+            elif started is not None and started < now - self.message_timeout:
+                self._drop(connection)
+            elif self.task_timeout is not None and worker['task'] is not None \
+                    and worker['task'][3] < now - self.task_timeout:
+                self._drop(connection)
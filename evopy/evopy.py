@@ -1,21 +1,38 @@
 """Module used for the execution of the evolutionary algorithm."""
+import asyncio
+import os
 import time
+from collections import Counter, deque
 
 import numpy as np
 
+from evopy.checkpoint import load_checkpoint
+from evopy.cma import CovarianceMatrixAdaptation
+from evopy.constraints import Constraints
+from evopy.coordinator import Coordinator
+from evopy.fitness_cache import FitnessCache
 from evopy.individual import Individual
+from evopy.instrumentation import Instrumentation
+from evopy.population import Population
 from evopy.progress_report import ProgressReport
+from evopy.repair import Repair
+from evopy.selection import PlusSelection, top_k
 from evopy.strategy import Strategy
-from evopy.utils import random_with_seed
+from evopy.utils import get_random_state, random_with_seed, restore_random, standard_normal
 
 
-class EvoPy:
+class EvoPy:  # pylint: disable=too-many-instance-attributes
     """Main class of the EvoPy package."""
 
+    # pylint: disable=too-many-arguments,too-many-locals
     def __init__(self, fitness_function, individual_length, warm_start=None, generations=100,
                  population_size=30, num_children=1, mean=0, std=1, maximize=False,
                  strategy=Strategy.SINGLE_VARIANCE, random_seed=None, reporter=None,
-                 target_fitness_value=None, max_run_time=None):
+                 target_fitness_value=None, max_run_time=None, cache_size=None,
+                 vectorized=False, executor=None, chunksize=None, selection=None,
+                 checkpoint=None, instrument=False, phase_hook=None, surrogate=None,
+                 dtype=np.float64, bounds=None, constraint=None, repair=Repair.CLIP,
+                 max_resamples=10, history=None, termination=None):
         """Initializes an EvoPy instance.
 
         :param fitness_function: the fitness function on which the individuals are evaluated
@@ -28,11 +45,67 @@ class EvoPy:
         :param std: the standard deviation for sampling the random offsets of the initial population
         :param maximize: whether the fitness function should be maximized or minimized
         :param strategy: the strategy used to generate offspring by individuals. For more
-                         information, check the Strategy enum
-        :param random_seed: the seed to use for the random number generator
+                         information, check the Strategy enum. With Strategy.CMA, each generation
+                         samples population_size * num_children offspring from a distribution
+                         centered on warm_start + mean with step size std, and the selection
+                         argument is not used. The run stops early once the distribution
+                         diverges, e.g. on a problem which is unbounded
+        :param random_seed: the seed to use for the random number generator. An integer gives a
+                            legacy RandomState, while a SeedSequence gives a PCG64 Generator.
+                            RandomState and Generator instances are used as they are. Defaults
+                            to a Generator seeded with fresh entropy
         :param reporter: callback to be invoked at each generation with a ProgressReport as argument
         :param target_fitness_value: target fitness value for early stopping
         :param max_run_time: maximum time allowed to run in seconds
+        :param cache_size: if given, the maximum number of fitness values to keep in a
+                           least-recently-used cache keyed by genotype, so that duplicate
+                           genotypes are only evaluated once
+        :param vectorized: whether the fitness function is vectorized, in which case it is called
+                           once per generation with an (N, individual_length) array holding the
+                           genotypes of all unevaluated individuals, and should return a 1-D array
+                           of N fitness values
+        :param executor: a concurrent.futures.Executor used to evaluate all new individuals of a
+                         generation in parallel, e.g. a ThreadPoolExecutor or ProcessPoolExecutor,
+                         or an evopy.coordinator.Coordinator to evaluate them on remote workers,
+                         in which case chunksize is not used
+        :param chunksize: the number of genotypes sent to the executor per task. Defaults to 1, or
+                          in vectorized mode to an even split over the available CPUs
+        :param selection: the survivor selection scheme, see the evopy.selection module. Defaults
+                          to PlusSelection, which keeps the best of children and parents together
+        :param checkpoint: an evopy.checkpoint.Checkpointer used to periodically save the state of
+                           the run to disk, so that it can be continued with resume
+        :param instrument: whether to record the time spent per phase and the number of
+                           evaluations, per generation in each ProgressReport and in total in
+                           the instrumentation attribute. See evopy.instrumentation.Instrumentation
+        :param phase_hook: a callable invoked as phase_hook(phase, generation) at the start of each
+                           phase, returning a context manager which is exited at its end. Used to
+                           plug in an external profiler or metrics sink, and implies instrument
+        :param surrogate: an evopy.surrogate.Surrogate used to pre-screen the children of each
+                          generation with a cheap model, so that only the most promising of them
+                          are evaluated with the fitness function. The number of evaluations saved
+                          is given in each ProgressReport
+        :param dtype: the floating point type in which genotypes and strategy parameters are
+                      stored and mutated, np.float32 or np.float64. Float32 halves the memory use
+                      of large populations, see Population.memory_footprint. Fitness values are
+                      always float64, and the fitness function receives genotypes of this type
+        :param bounds: a (lower, upper) tuple of the bounds of each allele, which are either single
+                       values or arrays of length individual_length. Children out of bounds are
+                       repaired or rejected before they are evaluated, see the repair argument
+        :param constraint: a cheap predicate, called once per generation with an (N,
+                           individual_length) array of genotypes, returning N booleans which are
+                           True for feasible genotypes. Infeasible children are never evaluated
+        :param repair: the way children which violate the bounds or the constraint are handled,
+                       see the Repair enum. Rejected children get the worst possible fitness
+                       without being evaluated. The number of repaired and rejected children is
+                       given in each ProgressReport
+        :param max_resamples: the maximum number of times an infeasible child is resampled with
+                              Repair.RESAMPLE, before it is rejected
+        :param history: an evopy.history.History used to record the fitness statistics and step
+                        sizes of each generation to disk, with bounded memory use
+        :param termination: an evopy.termination.Termination used to stop the run once it has
+                            stagnated or used up its evaluation budget, or to restart it with a
+                            larger population. The number of restarts is given in each
+                            ProgressReport
         """
         self.fitness_function = fitness_function
         self.individual_length = individual_length
@@ -49,6 +122,39 @@ class EvoPy:
         self.reporter = reporter
         self.target_fitness_value = target_fitness_value
         self.max_run_time = max_run_time
+        self.fitness_cache = None if cache_size is None else FitnessCache(cache_size)
+        self.vectorized = vectorized
+        self.executor = executor
+        self.chunksize = chunksize
+        self.selection = PlusSelection() if selection is None else selection
+        self.checkpoint = checkpoint
+        self.instrumentation = Instrumentation(phase_hook) if instrument or phase_hook else None
+        self.surrogate = surrogate
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("The dtype should either be float32 or float64.")
+        self.constraints = None if bounds is None and constraint is None \
+            else Constraints(individual_length, bounds, constraint, repair, self.dtype)
+        self.max_resamples = max_resamples
+        self.history = history
+        self.termination = termination
+
+        self._start_time = None
+        self._generation = None
+        self._population = None
+        self._pending = None
+        self._asked = 0
+        self._told = None
+        self._rows = None
+        self._best = None
+        self._cma = None
+        self._saved_evaluations = 0
+        self._rejected = None
+        self._repaired_children = 0
+        self._rejected_children = 0
+        self._reports = None
+        self._population_size = population_size
+        self._evaluations = 0
 
     def _check_early_stop(self, start_time, best):
         """Check whether the algorithm can stop early, based on time and fitness target.
@@ -71,44 +177,748 @@ class EvoPy:
         if self.individual_length == 0:
             return None
 
-        start_time = time.time()
+        self._start()
+        return self._run()
+
+    def resume(self, path):
+        """Resume a run from a checkpoint, continuing exactly as the original run would have.
+
+        The EvoPy instance should be configured the same way as the one that saved the checkpoint.
+
+        :param path: the checkpoint file to resume from, see evopy.checkpoint.Checkpointer
+        :return: the best genotype found
+        """
+        self._restore(load_checkpoint(path))
+        return self._run()
+
+    def iterate(self):
+        """Run the evolutionary strategy algorithm lazily, one generation at a time.
+
+        The run only advances while the generator is consumed, so the consumer can pause it, or
+        stop it by no longer consuming it. A run which was stopped before it finished is continued
+        by the next call to iterate, which first evaluates all children of the current generation
+        of which the fitness was not told yet, also those which were asked for already.
+
+        :return: a generator yielding the ProgressReport of each generation
+        """
+        if self.individual_length == 0:
+            return
+        if self._generation is None or self._pending is None:
+            self._start()
+        reports = deque()
+        try:
+            while self._pending is not None:
+                self._reports = reports
+                genotypes = self._untold()
+                self.tell(genotypes, self._evaluate(genotypes))
+                while reports:
+                    yield reports.popleft()
+        finally:
+            if self._reports is reports:
+                self._reports = None
 
-        population = self._init_population()
-        best = sorted(population, reverse=self.maximize,
-                      key=lambda individual: individual.evaluate(self.fitness_function))[0]
+    def _run(self):
+        """Evaluate the asked genotypes and tell their fitness until the run has finished.
 
-        for generation in range(self.generations):
-            children = [parent.reproduce() for _ in range(self.num_children)
-                        for parent in population]
-            population = sorted(children + population, reverse=self.maximize,
-                                key=lambda individual: individual.evaluate(self.fitness_function))
-            population = population[:self.population_size]
-            best = population[0]
+        :return: the best genotype found
+        """
+        while self._pending is not None:
+            genotypes = self.ask()
+            self.tell(genotypes, self._evaluate(genotypes))
+
+        return self._best.genotype
+
+    def ask(self, num_genotypes=None):
+        """Return genotypes of which the fitness should be told, starting a run if needed.
+
+        The genotypes are those children of the current generation which have not been asked for
+        yet. The next generation is only created once the fitness of all children of the current
+        generation has been told, so until then fewer genotypes than requested, or none at all,
+        are returned.
+
+        :param num_genotypes: the maximum number of genotypes to return, defaults to all children
+                              of the current generation which have not been asked for yet
+        :return: a read-only (n, individual_length) array of genotypes to evaluate, which is empty
+                 once the run has finished
+        """
+        if self._generation is None:
+            self._start()
+        if self._pending is None:
+            return np.empty((0, self.individual_length), dtype=self.dtype)
+        end = len(self._pending) if num_genotypes is None \
+            else min(self._asked + num_genotypes, len(self._pending))
+        genotypes = self._pending.genotypes[self._asked:end]
+        genotypes.flags.writeable = False
+        self._asked = max(end, self._asked)
+        return genotypes
+
+    def _untold(self):
+        """Return all children of the current generation of which the fitness was not told yet.
+
+        :return: the (n, individual_length) array of genotypes to evaluate
+        """
+        self._asked = len(self._pending)
+        if not self._told.any():
+            return self._pending.genotypes
+        return self._pending.genotypes[np.logical_not(self._told)]
 
+    def tell(self, genotypes, fitnesses):
+        """Report the fitness of asked genotypes, in any order and split over any number of calls.
+
+        Each genotype is matched to a child of the current generation by its exact bytes, so it
+        should be passed back unmodified. Once the fitness of all children has been told, the
+        survivors are selected, the progress is reported and the children of the next generation
+        are created, which can then be asked for.
+
+        :param genotypes: the (m, individual_length) array of evaluated genotypes
+        :param fitnesses: the m fitness values of the genotypes
+        """
+        if self._pending is None:
+            raise ValueError("There are no genotypes waiting for their fitness to be told.")
+        genotypes = np.asarray(genotypes, dtype=self.dtype).reshape(-1, self.individual_length)
+        fitnesses = np.asarray(fitnesses, dtype=float).reshape(-1)
+        if len(fitnesses) != len(genotypes):
+            raise ValueError("Got %d fitness values for %d genotypes."
+                             % (len(fitnesses), len(genotypes)))
+
+        pending = self._pending.genotypes
+        if not self._told.any() and genotypes.shape == pending.shape and (
+                _same_memory(genotypes, pending) or np.array_equal(genotypes, pending)):
+            rows = np.arange(len(genotypes))
+        else:
+            rows = self._match(genotypes)
+        self._pending.fitness[rows] = fitnesses
+        self._told[rows] = True
+        if self._told.all():
+            self._advance()
+
+    def finished(self):
+        """Check whether the current run has finished, so no more genotypes will be asked for.
+
+        :return: whether a run was started and has finished
+        """
+        return self._generation is not None and self._pending is None
+
+    def best(self):
+        """Return the best individual found so far.
+
+        :return: the best Individual, or None if no generation has been completed yet
+        """
+        return self._best
+
+    def _match(self, genotypes):
+        """Find the children of the current generation holding the given genotypes.
+
+        Children with identical genotypes are matched in order. Nothing is changed if any of the
+        genotypes can not be matched.
+
+        :param genotypes: the (m, individual_length) array of genotypes
+        :return: the rows of the matched children, which have not been told before
+        """
+        if self._rows is None:
+            self._rows = {}
+            for row in range(len(self._pending) - 1, -1, -1):
+                if not self._told[row]:
+                    self._rows.setdefault(FitnessCache.key(self._pending.genotypes[row]),
+                                          []).append(row)
+        keys = [FitnessCache.key(genotype) for genotype in genotypes]
+        for key, count in Counter(keys).items():
+            if len(self._rows.get(key, ())) < count:
+                raise ValueError("A told genotype is not a child of the current generation, or "
+                                 "its fitness was told already.")
+        return np.array([self._rows[key].pop() for key in keys], dtype=int)
+
+    async def run_async(self, max_concurrency=None, timeout=None, timeout_fitness=None):
+        """Run the evolutionary strategy algorithm with an asynchronous fitness function.
+
+        The fitness function should be a coroutine function. All new individuals of a generation
+        are evaluated concurrently, and selection happens once all of them have finished.
+
+        :param max_concurrency: the maximum number of evaluations awaited at the same time, or
+                                None for no limit
+        :param timeout: the maximum time in seconds a single evaluation may take, or None for no
+                        limit
+        :param timeout_fitness: the fitness assigned to an individual of which the evaluation
+                                timed out. Defaults to the worst possible fitness
+        :return: the best genotype found
+        """
+        if self.individual_length == 0:
+            return None
+
+        if timeout_fitness is None:
+            timeout_fitness = -np.inf if self.maximize else np.inf
+        semaphore = None if max_concurrency is None else asyncio.Semaphore(max_concurrency)
+
+        self._start()
+        while self._pending is not None:
+            genotypes = self.ask()
+            if self.instrumentation is None:
+                fitnesses = await self._evaluate_async(genotypes, semaphore, timeout,
+                                                       timeout_fitness)
+            else:
+                cache_hits = self._cache_hits()
+                with self.instrumentation.phase('evaluation', self._generation):
+                    fitnesses = await self._evaluate_async(genotypes, semaphore, timeout,
+                                                           timeout_fitness)
+                self._count_evaluations(genotypes, cache_hits)
+            self.tell(genotypes, fitnesses)
+
+        return self._best.genotype
+
+    def _start(self):
+        """Start a new run of the algorithm by initializing the population.
+
+        :return: the initial population, to be evaluated before calling _advance
+        """
+        self._start_time = time.time()
+        self._generation = 0
+        self._population = None
+        self._best = None
+        self._population_size = self.population_size
+        self._evaluations = 0
+        if self.termination is not None:
+            self.termination.start(self.individual_length,
+                                   self._population_size * self.num_children)
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+        self._set_pending(self._timed('init', self._init_population))
+        return self._pending
+
+    def _advance(self):
+        """Continue the run once all pending individuals have been evaluated.
+
+        Generations of which all children were rejected are completed right away.
+
+        :return: the children of the next generation, to be evaluated before calling _advance
+                 again, or None if the run has finished
+        """
+        while self._complete_generation():
+            pending = self._reproduce()
+            if pending is None or len(pending) > 0:
+                return pending
+        self._set_pending(None)
+        return None
+
+    def _set_pending(self, pending):
+        """Set the children waiting to be evaluated, none of which have been asked for yet.
+
+        :param pending: the unevaluated population of children, or None if the run has finished
+        """
+        if pending is None and self.history is not None:
+            self.history.flush()
+        self._pending = pending
+        self._asked = 0
+        self._told = None if pending is None else np.zeros(len(pending), dtype=bool)
+        self._rows = None
+
+    def _complete_generation(self):
+        """Merge the evaluated pending individuals into the population.
+
+        After selecting the survivors, the best individual is reported, the early stopping and
+        termination criteria are checked and a checkpoint is saved if one is due. A stagnated run
+        which is restarted continues with an empty population, of which the initial individuals
+        are created next.
+
+        :return: whether the run should continue
+        """
+        self._evaluations += len(self._pending)
+        if self._rejected is not None:
+            self._pending = self._pending.concatenate(self._rejected)
+            self._rejected = None
+        if self.surrogate is not None:
+            self._timed('selection', self.surrogate.add, self._pending.genotypes,
+                        self._pending.fitness)
+        if self._population is None:
+            self._population = self._pending
+            if self._cma is not None:
+                self._population = self._timed('selection', self._select_cma, self._population)
+            best = self._rank(self._population.fitness)[0]
+            if self._best is None \
+                    or self._is_better(self._population.fitness[best], self._best.fitness):
+                self._best = self._population.take([best])[0]
+            if self.instrumentation is not None:
+                self.instrumentation.next_generation()
+            return self.termination is None or not self.termination.exhausted(self._evaluations)
+
+        self._population = self._timed('selection', self._select, self._pending, self._population)
+        if self._is_better(self._population.fitness[0], self._best.fitness):
+            self._best = self._population.take([0])[0]
+
+        self._report()
+        if self.instrumentation is not None:
+            self.instrumentation.next_generation()
+
+        self._generation += 1
+        if self._check_early_stop(self._start_time, self._best) \
+                or (self.termination is not None and not self._continue_or_restart()):
+            return False
+
+        if self._population is not None and self.checkpoint is not None \
+                and self.checkpoint.due(self._generation):
+            if self.history is not None:
+                self.history.flush()
+            self.checkpoint.save(self._state())
+        return True
+
+    def _continue_or_restart(self):
+        """Check the termination criteria, restarting the run if it stagnated and may restart.
+
+        :return: whether the run should continue
+        """
+        if self.termination.exhausted(self._evaluations):
+            return False
+        if not self.termination.stagnated(self._scores(self._population.fitness),
+                                          None if self._cma is not None else self._step_sizes()[0]):
+            return True
+        if self._generation >= self.generations or not self.termination.restart():
+            return False
+        self._restart()
+        return True
+
+    def _restart(self):
+        """Discard the stagnated population, so that a larger one is created from scratch."""
+        self._population_size = int(round(self._population_size
+                                          * self.termination.population_growth))
+        self.termination.start(self.individual_length, self._population_size * self.num_children,
+                               restart=True)
+        self._population = None
+
+    def _report(self):
+        """Record the completed generation in the history, and report it.
+
+        The report is passed to the reporter, and queued to be yielded by iterate.
+        """
+        if self.history is not None:
+            self._timed('reporting', self.history.record, self._generation, self._best.fitness,
+                        self._population.fitness, self._step_sizes(), self._best.genotype,
+                        self.maximize)
+        if self.reporter is not None or self._reports is not None:
+            report = self._progress_report()
+            if self._reports is not None:
+                self._reports.append(report)
             if self.reporter is not None:
-                self.reporter(ProgressReport(generation, best.genotype, best.fitness))
+                self._timed('reporting', self.reporter, report)
 
-            if self._check_early_stop(start_time, best):
-                break
+    def _reproduce(self):
+        """Create the children of the next generation, unless all generations have been run.
 
-        return best.genotype
+        After a restart, the initial population is created instead. A run of the CMA strategy of
+        which the distribution diverged finishes instead, so that no genotype which is not finite
+        is ever evaluated.
 
-    def _init_population(self):
-        if self.strategy == Strategy.SINGLE_VARIANCE:
-            strategy_parameters = self.random.randn(1)
-        elif self.strategy == Strategy.MULTIPLE_VARIANCE:
-            strategy_parameters = self.random.randn(self.individual_length)
-        elif self.strategy == Strategy.FULL_VARIANCE:
-            strategy_parameters = self.random.randn(
-                int((self.individual_length + 1) * self.individual_length / 2))
+        :return: the children to be evaluated, or None if the run has finished
+        """
+        if self._generation >= self.generations:
+            pending = None
+        elif self._population is None:
+            pending = self._timed('init', self._init_population)
         else:
-            raise ValueError("Provided strategy parameter was not an instance of Strategy")
-        return [
-            Individual(
-                self.warm_start + self.random.normal(
-                    loc=self.mean, scale=self.std, size=self.individual_length
-                ),
-                self.strategy, strategy_parameters,
-                random_seed=self.random
-            ) for _ in range(self.population_size)
-        ]
+            pending = self._timed('reproduction', self._create_children)
+            if self._cma is not None and self._cma.diverged:
+                pending = None
+            elif self.surrogate is not None:
+                pending = self._timed('reproduction', self._screen, pending)
+        self._set_pending(pending)
+        return pending
+
+    def _create_children(self):
+        """Create the children of the next generation, and repair or reject the infeasible ones.
+
+        :return: the unevaluated population of feasible children
+        """
+        if self._cma is not None:
+            return self._constrain(self._sample_cma())
+        return self._constrain(self._population.reproduce(self.num_children))
+
+    def _constrain(self, children):
+        """Repair or reject the children which violate the bounds or the constraint.
+
+        Out of bounds children are clipped or reflected in place, or resampled from their parents.
+        Children which remain infeasible are set aside with the worst possible fitness, and only
+        join the population once the feasible children have been evaluated.
+
+        :param children: the unevaluated population of children
+        :return: the population of feasible children, to be evaluated
+        """
+        self._rejected = None
+        if self.constraints is None:
+            return children
+        repaired = self.constraints.repair_bounds(children.genotypes)
+        feasible = self.constraints.feasible(children.genotypes)
+        if self.constraints.repair == Repair.RESAMPLE:
+            for _ in range(self.max_resamples):
+                rows = np.flatnonzero(~feasible)
+                if len(rows) == 0:
+                    break
+                self._resample(children, rows)
+                repaired[rows] = True
+                feasible[rows] = self.constraints.feasible(children.genotypes[rows])
+        self._repaired_children = int(np.count_nonzero(repaired & feasible))
+        self._rejected_children = len(children) - int(np.count_nonzero(feasible))
+        if self._rejected_children == 0:
+            return children
+        self._rejected = children.take(np.flatnonzero(~feasible))
+        self._rejected.fitness[:] = -np.inf if self.maximize else np.inf
+        return children.take(np.flatnonzero(feasible))
+
+    def _resample(self, children, rows):
+        """Replace the given children in place by new children of the same parents.
+
+        :param children: the unevaluated population of children
+        :param rows: the indices of the children to replace
+        """
+        if self._cma is not None:
+            children.genotypes[rows] = self._cma.sample(self.random, len(rows))
+        elif self._population is None:
+            children.genotypes[rows] = self._initial_genotypes(len(rows))
+        else:
+            resampled = self._population.take(rows % len(self._population)).reproduce()
+            children.genotypes[rows] = resampled.genotypes
+            children.strategy_parameters[rows] = resampled.strategy_parameters
+
+    def _screen(self, children):
+        """Discard the children which the surrogate model predicts to be least promising.
+
+        Enough children are kept for the survivor selection to work, i.e. the number of parents
+        of the CMA strategy, or the population size for selection schemes discarding parents.
+
+        :param children: the unevaluated population of children
+        :return: the population of children worth evaluating
+        """
+        if self._cma is not None:
+            minimum = self._cma.num_parents
+        elif not self.selection.uses_parents:
+            minimum = self._population_size
+        else:
+            minimum = 1
+        indices = self.surrogate.screen(children.genotypes, self.maximize, minimum)
+        self._saved_evaluations = len(children) - len(indices)
+        if len(indices) == len(children):
+            return children
+        return children.take(indices)
+
+    def _progress_report(self):
+        """Create the report of the current generation.
+
+        The report holds a copy of the best genotype, so that it does not keep the population
+        alive. When instrumentation is enabled, the report holds the time spent per phase in this
+        generation, except for reporting itself, and the number of evaluations and cache hits.
+
+        :return: the ProgressReport of the current generation
+        """
+        best_genotype = self._best.genotype.copy()
+        saved_evaluations = None if self.surrogate is None else self._saved_evaluations
+        repaired_children, rejected_children = (None, None) if self.constraints is None \
+            else (self._repaired_children, self._rejected_children)
+        restarts = None if self.termination is None else self.termination.num_restarts
+        if self.instrumentation is None:
+            return ProgressReport(self._generation, best_genotype, self._best.fitness,
+                                  saved_evaluations=saved_evaluations,
+                                  repaired_children=repaired_children,
+                                  rejected_children=rejected_children, restarts=restarts)
+        return ProgressReport(self._generation, best_genotype, self._best.fitness,
+                              timings=dict(self.instrumentation.generation_timings),
+                              evaluations=self.instrumentation.generation_evaluations,
+                              cache_hits=self.instrumentation.generation_cache_hits,
+                              saved_evaluations=saved_evaluations,
+                              repaired_children=repaired_children,
+                              rejected_children=rejected_children, restarts=restarts)
+
+    def _step_sizes(self):
+        """Return the mutation step sizes used by the current population.
+
+        :return: the standard deviations of the individuals, or of the principal axes of the
+                 shared CMA distribution
+        """
+        if self._cma is not None:
+            return self._cma.sigma * self._cma.eigenvalues
+        return self._population.strategy_parameters[:, :self.individual_length]
+
+    def _timed(self, phase, function, *args):
+        """Call a function, timing it as the given phase if instrumentation is enabled.
+
+        :param phase: the name of the phase, see Instrumentation.PHASES
+        :param function: the function to call
+        :param args: the arguments to call the function with
+        :return: the return value of the function
+        """
+        if self.instrumentation is None:
+            return function(*args)
+        with self.instrumentation.phase(phase, self._generation):
+            return function(*args)
+
+    def _state(self):
+        """Collect the state of the run in between generations, for checkpointing.
+
+        :return: a dict mapping names to arrays, see evopy.checkpoint.save_checkpoint
+        """
+        return {
+            'generation': self._generation,
+            'elapsed_time': time.time() - self._start_time,
+            'genotypes': self._population.genotypes,
+            'strategy_parameters': self._population.strategy_parameters,
+            'fitness': self._population.fitness,
+            'best_genotype': self._best.genotype,
+            'best_strategy_parameters': self._best.strategy_parameters,
+            'best_fitness': self._best.fitness,
+            'random_state': get_random_state(self.random),
+            'population_size': self._population_size,
+            'evaluations': self._evaluations,
+            **({} if self._cma is None else self._cma.state()),
+            **({} if self.surrogate is None else self.surrogate.state()),
+            **({} if self.termination is None else self.termination.state()),
+        }
+
+    def _restore(self, state):
+        """Restore the state of a run from a checkpoint.
+
+        :param state: the checkpoint state, see _state
+        :return: the children of the next generation, to be evaluated before calling _advance
+        """
+        self.random = restore_random(state['random_state'])
+        self._start_time = time.time() - float(state['elapsed_time'])
+        self._generation = int(state['generation'])
+        self._population_size = int(state.get('population_size', self.population_size))
+        self._evaluations = int(state.get('evaluations', 0))
+        self._population = Population(state['genotypes'], self.strategy,
+                                      state['strategy_parameters'], state['fitness'],
+                                      random_seed=self.random, dtype=self.dtype)
+        self._best = Individual(state['best_genotype'], self.strategy,
+                                state['best_strategy_parameters'], random_seed=self.random)
+        self._best.fitness = float(state['best_fitness'])
+        if self.strategy == Strategy.CMA:
+            self._cma = self._create_cma()
+            self._cma.restore(state)
+        if self.surrogate is not None:
+            self.surrogate.restore(state)
+        if self.termination is not None:
+            self.termination.restore(state)
+        return self._reproduce()
+
+    def _scores(self, fitness):
+        """Convert fitness values to scores, of which lower is better.
+
+        :param fitness: the array of fitness values
+        :return: the array of scores
+        """
+        return -fitness if self.maximize else fitness
+
+    def _rank(self, fitness):
+        """Return the indices that order the given fitness values from best to worst.
+
+        :param fitness: the array of fitness values to rank
+        :return: the indices of the fitness values, best first
+        """
+        return np.argsort(self._scores(fitness), kind='stable')
+
+    def _is_better(self, fitness, other):
+        """Check whether a fitness value is strictly better than another.
+
+        :param fitness: the fitness value to compare
+        :param other: the fitness value to compare against
+        :return: whether fitness is better than other
+        """
+        return fitness > other if self.maximize else fitness < other
+
+    def _select(self, children, parents):
+        """Select the survivors among the evaluated children and their parents.
+
+        :param children: the population of evaluated children
+        :param parents: the population of parents
+        :return: the population of survivors, ordered from best to worst
+        """
+        if self._cma is not None:
+            return self._select_cma(children)
+        survivors = self.selection.select(self._scores(children.fitness),
+                                          self._scores(parents.fitness),
+                                          self._population_size, self.random)
+        if not self.selection.uses_parents:
+            return children.take(survivors)
+        return children.concatenate(parents).take(survivors)
+
+    def _evaluate(self, genotypes):
+        """Evaluate a batch of genotypes, timing it if instrumentation is enabled.
+
+        :param genotypes: the (N, individual_length) array of genotypes to evaluate
+        :return: the array of N fitness values
+        """
+        if self.instrumentation is None:
+            return self._evaluate_cached(genotypes)
+        cache_hits = self._cache_hits()
+        with self.instrumentation.phase('evaluation', self._generation):
+            fitnesses = self._evaluate_cached(genotypes)
+        self._count_evaluations(genotypes, cache_hits)
+        return fitnesses
+
+    def _cache_hits(self):
+        """Return the number of fitness cache hits so far.
+
+        :return: the number of cache hits, or 0 if no cache is used
+        """
+        return 0 if self.fitness_cache is None else self.fitness_cache.hits
+
+    def _count_evaluations(self, genotypes, cache_hits):
+        """Count the evaluations of a batch of genotypes for the instrumentation.
+
+        :param genotypes: the genotypes which were evaluated
+        :param cache_hits: the number of cache hits before the genotypes were evaluated
+        """
+        cache_hits = self._cache_hits() - cache_hits
+        self.instrumentation.count(len(genotypes) - cache_hits, cache_hits)
+
+    def _evaluate_cached(self, genotypes):
+        """Evaluate a batch of genotypes, looking them up in the fitness cache if one is used.
+
+        :param genotypes: the (N, individual_length) array of genotypes to evaluate
+        :return: the array of N fitness values
+        """
+        if self.fitness_cache is None:
+            return self._evaluate_genotypes(genotypes)
+        return self.fitness_cache.evaluate_batch(self._evaluate_genotypes, genotypes)
+
+    def _evaluate_genotypes(self, genotypes):
+        """Evaluate a batch of genotypes, dispatching them to the executor if one was given.
+
+        The results are gathered in the order of the genotypes, regardless of the order in which
+        the evaluations complete. The fitness function is not called for an empty batch, which
+        is left when all children of a generation were rejected.
+
+        :param genotypes: the (N, individual_length) array of genotypes to evaluate
+        :return: the array of N fitness values
+        """
+        if len(genotypes) == 0:
+            return np.empty(0)
+        if isinstance(self.executor, Coordinator):
+            return self.executor.evaluate(self.fitness_function, genotypes, self.vectorized)
+        if self.vectorized:
+            if self.executor is None:
+                fitnesses = np.asarray(self.fitness_function(genotypes), dtype=float).reshape(-1)
+            else:
+                chunksize = self.chunksize or -(-len(genotypes) // (os.cpu_count() or 1))
+                chunks = [genotypes[index:index + chunksize]
+                          for index in range(0, len(genotypes), chunksize)]
+                fitnesses = np.concatenate([
+                    np.asarray(chunk_fitness, dtype=float).reshape(-1)
+                    for chunk_fitness in self.executor.map(self.fitness_function, chunks)])
+            if len(fitnesses) != len(genotypes):
+                raise ValueError("The vectorized fitness function returned %d values for %d "
+                                 "genotypes." % (len(fitnesses), len(genotypes)))
+            return fitnesses
+
+        if self.executor is None:
+            results = map(self.fitness_function, genotypes)
+        else:
+            results = self.executor.map(self.fitness_function, genotypes,
+                                        chunksize=self.chunksize or 1)
+        return np.array([np.asarray(fitness, dtype=float).item() for fitness in results])
+
+    async def _evaluate_async(self, genotypes, semaphore, timeout, timeout_fitness):
+        """Evaluate a batch of genotypes with an asynchronous fitness function.
+
+        :param genotypes: the (N, individual_length) array of genotypes to evaluate
+        :param semaphore: the semaphore limiting the number of concurrent evaluations, or None
+        :param timeout: the maximum time in seconds a single evaluation may take, or None
+        :param timeout_fitness: the fitness assigned when an evaluation times out
+        :return: the array of N fitness values
+        """
+        async def evaluate(argument):
+            try:
+                if semaphore is None:
+                    return await asyncio.wait_for(self.fitness_function(argument), timeout), True
+                async with semaphore:
+                    return await asyncio.wait_for(self.fitness_function(argument), timeout), True
+            except asyncio.TimeoutError:
+                return timeout_fitness, False
+
+        if self.fitness_cache is None:
+            fitnesses = np.full(len(genotypes), np.nan)
+            missing = {index: [index] for index in range(len(genotypes))}
+        else:
+            fitnesses, missing = self.fitness_cache.lookup(genotypes)
+        rows = [indices[0] for indices in missing.values()]
+
+        if not self.vectorized:
+            values = await asyncio.gather(*[evaluate(genotypes[row]) for row in rows])
+            values = [(np.asarray(fitness, dtype=float).item(), completed)
+                      for fitness, completed in values]
+        elif rows:
+            fitness, completed = await evaluate(genotypes[rows])
+            fitness = np.asarray(fitness, dtype=float).reshape(-1)
+            if not completed:
+                fitness = np.full(len(rows), timeout_fitness)
+            elif len(fitness) != len(rows):
+                raise ValueError("The vectorized fitness function returned %d values for %d "
+                                 "genotypes." % (len(fitness), len(rows)))
+            values = [(value, completed) for value in fitness]
+        else:
+            values = []
+
+        for (key, indices), (fitness, completed) in zip(missing.items(), values):
+            if completed and self.fitness_cache is not None:
+                self.fitness_cache.store(key, fitness)
+            fitnesses[indices] = fitness
+        return fitnesses
+
+    def _select_cma(self, children):
+        """Adapt the shared CMA distribution to the evaluated children, and rank them.
+
+        The parents are discarded, as with comma selection.
+
+        :param children: the population of evaluated children
+        :return: the best children, as many as the population size, ordered from best to worst
+        """
+        scores = self._scores(children.fitness)
+        self._cma.update(children.genotypes, scores)
+        return children.take(top_k(scores, self._population_size))
+
+    def _sample_cma(self):
+        """Sample a generation of children from the shared CMA distribution.
+
+        :return: an unevaluated population holding the children
+        """
+        genotypes = self._cma.sample(self.random)
+        return Population(genotypes, self.strategy, np.empty((len(genotypes), 0)),
+                          random_seed=self.random, dtype=self.dtype)
+
+    def _create_cma(self):
+        """Create the initial shared distribution of the CMA strategy.
+
+        :return: a CovarianceMatrixAdaptation centered on warm_start + mean with step size std
+        """
+        return CovarianceMatrixAdaptation(
+            self.warm_start + np.broadcast_to(self.mean, (self.individual_length,)),
+            self.std, self._population_size * self.num_children)
+
+    def _init_population(self):
+        if self.strategy == Strategy.CMA:
+            self._cma = self._create_cma()
+            return self._constrain(self._sample_cma())
+        self._cma = None
+        strategy_parameters = standard_normal(
+            self.random, Population.num_strategy_parameters(self.strategy, self.individual_length),
+            self.dtype)
+        return self._constrain(Population(
+            self._initial_genotypes(self._population_size), self.strategy,
+            np.tile(strategy_parameters, (self._population_size, 1)), random_seed=self.random,
+            dtype=self.dtype))
+
+    def _initial_genotypes(self, size):
+        """Sample genotypes of the initial population around the warm start.
+
+        :param size: the number of genotypes to sample
+        :return: the (size, individual_length) array of genotypes
+        """
+        offsets = standard_normal(self.random, (size, self.individual_length),
+                                  self.dtype) * self.std + self.mean
+        return np.asarray(self.warm_start, dtype=self.dtype) + offsets
+
+
+def _same_memory(array, other):
+    """Check whether two arrays view exactly the same memory, without comparing their contents.
+
+    :param array: the array to check
+    :param other: the array to check against
+    :return: whether both arrays start at the same address with the same shape and strides
+    """
+    return array.__array_interface__['data'][0] == other.__array_interface__['data'][0] \
+        and array.shape == other.shape and array.strides == other.strides
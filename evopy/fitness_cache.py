@@ -0,0 +1,118 @@
+"""Module containing the FitnessCache class, used to avoid re-evaluating identical genotypes."""
+from collections import OrderedDict
+
+import numpy as np
+
+
+class FitnessCache:
+    """Bounded least-recently-used cache of fitness values, keyed by the bytes of a genotype.
+
+    Only exact duplicates hit the cache, which mostly happens once the mutation strength has
+    collapsed to its lower bound on low-dimensional problems.
+    """
+
+    def __init__(self, max_size):
+        """Initializes the cache.
+
+        :param max_size: the maximum number of fitness values kept in the cache
+        """
+        if max_size < 1:
+            raise ValueError("The maximum size of the fitness cache must be at least 1.")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    @staticmethod
+    def key(genotype):
+        """Compute the cache key of a genotype.
+
+        :param genotype: the genotype to compute the key for
+        :return: the raw bytes of the genotype
+        """
+        return np.ascontiguousarray(genotype).tobytes()
+
+    def evaluate(self, fitness_function, genotype):
+        """Return the fitness of the genotype, calling the fitness function only on a cache miss.
+
+        :param fitness_function: the fitness function to evaluate the genotype with
+        :param genotype: the genotype to evaluate
+        :return: the (possibly cached) fitness value of the genotype
+        """
+        key = self.key(genotype)
+        if key in self._values:
+            self.hits += 1
+            self._values.move_to_end(key)
+            return self._values[key]
+        self.misses += 1
+        fitness = fitness_function(genotype)
+        self.store(key, fitness)
+        return fitness
+
+    def lookup(self, genotypes):
+        """Look up the cached fitness of each row of a batch of genotypes.
+
+        Rows which duplicate an earlier row of the batch count as hits, as they only need to be
+        evaluated once.
+
+        :param genotypes: the (N, d) array of genotypes to look up
+        :return: the array of N cached fitness values, which is NaN where the value is missing,
+                 and a dict mapping the key of each missing genotype to the rows holding it
+        """
+        fitnesses = np.full(len(genotypes), np.nan)
+        missing = {}
+        for index, genotype in enumerate(genotypes):
+            key = self.key(genotype)
+            if key in self._values:
+                self.hits += 1
+                self._values.move_to_end(key)
+                fitnesses[index] = self._values[key]
+            elif key in missing:
+                self.hits += 1
+                missing[key].append(index)
+            else:
+                self.misses += 1
+                missing[key] = [index]
+        return fitnesses, missing
+
+    def store(self, key, fitness):
+        """Store a fitness value, evicting the least recently used value if the cache is full.
+
+        :param key: the key of the evaluated genotype, see FitnessCache.key
+        :param fitness: the fitness value of the genotype
+        """
+        self._values[key] = fitness
+        self._values.move_to_end(key)
+        if len(self._values) > self.max_size:
+            self._values.popitem(last=False)
+
+    def evaluate_batch(self, fitness_function, genotypes):
+        """Return the fitness of each row, calling the fitness function once on all cache misses.
+
+        Duplicate rows within the batch are only passed to the fitness function once.
+
+        :param fitness_function: the vectorized fitness function, which maps an (N, d) array of
+                                 genotypes to an array of N fitness values
+        :param genotypes: the (N, d) array of genotypes to evaluate
+        :return: an array with the (possibly cached) fitness value of each genotype
+        """
+        fitnesses, missing = self.lookup(genotypes)
+        if missing:
+            values = np.asarray(fitness_function(
+                genotypes[[indices[0] for indices in missing.values()]])).reshape(-1)
+            if len(values) != len(missing):
+                raise ValueError("The vectorized fitness function returned %d values for %d "
+                                 "genotypes." % (len(values), len(missing)))
+            for (key, indices), value in zip(missing.items(), values):
+                self.store(key, value)
+                fitnesses[indices] = value
+        return fitnesses
+
+    def clear(self):
+        """Remove all cached fitness values and reset the hit and miss counters."""
+        self._values.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,198 @@
+"""Module containing the History class, used to record the progress of a run to disk."""
+import math
+import os
+
+import numpy as np
+
+# The shape in the header of a history file is padded to this many digits, so that the header
+# keeps its length when the number of records grows.
+_SHAPE_DIGITS = 20
+
+
+class History:
+    """Records statistics of every generation of a run to disk, using a bounded amount of memory.
+
+    Two files are written to the history directory, which are regular .npy files holding one
+    structured record per row, and can be read with History.load or np.load:
+
+    - stats.npy: per generation, the best fitness so far, the mean, median and worst fitness of
+      the population, and the smallest, mean and largest mutation step size in the population
+    - best_genotypes.npy: every genotype_interval generations, the best genotype so far
+
+    Records are kept in preallocated buffers of chunk_size generations, which are appended to
+    the files whenever they are full, when a checkpoint is saved and when the run finishes. When
+    recording starts at some generation, e.g. after resuming from a checkpoint, the records of
+    that and any later generation already present in the files are dropped, so that a resumed run
+    continues the history of the original run. Likewise, a new run recorded into the same
+    directory replaces the history of the previous one.
+    """
+
+    STATS_DTYPE = np.dtype([('generation', '<i8'), ('best_fitness', '<f8'),
+                            ('mean_fitness', '<f8'), ('median_fitness', '<f8'),
+                            ('worst_fitness', '<f8'), ('sigma_min', '<f8'),
+                            ('sigma_mean', '<f8'), ('sigma_max', '<f8')])
+
+    def __init__(self, directory, genotype_interval=100, chunk_size=1024):
+        """Initializes the history.
+
+        :param directory: the directory to write the history files to, which is created if needed
+        :param genotype_interval: record the best genotype every this many generations
+        :param chunk_size: the number of generations kept in memory before they are written
+        """
+        if genotype_interval < 1 or chunk_size < 1:
+            raise ValueError("The genotype interval and chunk size should be at least 1.")
+        self.directory = directory
+        self.genotype_interval = genotype_interval
+        self.chunk_size = chunk_size
+        self._stats = np.empty(chunk_size, dtype=self.STATS_DTYPE)
+        self._num_stats = 0
+        self._genotypes = None
+        self._num_genotypes = 0
+        self._last_generation = None
+
+    @property
+    def stats_path(self):
+        """Return the path of the file holding the statistics of each generation.
+
+        :return: the path of stats.npy
+        """
+        return os.path.join(self.directory, 'stats.npy')
+
+    @property
+    def genotypes_path(self):
+        """Return the path of the file holding the best genotypes.
+
+        :return: the path of best_genotypes.npy
+        """
+        return os.path.join(self.directory, 'best_genotypes.npy')
+
+    # pylint: disable=too-many-arguments
+    def record(self, generation, best_fitness, fitness, step_sizes, best_genotype,
+               maximize=False):
+        """Record the statistics of a generation.
+
+        :param generation: the number of the generation
+        :param best_fitness: the best fitness found so far
+        :param fitness: the fitness values of the population
+        :param step_sizes: an array holding the mutation step sizes used by the population
+        :param best_genotype: the best genotype found so far
+        :param maximize: whether the fitness function is maximized, which decides the worst fitness
+        """
+        if self._last_generation is None or generation <= self._last_generation:
+            self.flush()
+            self._start(generation, best_genotype)
+        self._last_generation = generation
+        self._stats[self._num_stats] = (
+            generation, best_fitness, np.mean(fitness), np.median(fitness),
+            np.min(fitness) if maximize else np.max(fitness),
+            np.min(step_sizes), np.mean(step_sizes), np.max(step_sizes))
+        self._num_stats += 1
+        if generation % self.genotype_interval == 0:
+            self._genotypes[self._num_genotypes] = (generation, best_genotype)
+            self._num_genotypes += 1
+        if self._num_stats == len(self._stats) or self._num_genotypes == len(self._genotypes):
+            self.flush()
+
+    def flush(self):
+        """Append the buffered records to the history files."""
+        if self._num_stats > 0:
+            _append(self.stats_path, self._stats[:self._num_stats])
+            self._num_stats = 0
+        if self._num_genotypes > 0:
+            _append(self.genotypes_path, self._genotypes[:self._num_genotypes])
+            self._num_genotypes = 0
+
+    @staticmethod
+    def load(directory):
+        """Read the history files of a directory, without loading them into memory.
+
+        :param directory: the directory the history was written to
+        :return: memory-mapped record arrays of the statistics and of the best genotypes
+        """
+        history = History(directory)
+        return np.load(history.stats_path, mmap_mode='r'), \
+            np.load(history.genotypes_path, mmap_mode='r')
+
+    def _start(self, generation, best_genotype):
+        """Prepare the history files for recording from the given generation on.
+
+        :param generation: the first generation which will be recorded
+        :param best_genotype: a genotype, giving the length and type of the recorded genotypes
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        best_genotype = np.asarray(best_genotype)
+        genotypes_dtype = np.dtype([('generation', '<i8'),
+                                    ('genotype', best_genotype.dtype, best_genotype.shape)])
+        self._genotypes = np.empty(math.ceil(self.chunk_size / self.genotype_interval) + 1,
+                                   dtype=genotypes_dtype)
+        _truncate(self.stats_path, self.STATS_DTYPE, generation)
+        _truncate(self.genotypes_path, genotypes_dtype, generation)
+
+
+def _header(dtype, count):
+    """Create the header of a .npy file of which the length does not depend on the count.
+
+    :param dtype: the type of the records
+    :param count: the number of records in the file
+    :return: the header bytes
+    """
+    header = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.lib.format.dtype_to_descr(dtype), count)
+    length = len(header) - len(str(count)) + _SHAPE_DIGITS + 1
+    length += -(10 + length) % 64
+    return b'\x93NUMPY\x01\x00' + length.to_bytes(2, 'little') \
+        + header.ljust(length - 1).encode('latin1') + b'\n'
+
+
+def _read_header(file):
+    """Read the header of a .npy file.
+
+    :param file: the file opened for reading, positioned at its start
+    :return: the number of records and their type
+    """
+    np.lib.format.read_magic(file)
+    shape, _, dtype = np.lib.format.read_array_header_1_0(file)
+    return shape[0], dtype
+
+
+def _truncate(path, dtype, generation):
+    """Create a history file, or drop the records of the given and later generations from it.
+
+    Recording from the first generation on always starts a new file.
+
+    :param path: the path of the history file
+    :param dtype: the type of the records, which should match the type of an existing file
+    :param generation: the first generation of which the records are dropped
+    """
+    if generation == 0 or not os.path.exists(path):
+        with open(path, 'wb') as file:
+            file.write(_header(dtype, 0))
+        return
+    with open(path, 'r+b') as file:
+        count, existing = _read_header(file)
+        if existing != dtype:
+            raise ValueError("The history file %s holds records of a different type." % path)
+        offset = file.tell()
+        generations = np.memmap(file, dtype=dtype, mode='r', offset=offset,
+                                shape=(count,))['generation'] if count > 0 else np.empty(0)
+        count = int(np.searchsorted(generations, generation))
+        del generations
+        file.truncate(offset + count * dtype.itemsize)
+        file.seek(0)
+        file.write(_header(dtype, count))
+
+
+def _append(path, records):
+    """Append records to a history file, and update its header once they have been written.
+
+    :param path: the path of the history file
+    :param records: the array of records to append
+    """
+    with open(path, 'r+b') as file:
+        count, _ = _read_header(file)
+        file.seek(file.tell() + count * records.dtype.itemsize)
+        file.write(records.tobytes())
+        file.truncate()
+        file.flush()
+        file.seek(0)
+        file.write(_header(records.dtype, count + len(records)))
@@ -2,7 +2,7 @@
 import numpy as np
 
 from evopy.strategy import Strategy
-from evopy.utils import random_with_seed
+from evopy.utils import random_with_seed, rotate
 
 
 class Individual:
@@ -25,7 +25,7 @@ class Individual:
         :param genotype: the genotype of the individual
         :param strategy: the strategy chosen to reproduce. See the Strategy enum for more
                          information
-        :param strategy_parameters: the parameters required for the given strategy, as a list
+        :param strategy_parameters: the parameters required for the given strategy, as an array
         """
         self.genotype = genotype
         self.length = len(genotype)
@@ -33,7 +33,7 @@ class Individual:
         self.random = random_with_seed(self.random_seed)
         self.fitness = None
         self.strategy = strategy
-        self.strategy_parameters = strategy_parameters
+        self.strategy_parameters = np.asarray(strategy_parameters)
         if not isinstance(strategy, Strategy):
             raise ValueError("Provided strategy parameter was not an instance of Strategy.")
         if strategy == Strategy.SINGLE_VARIANCE and len(strategy_parameters) == 1:
@@ -43,16 +43,22 @@ class Individual:
         elif strategy == Strategy.FULL_VARIANCE and len(strategy_parameters) == self.length * (
                 self.length + 1) / 2:
             self.reproduce = self._reproduce_full_variance
+        elif strategy == Strategy.CMA and len(strategy_parameters) == 0:
+            self.reproduce = self._reproduce_cma
         else:
             raise ValueError("The length of the strategy parameters was not correct.")
 
     def evaluate(self, fitness_function):
         """Evaluate the genotype of the individual using the provided fitness function.
 
+        The fitness function is only called the first time, after which the stored fitness is
+        returned.
+
         :param fitness_function: the fitness function to evaluate the individual with
         :return: the value of the fitness function using the individuals genotype
         """
-        self.fitness = fitness_function(self.genotype)
+        if self.fitness is None:
+            self.fitness = fitness_function(self.genotype)
 
         return self.fitness
 
@@ -64,9 +70,10 @@ class Individual:
         :return: an individual which is the offspring of the current instance
         """
         new_genotype = self.genotype + \
-                       self.strategy_parameters[0] * self.random.randn(self.length)
-        scale_factor = self.random.randn() * np.sqrt(1 / (2 * self.length))
-        new_parameters = [max(self.strategy_parameters[0] * np.exp(scale_factor), self._EPSILON)]
+                       self.strategy_parameters[0] * self.random.standard_normal(self.length)
+        scale_factor = self.random.standard_normal() * np.sqrt(1 / (2 * self.length))
+        new_parameters = np.array([max(self.strategy_parameters[0] * np.exp(scale_factor),
+                                       self._EPSILON)])
         return Individual(new_genotype, self.strategy, new_parameters, random_seed=self.random)
 
     def _reproduce_multiple_variance(self):
@@ -76,44 +83,52 @@ class Individual:
 
         :return: an individual which is the offspring of the current instance
         """
-        new_genotype = self.genotype + [self.strategy_parameters[i] * self.random.randn()
-                                        for i in range(self.length)]
-        global_scale_factor = self.random.randn() * np.sqrt(1 / (2 * self.length))
-        scale_factors = [self.random.randn() * np.sqrt(1 / 2 * np.sqrt(self.length))
-                         for _ in range(self.length)]
-        new_parameters = [max(np.exp(global_scale_factor + scale_factors[i])
-                              * self.strategy_parameters[i], self._EPSILON)
-                          for i in range(self.length)]
-        return Individual(new_genotype, self.strategy, new_parameters)
-
-    # pylint: disable=invalid-name
+        new_genotype = self.genotype + \
+            self.strategy_parameters * self.random.standard_normal(self.length)
+        global_scale_factor = self.random.standard_normal() * np.sqrt(1 / (2 * self.length))
+        scale_factors = self.random.standard_normal(self.length) \
+            * np.sqrt(1 / 2 * np.sqrt(self.length))
+        new_parameters = np.maximum(np.exp(global_scale_factor + scale_factors)
+                                    * self.strategy_parameters, self._EPSILON)
+        return Individual(new_genotype, self.strategy, new_parameters, random_seed=self.random)
+
     def _reproduce_full_variance(self):
         """Create a single offspring individual from the set genotype and strategy.
 
-        This function uses the full variance strategy, as described in [1]. To emphasize this, the
-        variable names of [1] are used in this function.
+        This function uses the full variance strategy, as described in [1]. The rotation matrix of
+        [1] is never built, instead its Givens rotations are applied to the sampled vector directly.
 
         :return: an individual which is the offspring of the current instance
         """
-        global_scale_factor = self.random.randn() * np.sqrt(1 / (2 * self.length))
-        scale_factors = [self.random.randn() * np.sqrt(1 / 2 * np.sqrt(self.length))
-                         for _ in range(self.length)]
-        new_variances = [max(np.exp(global_scale_factor + scale_factors[i])
-                             * self.strategy_parameters[i], self._EPSILON)
-                         for i in range(self.length)]
-        new_rotations = [self.strategy_parameters[i] + self.random.randn() * self._BETA
-                         for i in range(self.length, len(self.strategy_parameters))]
-        new_rotations = [rotation if abs(rotation) < np.pi
-                         else rotation - np.sign(rotation) * 2 * np.pi
-                         for rotation in new_rotations]
-        T = np.identity(self.length)
-        for p in range(self.length - 1):
-            for q in range(p + 1, self.length):
-                j = int((2 * self.length - p) * (p + 1) / 2 - 2 * self.length + q)
-                T_pq = np.identity(self.length)
-                T_pq[p][p] = T_pq[q][q] = np.cos(new_rotations[j])
-                T_pq[p][q] = -np.sin(new_rotations[j])
-                T_pq[q][p] = -T_pq[p][q]
-                T = np.matmul(T, T_pq)
-        new_genotype = self.genotype + T @ self.random.randn(self.length)
-        return Individual(new_genotype, self.strategy, new_variances + new_rotations)
+        global_scale_factor = self.random.standard_normal() * np.sqrt(1 / (2 * self.length))
+        scale_factors = self.random.standard_normal(self.length) \
+            * np.sqrt(1 / 2 * np.sqrt(self.length))
+        new_variances = np.maximum(np.exp(global_scale_factor + scale_factors)
+                                   * self.strategy_parameters[:self.length], self._EPSILON)
+        new_rotations = self.strategy_parameters[self.length:] \
+            + self.random.standard_normal(len(self.strategy_parameters) - self.length) \
+            * self._BETA
+        new_rotations = wrap_rotations(new_rotations)
+        new_genotype = self.genotype + rotate(new_rotations,
+                                              self.random.standard_normal(self.length))
+        return Individual(new_genotype, self.strategy,
+                          np.concatenate((new_variances, new_rotations)), random_seed=self.random)
+
+    def _reproduce_cma(self):
+        """Individuals using the CMA strategy share a single search distribution, from which the
+        offspring of the whole population is sampled. See evopy.cma.
+
+        :raises ValueError: always
+        """
+        raise ValueError("Individuals using the CMA strategy can not reproduce on their own, "
+                         "their offspring is sampled from the shared distribution.")
+
+
+def wrap_rotations(rotations):
+    """Wrap mutated rotation angles back into the interval (-pi, pi).
+
+    :param rotations: the array of rotation angles
+    :return: the wrapped rotation angles
+    """
+    return np.where(np.abs(rotations) < np.pi,
+                    rotations, rotations - np.sign(rotations) * 2 * np.pi)
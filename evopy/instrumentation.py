@@ -0,0 +1,71 @@
+"""Module containing the Instrumentation class, used to time the phases of the algorithm."""
+import time
+from contextlib import contextmanager
+
+
+class Instrumentation:
+    """Records the wall time spent per phase of the algorithm, and counts evaluations.
+
+    The phases are 'init', 'reproduction', 'evaluation', 'selection' and 'reporting'. Both the
+    values of the current generation and the totals over the whole run are kept.
+
+    An optional hook can be given to plug in an external profiler or metrics sink. It is called
+    as hook(phase, generation) when a phase starts and should return a context manager, which is
+    exited when the phase ends.
+    """
+
+    PHASES = ('init', 'reproduction', 'evaluation', 'selection', 'reporting')
+
+    def __init__(self, hook=None):
+        """Initializes the instrumentation.
+
+        :param hook: a callable returning a context manager wrapping each phase, or None
+        """
+        self.hook = hook
+        self.timings = dict.fromkeys(self.PHASES, 0.0)
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.generation_timings = dict.fromkeys(self.PHASES, 0.0)
+        self.generation_evaluations = 0
+        self.generation_cache_hits = 0
+
+    @contextmanager
+    def phase(self, name, generation):
+        """Time a phase of the algorithm, passing it to the hook if one was given.
+
+        :param name: the name of the phase, one of PHASES
+        :param generation: the generation the phase belongs to
+        """
+        start_time = time.perf_counter()
+        if self.hook is None:
+            yield
+        else:
+            with self.hook(name, generation):
+                yield
+        duration = time.perf_counter() - start_time
+        self.timings[name] += duration
+        self.generation_timings[name] += duration
+
+    def count(self, evaluations, cache_hits):
+        """Count the fitness function calls and cache hits of an evaluation phase.
+
+        :param evaluations: the number of genotypes passed to the fitness function
+        :param cache_hits: the number of genotypes of which the fitness was found in the cache
+        """
+        self.evaluations += evaluations
+        self.cache_hits += cache_hits
+        self.generation_evaluations += evaluations
+        self.generation_cache_hits += cache_hits
+
+    def next_generation(self):
+        """Reset the values of the current generation."""
+        self.generation_timings = dict.fromkeys(self.PHASES, 0.0)
+        self.generation_evaluations = 0
+        self.generation_cache_hits = 0
+
+    def reset(self):
+        """Reset both the values of the current generation and the totals."""
+        self.timings = dict.fromkeys(self.PHASES, 0.0)
+        self.evaluations = 0
+        self.cache_hits = 0
+        self.next_generation()
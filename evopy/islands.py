@@ -0,0 +1,232 @@
+"""Module containing the island model, which evolves several populations in parallel processes."""
+import multiprocessing
+from enum import Enum
+
+import numpy as np
+
+from evopy.evopy import EvoPy
+from evopy.progress_report import ProgressReport
+from evopy.strategy import Strategy
+from evopy.utils import random_with_seed
+
+
+class Topology(Enum):
+    """Enum used to distinguish the ways in which islands exchange migrants.
+
+    - RING: each island sends its migrants to the next island
+    - FULLY_CONNECTED: each island sends its migrants to all other islands
+    - RANDOM: each island sends its migrants to another island, picked at random at each migration
+    """
+    RING = 1
+    FULLY_CONNECTED = 2
+    RANDOM = 3
+
+
+class IslandModel:
+    """Evolves several EvoPy populations in separate processes, with periodic migration.
+
+    The islands run in lockstep: each evolves for a number of generations, after which the best
+    individuals of every island are sent, as plain arrays, to the islands given by the topology.
+    The migrants replace the worst individuals of the receiving island. The progress of all
+    islands is merged into a single stream of reports, holding the best individual of any island.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, fitness_function, individual_length, num_islands=4, migration_interval=10,
+                 num_migrants=1, topology=Topology.RING, generations=100, random_seed=None,
+                 reporter=None, **options):
+        """Initializes an IslandModel instance.
+
+        :param fitness_function: the fitness function on which the individuals are evaluated. It
+                                 is sent to the worker processes, so it should be picklable on
+                                 platforms that do not fork
+        :param individual_length: the length of each individual
+        :param num_islands: the number of islands, each evolving in its own process
+        :param migration_interval: the number of generations between migrations
+        :param num_migrants: the number of best individuals each island sends per migration
+        :param topology: the topology along which migrants are sent, see the Topology enum
+        :param generations: the number of generations to execute on each island
+        :param random_seed: the seed from which the independent SeedSequences of the islands are
+                            spawned, giving each island its own PCG64 Generator
+        :param reporter: callback to be invoked at each generation with a ProgressReport as
+                         argument, reporting the best individual over all islands
+        :param options: further keyword arguments passed to the EvoPy instance of each island,
+                        such as population_size, strategy or target_fitness_value. Strategy.CMA
+                        is not supported, since its children are sampled from a shared
+                        distribution which migrants would not take part in
+        """
+        if not isinstance(topology, Topology):
+            raise ValueError("Provided topology parameter was not an instance of Topology.")
+        if num_islands < 1:
+            raise ValueError("There should be at least one island.")
+        if options.get('strategy') == Strategy.CMA:
+            raise ValueError("The CMA strategy is not supported by IslandModel.")
+        self.fitness_function = fitness_function
+        self.individual_length = individual_length
+        self.num_islands = num_islands
+        self.migration_interval = migration_interval
+        self.num_migrants = num_migrants
+        self.topology = topology
+        self.generations = generations
+        self.random_seed = random_seed
+        self.reporter = reporter
+        self.options = options
+
+    def run(self):
+        """Run the evolutionary strategy algorithm on all islands.
+
+        The run ends when all generations have been executed, or when any island stops early.
+
+        :return: the best genotype found on any island
+        """
+        if self.individual_length == 0:
+            return None
+
+        seeds = np.random.SeedSequence(self.random_seed).spawn(self.num_islands + 1)
+        random = random_with_seed(seeds[-1])
+        connections, processes = [], []
+        for island in range(self.num_islands):
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_island, args=(
+                worker_connection, self._island_options(seeds[island]),
+                self.migration_interval, self.num_migrants))
+            process.start()
+            worker_connection.close()
+            connections.append(connection)
+            processes.append(process)
+
+        best = (None, None, None)
+        try:
+            generation = 0
+            running = True
+            while running:
+                results = [connection.recv() for connection in connections]
+                running = all(result[0] for result in results)
+                generation, best = self._report(results, generation, best)
+                if running:
+                    for connection, immigrants in zip(connections, self._migrate(
+                            [result[3] for result in results], random)):
+                        connection.send(immigrants)
+            for connection in connections:
+                connection.send(None)
+        finally:
+            for connection, process in zip(connections, processes):
+                connection.close()
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+        return best[1]
+
+    def _report(self, results, generation, best):
+        """Merge the progress of all islands since the last migration, and report it.
+
+        :param results: per island, the results sent by the island worker
+        :param generation: the number of generations reported so far
+        :param best: a tuple of the fitness, genotype and island of the best individual so far
+        :return: the updated number of generations reported and best individual
+        """
+        for island_generation in range(max(len(result[1]) for result in results)):
+            for island, (_, fitness, genotypes, _) in enumerate(results):
+                if island_generation < len(fitness) and (
+                        best[0] is None or self._is_better(fitness[island_generation], best[0])):
+                    best = (fitness[island_generation], genotypes[island_generation], island)
+            if self.reporter is not None:
+                self.reporter(ProgressReport(generation, best[1], best[0], island=best[2]))
+            generation += 1
+        return generation, best
+
+    def _island_options(self, random_seed):
+        """Return the keyword arguments of the EvoPy instance of an island.
+
+        :param random_seed: the SeedSequence of the island
+        :return: the keyword arguments, including the fitness function and individual length
+        """
+        options = dict(self.options)
+        options.update(fitness_function=self.fitness_function,
+                       individual_length=self.individual_length, generations=self.generations,
+                       random_seed=random_seed)
+        return options
+
+    def _is_better(self, fitness, other):
+        """Check whether a fitness value is strictly better than another.
+
+        :param fitness: the fitness value to compare
+        :param other: the fitness value to compare against
+        :return: whether fitness is better than other
+        """
+        return fitness > other if self.options.get('maximize', False) else fitness < other
+
+    def _migrate(self, emigrants, random):
+        """Route the emigrants of each island along the topology.
+
+        :param emigrants: per island, a tuple of the genotypes, strategy parameters and fitness
+                          of its emigrants
+        :param random: the RandomState or Generator used for the random topology
+        :return: per island, a tuple of the arrays of its immigrants
+        """
+        num_islands = len(emigrants)
+        if num_islands == 1:
+            sources = [[]]
+        elif self.topology == Topology.RING:
+            sources = [[(island - 1) % num_islands] for island in range(num_islands)]
+        elif self.topology == Topology.FULLY_CONNECTED:
+            sources = [[source for source in range(num_islands) if source != island]
+                       for island in range(num_islands)]
+        else:
+            targets = (np.arange(num_islands)
+                       + 1 + random.choice(num_islands - 1, size=num_islands)) % num_islands
+            sources = [np.flatnonzero(targets == island) for island in range(num_islands)]
+        return [tuple(np.concatenate([emigrants[source][array] for source in island_sources])
+                      if len(island_sources) > 0 else emigrants[0][array][:0]
+                      for array in range(3))
+                for island_sources in sources]
+
+
+def _run_island(connection, options, migration_interval, num_migrants):
+    """Evolve a single island, exchanging migrants with the coordinating process.
+
+    After every migration interval, the island sends whether it is still running, the best
+    fitness and genotype after each of those generations, and its emigrants. It then receives
+    its immigrants, or None when it should stop.
+
+    :param connection: the connection to the coordinating process
+    :param options: the keyword arguments of the EvoPy instance of the island
+    :param migration_interval: the number of generations between migrations
+    :param num_migrants: the number of best individuals to send per migration
+    """
+    evopy = EvoPy(**options)
+    pending = evopy._start()
+    pending.fitness[:] = evopy._evaluate(pending.genotypes)
+    running = evopy._complete_generation()
+    while True:
+        fitness, genotypes = [], []
+        while running and (len(fitness) < migration_interval or evopy._population is None):
+            pending = evopy._reproduce()
+            if pending is None:
+                running = False
+                break
+            pending.fitness[:] = evopy._evaluate(pending.genotypes)
+            generation = evopy._generation
+            running = evopy._complete_generation()
+            if evopy._generation > generation:
+                fitness.append(evopy._best.fitness)
+                genotypes.append(evopy._best.genotype)
+
+        population = evopy._population
+        emigrants = evopy._rank(population.fitness)[:num_migrants]
+        connection.send((running, np.array(fitness),
+                         np.array(genotypes).reshape(len(genotypes), evopy.individual_length),
+                         (population.genotypes[emigrants],
+                          population.strategy_parameters[emigrants],
+                          population.fitness[emigrants])))
+
+        immigrants = connection.recv()
+        if immigrants is None:
+            break
+        genotypes, strategy_parameters, fitness = immigrants
+        worst = evopy._rank(population.fitness)[::-1][:min(len(fitness), len(population))]
+        population.genotypes[worst] = genotypes[:len(worst)]
+        population.strategy_parameters[worst] = strategy_parameters[:len(worst)]
+        population.fitness[worst] = fitness[:len(worst)]
+    connection.close()
@@ -0,0 +1,243 @@
+"""Module containing the Population class, an array-backed collection of individuals."""
+import math
+
+import numpy as np
+
+from evopy.individual import Individual, wrap_rotations
+from evopy.strategy import Strategy
+from evopy.utils import random_with_seed, rotate, standard_normal
+
+
+class Population:
+    """A population of individuals, stored as contiguous arrays.
+
+    The genotypes, strategy parameters and fitness values of all individuals are kept in the arrays
+    ``genotypes[N, d]``, ``strategy_parameters[N, k]`` and ``fitness[N]``, so that reproduction
+    and selection can be done for the whole population at once instead of per Individual. Indexing
+    the population returns an Individual viewing the corresponding rows.
+
+    The genotypes and strategy parameters are stored as float32 or float64, while the fitness
+    values are always float64. See memory_footprint for the memory used per individual.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, genotypes, strategy, strategy_parameters, fitness=None, random_seed=None,
+                 dtype=np.float64):
+        """Initialize the Population.
+
+        :param genotypes: the (N, d) array of genotypes of the individuals
+        :param strategy: the strategy chosen to reproduce. See the Strategy enum for more
+                         information
+        :param strategy_parameters: the (N, k) array of parameters required for the given strategy
+        :param fitness: the N fitness values of the individuals, or None if not evaluated yet
+        :param random_seed: the seed to use for the random number generator
+        :param dtype: the floating point type of the genotypes and strategy parameters
+        """
+        self.genotypes = np.asarray(genotypes, dtype=dtype)
+        self.strategy_parameters = np.asarray(strategy_parameters, dtype=dtype)
+        self.dtype = self.genotypes.dtype
+        self.size, self.length = self.genotypes.shape
+        self.fitness = np.full(self.size, np.nan) if fitness is None \
+            else np.asarray(fitness, dtype=float)
+        self.strategy = strategy
+        self.random_seed = random_seed
+        self.random = random_with_seed(self.random_seed)
+        if not isinstance(strategy, Strategy):
+            raise ValueError("Provided strategy parameter was not an instance of Strategy.")
+        if self.strategy_parameters.shape != (self.size, self.num_strategy_parameters(
+                strategy, self.length)):
+            raise ValueError("The length of the strategy parameters was not correct.")
+
+    @staticmethod
+    def num_strategy_parameters(strategy, length):
+        """Return the number of strategy parameters each individual carries.
+
+        :param strategy: the strategy used by the individuals
+        :param length: the length of the genotype of each individual
+        :return: the number of strategy parameters per individual
+        """
+        if strategy == Strategy.SINGLE_VARIANCE:
+            return 1
+        if strategy == Strategy.MULTIPLE_VARIANCE:
+            return length
+        if strategy == Strategy.FULL_VARIANCE:
+            return length * (length + 1) // 2
+        if strategy == Strategy.CMA:
+            return 0
+        raise ValueError("Provided strategy parameter was not an instance of Strategy")
+
+    @staticmethod
+    def memory_footprint(strategy, length, dtype=np.float64):
+        """Return the number of bytes each individual of a population takes up.
+
+        This covers the genotype, the strategy parameters and the fitness value. While a
+        generation is created and selected, the children, the normal samples they are mutated
+        with and the survivors are held at the same time as the parents. For num_children
+        children per parent, the peak memory use of a population of size N is therefore about
+        (3 + 3 * num_children) * N * memory_footprint(strategy, length, dtype) bytes.
+
+        :param strategy: the strategy used by the individuals
+        :param length: the length of the genotype of each individual
+        :param dtype: the floating point type of the genotypes and strategy parameters
+        :return: the number of bytes per individual
+        """
+        return np.dtype(dtype).itemsize * (
+            length + Population.num_strategy_parameters(strategy, length)) + 8
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """Return an Individual viewing the genotype and strategy parameters at the given index.
+
+        :param index: the index of the individual in the population
+        :return: the individual at the given index
+        """
+        individual = Individual(self.genotypes[index], self.strategy,
+                                self.strategy_parameters[index], random_seed=self.random)
+        if not np.isnan(self.fitness[index]):
+            individual.fitness = self.fitness[index]
+        return individual
+
+    def take(self, indices):
+        """Return a new population holding the individuals at the given indices.
+
+        :param indices: the indices of the individuals to take
+        :return: a population with copies of the selected individuals
+        """
+        return Population(self.genotypes[indices], self.strategy,
+                          self.strategy_parameters[indices], self.fitness[indices],
+                          random_seed=self.random, dtype=self.dtype)
+
+    def concatenate(self, other):
+        """Return a new population holding the individuals of this population followed by other.
+
+        :param other: the population to append
+        :return: the combined population
+        """
+        return Population(np.concatenate((self.genotypes, other.genotypes)), self.strategy,
+                          np.concatenate((self.strategy_parameters, other.strategy_parameters)),
+                          np.concatenate((self.fitness, other.fitness)), random_seed=self.random,
+                          dtype=self.dtype)
+
+    def reproduce(self, num_children=1):
+        """Create the offspring of all individuals at once.
+
+        The children are ordered by round, so the first N children are the first child of each
+        parent, the next N the second child of each parent, and so on. All normal samples needed
+        by the generation are drawn in a single block, of which each child gets one row.
+
+        :param num_children: the number of children generated per parent individual
+        :return: an unevaluated population holding all children
+        """
+        num_normals = self.num_normals(self.strategy, self.length)
+        genotypes = np.tile(self.genotypes, (num_children, 1))
+        parameters = np.tile(self.strategy_parameters, (num_children, 1))
+        normals = standard_normal(self.random, (len(genotypes), num_normals), self.dtype)
+        genotypes, parameters = self.mutate(self.strategy, genotypes, parameters, normals)
+        return Population(genotypes, self.strategy, parameters, random_seed=self.random,
+                          dtype=self.dtype)
+
+    @staticmethod
+    def num_normals(strategy, length):
+        """Return the number of standard normal samples needed to create a single child.
+
+        :param strategy: the strategy used by the individuals
+        :param length: the length of the genotype of each individual
+        :return: the number of normal samples per child
+        """
+        if strategy == Strategy.SINGLE_VARIANCE:
+            return length + 1
+        return length + 1 + Population.num_strategy_parameters(strategy, length)
+
+    @staticmethod
+    def mutate(strategy, genotypes, parameters, normals):
+        """Mutate rows of parent genotypes and strategy parameters in bulk.
+
+        To keep the peak memory of large populations low, the mutation is applied in place: the
+        given arrays are overwritten, and should be copies owned by the caller.
+
+        :param strategy: the strategy used by the parents
+        :param genotypes: the (M, d) array of parent genotypes, one row per child
+        :param parameters: the (M, k) array of parent strategy parameters
+        :param normals: an (M, num_normals) array of standard normal samples
+        :return: the genotypes and strategy parameters of the children
+        """
+        if strategy == Strategy.SINGLE_VARIANCE:
+            return Population._reproduce_single_variance(genotypes, parameters, normals)
+        if strategy == Strategy.MULTIPLE_VARIANCE:
+            return Population._reproduce_multiple_variance(genotypes, parameters, normals)
+        if strategy == Strategy.FULL_VARIANCE:
+            return Population._reproduce_full_variance(genotypes, parameters, normals)
+        raise ValueError("Individuals using the CMA strategy can not reproduce on their own, "
+                         "their offspring is sampled from the shared distribution.")
+
+    @staticmethod
+    def _scale_variances(variances, normals, length):
+        """Scale variances in place by their global and individual log-normal factors.
+
+        :param variances: the (M, d) array of variances, which is overwritten
+        :param normals: the (M, d + 1) array of the global and individual standard normal samples,
+                        which is overwritten
+        :param length: the length d of the individuals
+        """
+        scale_factors = normals[:, 1:]
+        scale_factors *= math.sqrt(1 / 2 * math.sqrt(length))
+        scale_factors += normals[:, :1] * math.sqrt(1 / (2 * length))
+        np.exp(scale_factors, out=scale_factors)
+        variances *= scale_factors
+        np.maximum(variances, Individual._EPSILON, out=variances)
+
+    @staticmethod
+    def _reproduce_single_variance(genotypes, parameters, normals):
+        """Mutate the given parent rows in bulk, using the single variance strategy.
+
+        :param genotypes: the (M, d) array of parent genotypes
+        :param parameters: the (M, 1) array of parent variances
+        :param normals: an (M, d + 1) array of standard normal samples
+        :return: the genotypes and strategy parameters of the children
+        """
+        length = genotypes.shape[1]
+        mutations = normals[:, :length]
+        mutations *= parameters
+        genotypes += mutations
+        scale_factors = normals[:, length:] * math.sqrt(1 / (2 * length))
+        parameters = np.maximum(parameters * np.exp(scale_factors), Individual._EPSILON)
+        return genotypes, parameters
+
+    @staticmethod
+    def _reproduce_multiple_variance(genotypes, parameters, normals):
+        """Mutate the given parent rows in bulk, using the multiple variance strategy.
+
+        :param genotypes: the (M, d) array of parent genotypes
+        :param parameters: the (M, d) array of parent variances
+        :param normals: an (M, 2d + 1) array of standard normal samples
+        :return: the genotypes and strategy parameters of the children
+        """
+        length = genotypes.shape[1]
+        mutations = normals[:, :length]
+        mutations *= parameters
+        genotypes += mutations
+        Population._scale_variances(parameters, normals[:, length:], length)
+        return genotypes, parameters
+
+    @staticmethod
+    def _reproduce_full_variance(genotypes, parameters, normals):
+        """Mutate the given parent rows in bulk, using the full variance strategy.
+
+        The correlated mutations of all children are rotated together, one Givens rotation at a
+        time.
+
+        :param genotypes: the (M, d) array of parent genotypes
+        :param parameters: the (M, d * (d + 1) / 2) array of parent variances and rotations
+        :param normals: an (M, d + 1 + d * (d + 1) / 2) array of standard normal samples
+        :return: the genotypes and strategy parameters of the children
+        """
+        length = genotypes.shape[1]
+        Population._scale_variances(parameters[:, :length], normals[:, length:2 * length + 1],
+                                    length)
+        rotations = parameters[:, length:]
+        rotations += normals[:, 2 * length + 1:] * Individual._BETA
+        rotations[...] = wrap_rotations(rotations)
+        genotypes += rotate(rotations, normals[:, :length])
+        return genotypes, parameters
@@ -4,13 +4,40 @@
 class ProgressReport:
     """Class representing a report on an intermediate state of the learning process."""
 
-    def __init__(self, generation, best_genotype, best_fitness):
+    # pylint: disable=too-many-arguments
+    def __init__(self, generation, best_genotype, best_fitness, island=None, timings=None,
+                 evaluations=None, cache_hits=None, saved_evaluations=None,
+                 repaired_children=None, rejected_children=None, restarts=None):
         """Initializes the report instance.
 
         :param generation: number identifying the reported generation
         :param best_genotype: the genotype of the best individual of that generation
         :param best_fitness: the fitness of the best individual of that generation
+        :param island: the island the best individual lives on, when running an island model
+        :param timings: when instrumentation is enabled, a dict mapping each phase of the
+                        algorithm to the time in seconds spent on it in that generation
+        :param evaluations: when instrumentation is enabled, the number of fitness function calls
+                            in that generation
+        :param cache_hits: when instrumentation is enabled, the number of fitness cache hits in
+                           that generation
+        :param saved_evaluations: when a surrogate is used, the number of children of that
+                                  generation which were discarded without being evaluated
+        :param repaired_children: when bounds or a constraint are given, the number of children of
+                                  that generation which were clipped, reflected or resampled into
+                                  the feasible region
+        :param rejected_children: when bounds or a constraint are given, the number of infeasible
+                                  children of that generation which were not evaluated
+        :param restarts: when termination criteria are given, the number of times the run was
+                         restarted with a larger population so far
         """
         self.generation = generation
         self.best_genotype = best_genotype
         self.best_fitness = best_fitness
+        self.island = island
+        self.timings = timings
+        self.evaluations = evaluations
+        self.cache_hits = cache_hits
+        self.saved_evaluations = saved_evaluations
+        self.repaired_children = repaired_children
+        self.rejected_children = rejected_children
+        self.restarts = restarts
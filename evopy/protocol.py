@@ -0,0 +1,170 @@
+"""The wire protocol spoken between the evaluation coordinator and its remote workers.
+
+Each message consists of a fixed size header followed by a payload. The header holds the kind of
+message, the type code and shape of the payload, a task identifier and a duration in seconds.
+Genotypes and fitness values are sent as the raw bytes of contiguous arrays, and are received
+directly into preallocated arrays, so no individual is ever pickled. Only the fitness function is
+pickled, once per worker.
+
+The messages are:
+
+- HELLO: sent by a worker when it connects, holding its name as UTF-8 bytes
+- FUNCTION: sent by the coordinator, holding the pickled fitness function and vectorized flag
+- TASK: sent by the coordinator, holding an (n, d) array of genotypes to evaluate
+- RESULT: sent by a worker, holding the n fitness values of a task and the evaluation time
+- ERROR: sent by a worker when a task failed, holding the traceback as UTF-8 bytes
+
+Headers are validated before anything is allocated, so that a peer which does not speak the
+protocol, e.g. a port scanner, raises a ProtocolError rather than corrupting the run.
+"""
+import struct
+import time
+
+import numpy as np
+
+HELLO = 1
+FUNCTION = 2
+TASK = 3
+RESULT = 4
+ERROR = 5
+
+_KINDS = (HELLO, FUNCTION, TASK, RESULT, ERROR)
+
+_HEADER = struct.Struct('<BcQQQd')
+_BYTES = b'B'
+_FLOATS = (b'f', b'd')
+
+# The largest payload accepted, in bytes.
+MAX_PAYLOAD = 1 << 30
+
+
+class ProtocolError(ConnectionError):
+    """Raised when a peer sends a message which does not follow the protocol."""
+
+
+def send_message(connection, kind, payload, task=0, seconds=0.0):
+    """Send a message over a socket.
+
+    :param connection: the connected socket
+    :param kind: the kind of message, e.g. TASK
+    :param payload: the payload, either bytes or a 1-D or 2-D numpy array
+    :param task: the identifier of the task the message belongs to
+    :param seconds: the duration reported with the message
+    """
+    if isinstance(payload, bytes):
+        header = _HEADER.pack(kind, _BYTES, task, len(payload), 1, seconds)
+        connection.sendall(header + payload)
+        return
+    payload = np.ascontiguousarray(payload)
+    rows, columns = payload.shape if payload.ndim == 2 else (len(payload), 1)
+    header = _HEADER.pack(kind, payload.dtype.char.encode(), task, rows, columns, seconds)
+    if payload.nbytes < 65536:
+        connection.sendall(header + payload.tobytes())
+    else:
+        connection.sendall(header)
+        connection.sendall(memoryview(payload).cast('B'))
+
+
+def receive_message(connection):
+    """Receive a message from a socket, blocking until it has fully arrived.
+
+    :param connection: the connected socket
+    :return: a (kind, payload, task, seconds) tuple, with the payload as bytes or as a 2-D array
+    :raises ProtocolError: if the header of the message is invalid
+    :raises ConnectionError: if the connection was closed
+    """
+    kind, payload, task, seconds = _unpack_header(
+        _receive_into(connection, bytearray(_HEADER.size)))
+    if isinstance(payload, bytearray):
+        return kind, bytes(_receive_into(connection, payload)), task, seconds
+    _receive_into(connection, memoryview(payload.reshape(-1)).cast('B'))
+    return kind, payload, task, seconds
+
+
+class MessageReader:
+    """Receives messages from a socket piece by piece, so that a slow peer never blocks.
+
+    Call receive whenever the socket is readable, e.g. according to a selector. Each call receives
+    the bytes which have arrived, directly into the header or the preallocated payload of the
+    message, and returns the message once it is complete.
+    """
+
+    def __init__(self):
+        """Initializes a reader which waits for the header of the first message."""
+        self.started = None
+        self._header = bytearray(_HEADER.size)
+        self._message = None
+        self._view = memoryview(self._header)
+        self._received = 0
+
+    def receive(self, connection):
+        """Receive the bytes of the current message which are available on a readable socket.
+
+        :param connection: the connected socket, which should have data or an error pending
+        :return: the (kind, payload, task, seconds) tuple of the message if it is complete, or
+                 None otherwise. See receive_message
+        :raises ProtocolError: if the header of the message is invalid
+        :raises ConnectionError: if the connection was closed
+        """
+        count = connection.recv_into(self._view[self._received:])
+        if count == 0:
+            raise ConnectionError("The connection was closed.")
+        if self.started is None:
+            self.started = time.time()
+        self._received += count
+        if self._received < len(self._view):
+            return None
+        if self._message is None:
+            self._message = _unpack_header(self._header)
+            payload = self._message[1]
+            self._view = memoryview(payload if isinstance(payload, bytearray)
+                                    else payload.reshape(-1)).cast('B')
+            self._received = 0
+            if len(self._view) > 0:
+                return None
+        kind, payload, task, seconds = self._message
+        self.started = None
+        self._message = None
+        self._view = memoryview(self._header)
+        self._received = 0
+        return kind, bytes(payload) if isinstance(payload, bytearray) else payload, task, seconds
+
+
+def _unpack_header(header):
+    """Validate a message header, and allocate the payload it announces.
+
+    :param header: the received header bytes
+    :return: a (kind, payload, task, seconds) tuple, with the payload as an empty bytearray or
+             2-D array to receive into
+    :raises ProtocolError: if the header is invalid
+    """
+    kind, code, task, rows, columns, seconds = _HEADER.unpack(header)
+    if kind not in _KINDS:
+        raise ProtocolError("Received a message of unknown kind %d." % kind)
+    if code != _BYTES and code not in _FLOATS:
+        raise ProtocolError("Received a payload of unsupported type %r." % code)
+    dtype = np.dtype(code.decode())
+    if rows * columns * dtype.itemsize > MAX_PAYLOAD:
+        raise ProtocolError("Received a payload of %d by %d values, which is too large."
+                            % (rows, columns))
+    if code == _BYTES:
+        return kind, bytearray(rows), task, seconds
+    return kind, np.empty((rows, columns), dtype=dtype), task, seconds
+
+
+def _receive_into(connection, buffer):
+    """Fill a buffer with bytes received from a socket.
+
+    :param connection: the connected socket
+    :param buffer: the writable buffer to fill
+    :return: the filled buffer
+    :raises ConnectionError: if the connection was closed before the buffer was filled
+    """
+    view = memoryview(buffer)
+    received = 0
+    while received < len(view):
+        count = connection.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("The connection was closed.")
+        received += count
+    return buffer
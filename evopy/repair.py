@@ -0,0 +1,23 @@
+"""Module containing enum Repair describing how children violating the constraints are handled."""
+from enum import Enum
+
+
+class Repair(Enum):
+    """Enum used to distinguish different ways of handling infeasible children.
+
+    Children are checked against the bounds and the constraint before they are evaluated, so that
+    no evaluation is spent on an infeasible genotype. The repair modes which are included are:
+
+    - CLIP: out of bounds alleles are moved onto the nearest bound
+    - REFLECT: out of bounds alleles are mirrored back into the bounds, at the distance by which
+               they overshot the bound
+    - RESAMPLE: infeasible children are replaced by new children of the same parent
+    - REJECT: infeasible children are discarded without being evaluated
+
+    Children which violate the constraint, or are still infeasible after resampling, are always
+    rejected.
+    """
+    CLIP = 1
+    REFLECT = 2
+    RESAMPLE = 3
+    REJECT = 4
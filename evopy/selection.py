@@ -0,0 +1,111 @@
+"""Module containing the survivor selection schemes of the evolutionary strategy algorithm.
+
+All schemes work on arrays of scores, where a lower score is better. The candidates are the
+children of a generation followed by their parents, and each scheme returns the indices of the
+survivors into that sequence, ordered from best to worst.
+"""
+import numpy as np
+
+
+def top_k(scores, k):
+    """Return the indices of the k lowest scores, ordered from lowest to highest.
+
+    Only the k selected scores are sorted, the rest are partitioned in linear time.
+
+    :param scores: the array of scores
+    :param k: the number of indices to return
+    :return: the indices of the k lowest scores
+    """
+    if k >= len(scores):
+        return np.argsort(scores, kind='stable')
+    if k <= 0:
+        return np.empty(0, dtype=int)
+    indices = np.argpartition(scores, k - 1)[:k]
+    return indices[np.argsort(scores[indices], kind='stable')]
+
+
+class Selection:
+    """Base class of the survivor selection schemes."""
+
+    uses_parents = True
+
+    def select(self, children_scores, parent_scores, num_survivors, random):
+        """Select the survivors of a generation.
+
+        :param children_scores: the scores of the children, lower is better
+        :param parent_scores: the scores of the parents, lower is better
+        :param num_survivors: the number of survivors to select
+        :param random: the RandomState or Generator to use for stochastic selection
+        :return: the indices of the survivors into the children followed by the parents, ordered
+                 from best to worst
+        """
+        raise NotImplementedError
+
+
+class PlusSelection(Selection):
+    """(mu + lambda) selection: the best of the children and parents together survive."""
+
+    def select(self, children_scores, parent_scores, num_survivors, random):
+        return top_k(np.concatenate((children_scores, parent_scores)), num_survivors)
+
+
+class CommaSelection(Selection):
+    """(mu, lambda) selection: only the best children survive, all parents are discarded."""
+
+    uses_parents = False
+
+    def select(self, children_scores, parent_scores, num_survivors, random):
+        if len(children_scores) < num_survivors:
+            raise ValueError("Comma selection requires at least as many children as survivors.")
+        return top_k(children_scores, num_survivors)
+
+
+class TruncationSelection(Selection):
+    """Truncation selection with elitism: the best parents are kept, the rest are the best children.
+
+    If there are not enough children, the remaining survivors are the next best parents.
+    """
+
+    def __init__(self, elitism=1):
+        """Initializes the selection scheme.
+
+        :param elitism: the number of best parents which are guaranteed to survive
+        """
+        if elitism < 0:
+            raise ValueError("The elitism count can not be negative.")
+        self.elitism = elitism
+
+    def select(self, children_scores, parent_scores, num_survivors, random):
+        elites = top_k(parent_scores, min(self.elitism, num_survivors))
+        children = top_k(children_scores, num_survivors - len(elites))
+        remaining = num_survivors - len(elites) - len(children)
+        if remaining > 0:
+            others = np.setdiff1d(np.arange(len(parent_scores)), elites)
+            elites = np.concatenate((elites, others[top_k(parent_scores[others], remaining)]))
+        survivors = np.concatenate((children, elites + len(children_scores)))
+        scores = np.concatenate((children_scores[children], parent_scores[elites]))
+        return survivors[np.argsort(scores, kind='stable')]
+
+
+class TournamentSelection(Selection):
+    """Tournament selection: each survivor is the best of a random group of candidates.
+
+    Candidates are drawn with replacement from the children and parents together, so good
+    individuals can survive more than once.
+    """
+
+    def __init__(self, size=2):
+        """Initializes the selection scheme.
+
+        :param size: the number of candidates competing in each tournament
+        """
+        if size < 1:
+            raise ValueError("The tournament size must be at least 1.")
+        self.size = size
+
+    def select(self, children_scores, parent_scores, num_survivors, random):
+        scores = np.concatenate((children_scores, parent_scores))
+        contestants = random.choice(len(scores), size=(num_survivors, self.size))
+        winners = contestants[np.arange(num_survivors),
+                              np.argmin(scores[contestants], axis=1)]
+        return winners[np.argsort(scores[winners], kind='stable')]
@@ -0,0 +1,203 @@
+"""Module containing the Surrogate class, used to pre-screen children with a cheap model."""
+import numpy as np
+
+
+class Surrogate:
+    """Pre-screens the children of each generation, so only the most promising are evaluated.
+
+    All evaluated genotypes are kept in a bounded archive, on which a quadratic regression model
+    is fitted. The full model has (d + 1)(d + 2) / 2 coefficients, so in high dimensions the
+    cross terms are left out, giving fitness ~ a + b^T x + c^T x^2. Once the archive holds
+    enough points to fit the model, the children of each generation are ranked by their
+    predicted fitness, and only the best fraction of them is evaluated with the fitness function.
+    The rest is discarded.
+
+    The archive is a ring buffer, so once it is full the oldest point is evicted first. The model
+    is refitted incrementally, by adding the normal equations of new points and subtracting those
+    of evicted points, and recomputed from scratch each time the whole archive has been replaced
+    to keep rounding errors from building up.
+    """
+
+    def __init__(self, fraction=0.5, archive_size=1000, cross_terms=None, regularization=1e-8):
+        """Initializes the surrogate.
+
+        :param fraction: the fraction of the children of each generation which is evaluated
+        :param archive_size: the maximum number of evaluated genotypes kept in the archive
+        :param cross_terms: whether to fit the cross terms x_i x_j of the quadratic model. By
+                            default they are fitted if the archive can hold at least two points
+                            per coefficient of the full model
+        :param regularization: the ridge regularization of the regression, relative to the mean
+                               diagonal element of the normal equations
+        """
+        if not 0 < fraction <= 1:
+            raise ValueError("The fraction of evaluated children must be in (0, 1].")
+        if archive_size < 1:
+            raise ValueError("The size of the archive must be at least 1.")
+        self.fraction = fraction
+        self.archive_size = archive_size
+        self.cross_terms = cross_terms
+        self.regularization = regularization
+        self.saved_evaluations = 0
+        self._genotypes = None
+        self._fitness = None
+        self._size = 0
+        self._position = 0
+        self._replaced = 0
+        self._gram = None
+        self._moments = None
+        self._coefficients = None
+
+    def __len__(self):
+        return self._size
+
+    def features(self, genotypes):
+        """Compute the regression features of a batch of genotypes.
+
+        :param genotypes: the (N, d) array of genotypes
+        :return: the array of features 1, x and either x_i x_j for i <= j or x^2, with a row per
+                 genotype
+        """
+        if self.cross_terms:
+            rows, columns = np.triu_indices(genotypes.shape[1])
+            squares = genotypes[:, rows] * genotypes[:, columns]
+        else:
+            squares = genotypes ** 2
+        return np.hstack((np.ones((len(genotypes), 1)), genotypes, squares))
+
+    def add(self, genotypes, fitness):
+        """Add evaluated genotypes to the archive, evicting the oldest ones once it is full.
+
+        Genotypes of which the fitness is not finite, e.g. because the evaluation timed out, are
+        skipped.
+
+        :param genotypes: the (N, d) array of evaluated genotypes
+        :param fitness: the N fitness values of the genotypes
+        """
+        finite = np.isfinite(fitness)
+        genotypes = np.asarray(genotypes, dtype=float)[finite][-self.archive_size:]
+        fitness = np.asarray(fitness, dtype=float)[finite][-self.archive_size:]
+        if len(genotypes) == 0:
+            return
+        if self._genotypes is None:
+            length = genotypes.shape[1]
+            if self.cross_terms is None:
+                self.cross_terms = (length + 1) * (length + 2) <= self.archive_size
+            num_features = 1 + length + (length * (length + 1) // 2 if self.cross_terms
+                                         else length)
+            self._genotypes = np.empty((self.archive_size, genotypes.shape[1]))
+            self._fitness = np.empty(self.archive_size)
+            self._gram = np.zeros((num_features, num_features))
+            self._moments = np.zeros(num_features)
+
+        positions = (self._position + np.arange(len(genotypes))) % self.archive_size
+        evicted = positions[positions < self._size]
+        if len(evicted) > 0:
+            features = self.features(self._genotypes[evicted])
+            self._gram -= features.T @ features
+            self._moments -= features.T @ self._fitness[evicted]
+        features = self.features(genotypes)
+        self._gram += features.T @ features
+        self._moments += features.T @ fitness
+        self._genotypes[positions] = genotypes
+        self._fitness[positions] = fitness
+        self._position = (self._position + len(genotypes)) % self.archive_size
+        self._size = min(self._size + len(genotypes), self.archive_size)
+        self._coefficients = None
+
+        self._replaced += len(genotypes)
+        if self._replaced >= self.archive_size:
+            self._refit()
+
+    def _refit(self):
+        """Recompute the normal equations from all points in the archive."""
+        features = self.features(self._genotypes[:self._size])
+        self._gram = features.T @ features
+        self._moments = features.T @ self._fitness[:self._size]
+        self._replaced = 0
+
+    def ready(self):
+        """Check whether the archive holds enough points to fit the model.
+
+        :return: whether the model can be used for prediction
+        """
+        return self._gram is not None and self._size >= len(self._gram)
+
+    def predict(self, genotypes):
+        """Predict the fitness of a batch of genotypes.
+
+        :param genotypes: the (N, d) array of genotypes
+        :return: the array of N predicted fitness values
+        """
+        if self._coefficients is None:
+            ridge = self.regularization * np.trace(self._gram) / len(self._gram)
+            self._coefficients = np.linalg.solve(
+                self._gram + ridge * np.identity(len(self._gram)), self._moments)
+        return self.features(genotypes) @ self._coefficients
+
+    def screen(self, genotypes, maximize=False, minimum=1):
+        """Select the children worth evaluating, based on their predicted fitness.
+
+        All children are selected as long as the archive is too small to fit the model.
+
+        :param genotypes: the (N, d) array of genotypes of the children
+        :param maximize: whether the fitness function is maximized
+        :param minimum: the minimum number of children to select
+        :return: the sorted indices of the selected children
+        """
+        count = min(max(int(np.ceil(self.fraction * len(genotypes))), minimum), len(genotypes))
+        if count == len(genotypes) or not self.ready():
+            return np.arange(len(genotypes))
+        predictions = self.predict(genotypes)
+        scores = -predictions if maximize else predictions
+        self.saved_evaluations += len(genotypes) - count
+        return np.sort(np.argpartition(scores, count - 1)[:count])
+
+    def state(self):
+        """Return the archive and model of the surrogate, for checkpointing.
+
+        The arrays are empty as long as no genotype with a finite fitness has been added.
+
+        :return: a dict mapping names to arrays
+        """
+        if self._genotypes is None:
+            return {
+                'surrogate_genotypes': np.empty((0, 0)),
+                'surrogate_fitness': np.empty(0),
+                'surrogate_position': 0,
+                'surrogate_replaced': 0,
+                'surrogate_gram': np.empty((0, 0)),
+                'surrogate_moments': np.empty(0),
+                'surrogate_saved_evaluations': self.saved_evaluations,
+            }
+        return {
+            'surrogate_genotypes': self._genotypes[:self._size],
+            'surrogate_fitness': self._fitness[:self._size],
+            'surrogate_position': self._position,
+            'surrogate_replaced': self._replaced,
+            'surrogate_gram': self._gram,
+            'surrogate_moments': self._moments,
+            'surrogate_saved_evaluations': self.saved_evaluations,
+        }
+
+    def restore(self, state):
+        """Restore the archive and model of the surrogate from a checkpoint.
+
+        :param state: a dict holding the arrays returned by state
+        """
+        genotypes = np.asarray(state['surrogate_genotypes'], dtype=float)
+        self._size = len(genotypes)
+        self.saved_evaluations = int(state['surrogate_saved_evaluations'])
+        self._coefficients = None
+        if len(state['surrogate_gram']) == 0:
+            self._genotypes, self._fitness, self._gram, self._moments = None, None, None, None
+            self._position, self._replaced = 0, 0
+            return
+        self._genotypes = np.empty((self.archive_size, genotypes.shape[1]))
+        self._genotypes[:self._size] = genotypes
+        self._fitness = np.empty(self.archive_size)
+        self._fitness[:self._size] = state['surrogate_fitness']
+        self._position = int(state['surrogate_position'])
+        self._replaced = int(state['surrogate_replaced'])
+        self._gram = np.array(state['surrogate_gram'], dtype=float)
+        self.cross_terms = len(self._gram) != 2 * genotypes.shape[1] + 1
+        self._moments = np.array(state['surrogate_moments'], dtype=float)
@@ -0,0 +1,144 @@
+"""Module containing the Termination class, used to stop or restart runs which stagnate."""
+import math
+
+import numpy as np
+
+from evopy.individual import Individual
+
+
+class Termination:  # pylint: disable=too-many-instance-attributes
+    """Criteria ending a run once it has converged or stalled, optionally restarting it.
+
+    A run stagnates when either:
+
+    - the best fitness of the population changed less than the tolerance over a sliding window of
+      generations, and the fitness values of the current population lie within the tolerance
+    - all mutation step sizes of the best individual stayed at the smallest variance an individual
+      can have, Individual._EPSILON, over the window, which only applies to the self-adaptive
+      strategies. Mutation then no longer adapts to the fitness landscape
+
+    A stagnated run is restarted from a fresh population, which is population_growth times as
+    large as the previous one, as in the IPOP-CMA-ES, until the number of restarts is used up.
+    Restarts keep the best individual found so far, and share the generations, time and
+    evaluation budgets of the run. The run is stopped regardless once it has used up the
+    evaluation budget, which is checked after each generation. The reason attribute holds the
+    criterion which stopped or last restarted the run, 'tolerance', 'step_size' or 'evaluations',
+    or None if none of them was met.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, tolerance=None, window=None, collapse=True, max_evaluations=None,
+                 restarts=0, population_growth=2):
+        """Initializes the termination criteria.
+
+        :param tolerance: the function value tolerance, or None to not check for stalled fitness
+        :param window: the number of generations over which the best fitness should change less
+                       than the tolerance, or the step sizes should stay collapsed. Defaults to
+                       10 + ceil(30 * d / lambda), with lambda the number of children per
+                       generation
+        :param collapse: whether the run stagnates once the step sizes collapsed
+        :param max_evaluations: the maximum number of children evaluated over the whole run,
+                                including restarts, or None for no limit
+        :param restarts: the maximum number of restarts
+        :param population_growth: the factor by which the population grows with each restart
+        """
+        if window is not None and window < 1:
+            raise ValueError("The window should span at least one generation.")
+        if population_growth < 1:
+            raise ValueError("The population should not shrink when restarting.")
+        self.tolerance = tolerance
+        self.window = window
+        self.collapse = collapse
+        self.max_evaluations = max_evaluations
+        self.restarts = restarts
+        self.population_growth = population_growth
+        self.num_restarts = 0
+        self.reason = None
+        self._best_scores = np.empty(0)
+        self._num_scores = 0
+        self._num_collapsed = 0
+
+    def start(self, individual_length, num_offspring, restart=False):
+        """Prepare for a new run, or for a restart of the current one.
+
+        :param individual_length: the length of each individual
+        :param num_offspring: the number of children per generation
+        :param restart: whether the current run is restarted, rather than a new one started
+        """
+        if not restart:
+            self.num_restarts = 0
+            self.reason = None
+        window = 10 + math.ceil(30 * individual_length / num_offspring) if self.window is None \
+            else self.window
+        self._best_scores = np.empty(window)
+        self._num_scores = 0
+        self._num_collapsed = 0
+
+    def exhausted(self, evaluations):
+        """Check whether the evaluation budget has been used up.
+
+        :param evaluations: the number of evaluations so far
+        :return: whether the run should stop
+        """
+        if self.max_evaluations is not None and evaluations >= self.max_evaluations:
+            self.reason = 'evaluations'
+            return True
+        return False
+
+    def stagnated(self, scores, step_sizes=None):
+        """Check whether the run stagnated after the current generation.
+
+        :param scores: the scores of the population, of which lower is better
+        :param step_sizes: the mutation step sizes of the best individual, or None if the strategy
+                           has no lower bound on its step sizes
+        :return: whether the run stagnated
+        """
+        self._best_scores[self._num_scores % len(self._best_scores)] = np.min(scores)
+        self._num_scores += 1
+        if self.collapse and step_sizes is not None and np.all(
+                step_sizes <= np.asarray(Individual._EPSILON, dtype=step_sizes.dtype)):
+            self._num_collapsed += 1
+        else:
+            self._num_collapsed = 0
+        if self._num_collapsed >= len(self._best_scores):
+            self.reason = 'step_size'
+            return True
+        if self.tolerance is not None and self._num_scores >= len(self._best_scores) \
+                and np.ptp(self._best_scores) <= self.tolerance \
+                and np.ptp(scores) <= self.tolerance:
+            self.reason = 'tolerance'
+            return True
+        return False
+
+    def restart(self):
+        """Use up a restart of a stagnated run, if any are left.
+
+        :return: whether the run should restart, rather than stop
+        """
+        if self.num_restarts >= self.restarts:
+            return False
+        self.num_restarts += 1
+        return True
+
+    def state(self):
+        """Collect the state of the criteria, for checkpointing.
+
+        :return: a dict mapping names to arrays, see evopy.checkpoint.save_checkpoint
+        """
+        return {
+            'termination_num_restarts': self.num_restarts,
+            'termination_best_scores': self._best_scores,
+            'termination_num_scores': self._num_scores,
+            'termination_num_collapsed': self._num_collapsed,
+        }
+
+    def restore(self, state):
+        """Restore the state of the criteria from a checkpoint.
+
+        :param state: the checkpoint state, see state
+        """
+        self.num_restarts = int(state['termination_num_restarts'])
+        self._best_scores = np.array(state['termination_best_scores'], dtype=float)
+        self._num_scores = int(state['termination_num_scores'])
+        self._num_collapsed = int(state['termination_num_collapsed'])
+        self.reason = None
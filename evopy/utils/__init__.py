@@ -1,2 +1,5 @@
 """The evopy evolutionary strategy algorithm package utility package."""
-from .random import random_with_seed
+from .bounds import reflect
+from .random import get_random_state, random_with_seed, restore_random, spawn_generators, \
+    standard_normal
+from .rotation import rotate
@@ -0,0 +1,26 @@
+"""A utility module for keeping values within bounds."""
+import numpy as np
+
+
+def reflect(values, lower, upper):
+    """Mirror values at the bounds until they lie within them.
+
+    Values are mirrored once at the bound they overshot. The few values overshooting a finite
+    interval by more than its width are then folded back and forth. Values outside an interval of
+    zero width, i.e. a fixed value, are set to its bound.
+
+    :param values: the (N, d) array of values
+    :param lower: the lower bound of each column
+    :param upper: the upper bound of each column
+    :return: the array of reflected values
+    """
+    reflected = np.where(values < lower, 2 * lower - values, values)
+    reflected = np.where(reflected > upper, 2 * upper - reflected, reflected)
+    outside = (reflected < lower) | (reflected > upper)
+    if np.any(outside):
+        lower = np.broadcast_to(lower, values.shape)[outside]
+        width = np.broadcast_to(upper, values.shape)[outside] - lower
+        folded = lower + np.abs(
+            np.mod(values[outside] - lower + width, 2 * np.where(width > 0, width, 1)) - width)
+        reflected[outside] = np.where(width > 0, folded, lower)
+    return reflected
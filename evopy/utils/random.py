@@ -3,14 +3,79 @@ import numpy as np
 
 
 def random_with_seed(seed):
-    """Return RandomState instances based on given seed.
+    """Return random number generator instances based on given seed.
+
+    Integers give a legacy RandomState, while a SeedSequence gives a Generator backed by PCG64.
+    RandomState and Generator instances are returned as they are. None gives a new Generator
+    seeded with fresh entropy, so that the global random state, which is shared between threads,
+    is never used.
 
     :param seed: the seed to use for the random number generator
     """
     if seed is None:
-        return np.random.mtrand._rand
-    if isinstance(seed, int):
+        return np.random.default_rng()
+    if isinstance(seed, (int, np.integer)):
         return np.random.RandomState(seed)
-    if isinstance(seed, np.random.RandomState):
+    if isinstance(seed, (np.random.RandomState, np.random.Generator)):
         return seed
-    raise ValueError('Seed must either be an integer or an instance of numpy.random.RandomState')
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.Generator(np.random.PCG64(seed))
+    raise ValueError('Seed must either be an integer, a numpy.random.SeedSequence or an instance '
+                     'of numpy.random.RandomState or numpy.random.Generator')
+
+
+def standard_normal(random, size, dtype=np.float64):
+    """Draw standard normal samples of the given floating point type.
+
+    Generators sample float32 values directly, while a RandomState samples float64 values which
+    are then converted.
+
+    :param random: the RandomState or Generator to sample with
+    :param size: the shape of the samples
+    :param dtype: the floating point type of the samples, float32 or float64
+    :return: an array of standard normal samples
+    """
+    if isinstance(random, np.random.Generator):
+        return random.standard_normal(size, dtype=dtype)
+    return random.standard_normal(size).astype(dtype, copy=False)
+
+
+def spawn_generators(seed, count):
+    """Return independent Generators, e.g. one per worker or island.
+
+    The generators are backed by PCG64 and seeded from SeedSequence.spawn, so their streams do
+    not overlap and they can be used from different threads or processes without contention.
+
+    :param seed: an integer, None for fresh entropy, or a SeedSequence to spawn from
+    :param count: the number of generators to return
+    :return: a list of count Generators
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.Generator(np.random.PCG64(child)) for child in seed.spawn(count)]
+
+
+def get_random_state(random):
+    """Return the full state of a random number generator, as a dict of plain values.
+
+    :param random: the RandomState or Generator to get the state of
+    :return: the state, which can be passed to restore_random
+    """
+    if isinstance(random, np.random.Generator):
+        return {'generator': random.bit_generator.state}
+    return {'random_state': random.get_state(legacy=False)}
+
+
+def restore_random(state):
+    """Create a random number generator in the given state.
+
+    :param state: a state returned by get_random_state
+    :return: a RandomState or Generator, of the same kind as the one the state was taken from
+    """
+    if 'generator' in state:
+        bit_generator = getattr(np.random, state['generator']['bit_generator'])()
+        bit_generator.state = state['generator']
+        return np.random.Generator(bit_generator)
+    random = np.random.RandomState()
+    random.set_state(state['random_state'])
+    return random
@@ -0,0 +1,40 @@
+"""A utility module for applying the correlated mutations of the full variance strategy."""
+from functools import lru_cache
+
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def _rotation_pairs(length):
+    """Return the axis pairs of the Givens rotations, in the order in which they are applied.
+
+    :param length: the dimensionality of the rotated vectors
+    :return: a tuple of (p, q, j) triplets, with j the index of the angle rotating axes p and q
+    """
+    pairs = [(p, q, int((2 * length - p) * (p + 1) / 2 - 2 * length + q))
+             for p in range(length - 1) for q in range(p + 1, length)]
+    return tuple(reversed(pairs))
+
+
+def rotate(rotations, vectors):
+    """Multiply vectors by the rotation matrix encoded by the given angles.
+
+    The rotation matrix is the product of one Givens rotation per pair of axes. Instead of
+    building that matrix, each rotation is applied to the vectors directly, which costs O(n^2)
+    rather than O(n^5) per vector.
+
+    :param rotations: the n * (n - 1) / 2 rotation angles, or an (M, n * (n - 1) / 2) array with
+                      one set of angles per vector
+    :param vectors: the vector of length n to rotate, or an (M, n) array of vectors
+    :return: the rotated vector(s), with the same shape as the given vectors, in float32 if the
+             vectors are float32 and in float64 otherwise
+    """
+    vectors = np.array(vectors, dtype=np.result_type(vectors, np.float32))
+    cosines = np.cos(rotations)
+    sines = np.sin(rotations)
+    for p, q, j in _rotation_pairs(vectors.shape[-1]):
+        vector_p = vectors[..., p]
+        vector_q = vectors[..., q]
+        vectors[..., p], vectors[..., q] = cosines[..., j] * vector_p - sines[..., j] * vector_q, \
+            sines[..., j] * vector_p + cosines[..., j] * vector_q
+    return vectors
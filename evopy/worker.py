@@ -0,0 +1,110 @@
+"""Remote worker evaluating genotypes for an evopy.coordinator.Coordinator.
+
+Start any number of workers, on any machine that can reach the coordinator, with::
+
+    python -m evopy.worker HOST:PORT
+
+The fitness function is sent by the coordinator, so it should be importable by the worker, e.g.
+a module level function of a module on its path. A worker keeps evaluating tasks until the
+coordinator closes the connection, and may be stopped at any time: its unfinished work is
+dispatched to the other workers.
+"""
+import argparse
+import os
+import pickle
+import socket
+import sys
+import time
+import traceback
+
+import numpy as np
+
+from evopy.protocol import ERROR, FUNCTION, HELLO, RESULT, TASK, receive_message, send_message
+
+
+def connect(address, retry_time=10.0):
+    """Connect to a coordinator, retrying while it is not listening yet.
+
+    :param address: the (host, port) address of the coordinator
+    :param retry_time: the time in seconds to keep retrying
+    :return: the connected socket
+    """
+    deadline = time.time() + retry_time
+    while True:
+        try:
+            connection = socket.create_connection(address)
+            break
+        except ConnectionRefusedError:
+            if time.time() > deadline:
+                raise
+            time.sleep(0.1)
+    connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return connection
+
+
+def evaluate(fitness_function, vectorized, genotypes):
+    """Evaluate the genotypes of a task.
+
+    :param fitness_function: the fitness function
+    :param vectorized: whether the fitness function is called once for all genotypes
+    :param genotypes: the (n, d) array of genotypes
+    :return: the array of n fitness values
+    """
+    if vectorized:
+        fitnesses = np.asarray(fitness_function(genotypes), dtype=float).reshape(-1)
+        if len(fitnesses) != len(genotypes):
+            raise ValueError("The vectorized fitness function returned %d values for %d "
+                             "genotypes." % (len(fitnesses), len(genotypes)))
+        return fitnesses
+    return np.array([np.asarray(fitness_function(genotype), dtype=float).item()
+                     for genotype in genotypes])
+
+
+def serve(connection, name=None):
+    """Evaluate the tasks sent by the coordinator until it closes the connection.
+
+    :param connection: the socket connected to the coordinator
+    :param name: the name the worker reports to the coordinator, defaults to host and process id
+    """
+    name = '%s:%d' % (socket.gethostname(), os.getpid()) if name is None else name
+    send_message(connection, HELLO, name.encode())
+    fitness_function, vectorized = None, False
+    while True:
+        try:
+            kind, payload, task, _ = receive_message(connection)
+        except ConnectionError:
+            return
+        if kind == FUNCTION:
+            fitness_function, vectorized = pickle.loads(payload)
+        elif kind == TASK:
+            start_time = time.perf_counter()
+            try:
+                fitnesses = evaluate(fitness_function, vectorized, payload)
+            except Exception:  # pylint: disable=broad-except
+                send_message(connection, ERROR, traceback.format_exc().encode(), task)
+                continue
+            send_message(connection, RESULT, fitnesses, task, time.perf_counter() - start_time)
+
+
+def main(arguments=None):
+    """Run the worker command line interface.
+
+    :param arguments: the command line arguments, defaults to sys.argv
+    :return: the exit status
+    """
+    parser = argparse.ArgumentParser(prog='python -m evopy.worker', description=__doc__.split(
+        '\n', maxsplit=1)[0])
+    parser.add_argument('address', help='the HOST:PORT address of the coordinator')
+    parser.add_argument('--retry-time', type=float, default=10.0,
+                        help='the time in seconds to keep retrying to connect')
+    parser.add_argument('--name', help='the name reported to the coordinator')
+    options = parser.parse_args(arguments)
+
+    host, _, port = options.address.rpartition(':')
+    with connect((host or 'localhost', int(port)), options.retry_time) as connection:
+        serve(connection, options.name)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Tests for the ask and tell interface."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import EvoPy
+
+
+def _sphere(genotypes):
+    return np.sum(genotypes ** 2, axis=-1)
+
+
+def _create(**options):
+    return EvoPy(_sphere, 3, generations=10, population_size=8, num_children=2, random_seed=4,
+                 vectorized=True, **options)
+
+
+def test_matches_run():
+    """Test whether asking and telling whole generations gives the same result as run."""
+    expected = _create().run()
+    evopy = _create()
+    generations = 0
+    while not evopy.finished():
+        genotypes = evopy.ask()
+        evopy.tell(genotypes, _sphere(genotypes))
+        generations += 1
+
+    assert generations == 11
+    assert np.array_equal(evopy.best().genotype, expected)
+    assert len(evopy.ask()) == 0
+
+
+def test_partial_and_out_of_order_tells():
+    """Test whether tells may be split up and reordered without changing the result."""
+    expected = _create().run()
+    evopy = _create()
+    random = np.random.RandomState(0)
+    while not evopy.finished():
+        genotypes = np.concatenate([evopy.ask(5) for _ in range(4)])
+        assert len(evopy.ask()) == 0
+        order = random.permutation(len(genotypes))
+        for part in np.array_split(order, 3):
+            evopy.tell(genotypes[part], _sphere(genotypes[part]))
+
+    assert np.array_equal(evopy.best().genotype, expected)
+
+
+def test_duplicate_genotypes():
+    """Test whether identical genotypes are matched to different children."""
+    evopy = EvoPy(_sphere, 2, generations=1, population_size=4, std=0, random_seed=1)
+    genotypes = evopy.ask()
+    assert np.array_equal(genotypes, np.zeros((4, 2)))
+    evopy.tell(genotypes[:3], [1.0, 2.0, 3.0])
+    evopy.tell(genotypes[3], [0.5])
+    assert evopy.best().fitness == 0.5
+    assert len(evopy.ask()) == 4
+
+
+def test_pooled_optimizers():
+    """Test whether several optimizers can share a single scorer call per round."""
+    optimizers = [_create(), _create(warm_start=np.ones(3))]
+    expected = [_create().run(), _create(warm_start=np.ones(3)).run()]
+    while not all(optimizer.finished() for optimizer in optimizers):
+        batches = [optimizer.ask() for optimizer in optimizers]
+        fitnesses = np.split(_sphere(np.concatenate(batches)),
+                             np.cumsum([len(batch) for batch in batches])[:-1])
+        for optimizer, batch, fitness in zip(optimizers, batches, fitnesses):
+            if len(batch) > 0:
+                optimizer.tell(batch, fitness)
+
+    for optimizer, best in zip(optimizers, expected):
+        assert np.array_equal(optimizer.best().genotype, best)
+
+
+@raises(ValueError)
+def test_unknown_genotype():
+    """Test whether an error is raised when telling a genotype which was not asked for."""
+    evopy = _create()
+    genotypes = evopy.ask()
+    evopy.tell(genotypes[0] + 1, [0.0])
+
+
+@raises(ValueError)
+def test_told_twice():
+    """Test whether an error is raised when telling the fitness of a genotype twice."""
+    evopy = _create()
+    genotypes = evopy.ask()
+    evopy.tell(genotypes[:2], [0.0, 1.0])
+    evopy.tell(genotypes[1:3], [1.0, 2.0])
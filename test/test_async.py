@@ -0,0 +1,95 @@
+"""Tests for running evopy with asynchronous fitness functions."""
+import asyncio
+import time
+
+import numpy as np
+
+from evopy import EvoPy
+
+
+def _run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_async_matches_sync():
+    """Test whether an asynchronous run gives the same result as a synchronous run."""
+    async def fitness(genotype):
+        await asyncio.sleep(0)
+        return np.sum(genotype ** 2)
+
+    expected = EvoPy(lambda x: np.sum(x ** 2), 2, generations=20, random_seed=42).run()
+    result = _run(EvoPy(fitness, 2, generations=20, random_seed=42).run_async())
+    assert np.array_equal(expected, result)
+
+
+def test_async_evaluations_are_concurrent():
+    """Test whether the evaluations of a generation are awaited concurrently."""
+    active = [0, 0]
+
+    async def fitness(genotype):
+        active[0] += 1
+        active[1] = max(active)
+        await asyncio.sleep(0.02)
+        active[0] -= 1
+        return np.sum(genotype ** 2)
+
+    start_time = time.time()
+    evopy = EvoPy(fitness, 2, generations=5, population_size=50)
+    _run(evopy.run_async(max_concurrency=25))
+
+    assert active[1] == 25
+    assert time.time() - start_time < 0.02 * 6 * 50 / 2
+
+
+def test_async_timeout_assigns_penalty():
+    """Test whether evaluations that time out are assigned the timeout fitness."""
+    fitnesses = []
+
+    async def fitness(genotype):
+        if genotype[0] > 0:
+            await asyncio.sleep(1)
+        return genotype[0]
+
+    def reporter(report):
+        fitnesses.append(report.best_fitness)
+
+    evopy = EvoPy(fitness, 1, generations=3, population_size=4, maximize=True,
+                  reporter=reporter, random_seed=42)
+    _run(evopy.run_async(timeout=0.01, timeout_fitness=-100))
+
+    assert all(fitness <= 0 for fitness in fitnesses)
+
+
+def test_async_early_stop():
+    """Test whether the target fitness value stops an asynchronous run early."""
+    count = [0]
+
+    async def fitness(_):
+        return 0
+
+    def reporter(report):
+        count[0] = report.generation + 1
+
+    evopy = EvoPy(fitness, 1, target_fitness_value=0, reporter=reporter)
+    _run(evopy.run_async())
+
+    assert count[0] == 1
+
+
+def test_async_vectorized_with_cache():
+    """Test whether a vectorized asynchronous fitness function is called once per generation."""
+    calls = [0]
+
+    async def fitness(genotypes):
+        calls[0] += 1
+        return np.sum(genotypes ** 2, axis=1)
+
+    evopy = EvoPy(fitness, 2, generations=5, vectorized=True, cache_size=1000)
+    _run(evopy.run_async())
+
+    assert calls[0] == 6
+    assert evopy.fitness_cache.misses == 30 * 6
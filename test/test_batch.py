@@ -0,0 +1,96 @@
+"""Tests for evolving many independent runs at once."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import BatchEvoPy, EvoPy, Strategy
+
+
+def _sphere(genotypes):
+    return np.sum(genotypes ** 2, axis=-1)
+
+
+def test_matches_sequential_runs():
+    """Test whether each run evolves exactly like a separate EvoPy run with the same seed."""
+    for strategy in [Strategy.SINGLE_VARIANCE, Strategy.MULTIPLE_VARIANCE,
+                     Strategy.FULL_VARIANCE]:
+        best_genotypes, history = BatchEvoPy(_sphere, 3, 3, generations=15, num_children=2,
+                                             strategy=strategy, random_seed=[1, 2, 3]).run()
+        for run, seed in enumerate([1, 2, 3]):
+            reports = []
+            best = EvoPy(_sphere, 3, generations=15, num_children=2, strategy=strategy,
+                         random_seed=seed, vectorized=True, reporter=reports.append).run()
+            assert np.array_equal(best_genotypes[run], best)
+            assert np.array_equal(history[run], [report.best_fitness for report in reports])
+
+
+def test_mixed_population_sizes_match_sequential_runs():
+    """Test whether runs with a padded population evolve exactly like separate EvoPy runs."""
+    sizes = [5, 10, 10, 7]
+    best_genotypes, history = BatchEvoPy(_sphere, 3, 4, generations=15, num_children=2,
+                                         population_size=sizes, random_seed=[1, 2, 3, 4]).run()
+    for run, (size, seed) in enumerate(zip(sizes, [1, 2, 3, 4])):
+        reports = []
+        best = EvoPy(_sphere, 3, generations=15, num_children=2, population_size=size,
+                     random_seed=seed, vectorized=True, reporter=reports.append).run()
+        assert np.array_equal(best_genotypes[run], best)
+        assert np.array_equal(history[run], [report.best_fitness for report in reports])
+
+
+def test_padding_is_never_selected():
+    """Test whether runs with a smaller population ignore their padding."""
+    batches = []
+
+    def fitness_function(genotypes):
+        batches.append(genotypes)
+        return np.tile(np.arange(genotypes.shape[1], 0, -1), (len(genotypes), 1))
+
+    batch = BatchEvoPy(fitness_function, 2, 2, generations=3, population_size=[1, 4],
+                       random_seed=0)
+    best_genotypes, _ = batch.run()
+
+    assert batches[0].shape == (2, 4, 2)
+    assert np.array_equal(batch.best_fitness, [4, 1])
+    assert np.array_equal(best_genotypes[0], batches[0][0, 0])
+
+
+def test_per_run_settings_and_early_stopping():
+    """Test whether problem instances, warm starts and fitness targets can differ per run."""
+    optima = np.array([[0.0, 0.0], [10.0, -10.0], [-5.0, 5.0]])
+
+    def fitness_function(genotypes):
+        return np.floor(np.sum((genotypes - optima[:, None]) ** 2, axis=-1) * 100)
+
+    batch = BatchEvoPy(fitness_function, 2, 3, generations=200, warm_start=optima,
+                       std=[0.5, 1, 2], target_fitness_value=[0, 0, -1], random_seed=7)
+    best_genotypes, history = batch.run()
+
+    assert np.allclose(best_genotypes, optima, atol=0.1)
+    assert np.all(batch.generations_run[:2] < 200) and batch.generations_run[2] == 200
+    assert np.all(np.isnan(history[0, batch.generations_run[0]:]))
+    assert not np.any(np.isnan(history[2]))
+
+
+@raises(ValueError)
+def test_fitness_shape_is_checked():
+    """Test whether an error is raised when the fitness function returns the wrong shape."""
+    BatchEvoPy(lambda genotypes: np.zeros(len(genotypes)), 2, 2, generations=1).run()
+
+
+@raises(ValueError)
+def test_cma_is_not_supported():
+    """Test whether an error is raised for the CMA strategy."""
+    BatchEvoPy(_sphere, 2, 2, strategy=Strategy.CMA)
+
+
+def test_empty_individuals():
+    """Test whether runs of empty individuals still return a best genotype and a history."""
+    best_genotypes, history = BatchEvoPy(_sphere, 0, 3, generations=5).run()
+    assert best_genotypes.shape == (3, 0)
+    assert history.shape == (3, 5)
+    assert np.all(np.isnan(history))
+
+
+@raises(ValueError)
+def test_single_generator_is_not_accepted():
+    """Test whether an error is raised for a single Generator, which can not be split over runs."""
+    BatchEvoPy(_sphere, 2, 2, random_seed=np.random.default_rng(42))
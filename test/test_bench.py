@@ -0,0 +1,92 @@
+"""Tests for the benchmark suite."""
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from evopy import Strategy
+from evopy.bench import PROBLEMS, compare, main, run_suite
+
+
+def test_problem_optima():
+    """Test whether all benchmark problems have their minimum of 0 where expected."""
+    for name, problem in PROBLEMS.items():
+        optimum = np.ones((1, 5)) if name == 'rosenbrock' else np.zeros((1, 5))
+        assert np.allclose(problem(optimum), 0)
+        assert np.all(problem(optimum + 0.5) > 0)
+
+
+def test_run_suite():
+    """Test whether the suite measures every configuration."""
+    results = run_suite(problems=['sphere'], strategies=[Strategy.SINGLE_VARIANCE],
+                        individual_lengths=[2, 3], population_sizes=[5], generations=4)
+    assert len(results['results']) == 2
+    for result in results['results']:
+        assert result['generations'] == 4
+        assert result['generations_per_second'] > 0
+        assert result['evaluations_per_second'] > 0
+        assert result['peak_memory'] > 0
+
+
+def test_compare_flags_slowdowns():
+    """Test whether comparing results flags benchmarks that got slower than the threshold."""
+    baseline = run_suite(problems=['sphere'], strategies=[Strategy.SINGLE_VARIANCE],
+                         individual_lengths=[2], population_sizes=[5], generations=2,
+                         measure_memory=False)
+    results = json.loads(json.dumps(baseline))
+    assert not compare(baseline, results)
+
+    results['results'][0]['generations_per_second'] *= 0.5
+    assert [regression[1] for regression in compare(baseline, results, threshold=0.1)] \
+        == ['generations_per_second']
+    assert not compare(baseline, results, threshold=0.6)
+
+    results['results'][0]['evaluations_per_second'] *= 0.5
+    assert [regression[1] for regression in compare(baseline, results, threshold=0.1)] \
+        == ['generations_per_second', 'evaluations_per_second']
+
+
+def test_compare_flags_memory_growth():
+    """Test whether comparing results flags benchmarks of which the peak memory use grew."""
+    baseline = run_suite(problems=['sphere'], strategies=[Strategy.SINGLE_VARIANCE],
+                         individual_lengths=[2], population_sizes=[5], generations=2, repeats=1)
+    results = json.loads(json.dumps(baseline))
+    results['results'][0]['peak_memory'] *= 1.5
+    regressions = compare(baseline, results, memory_threshold=0.1)
+    assert [regression[1:] for regression in regressions] == [
+        ('peak_memory', baseline['results'][0]['peak_memory'],
+         results['results'][0]['peak_memory'])]
+    assert not compare(baseline, results, memory_threshold=0.6)
+
+    results['results'][0]['peak_memory'] = None
+    assert not compare(baseline, results)
+
+
+def test_command_line():
+    """Test whether the command line writes results and exits with 1 on slowdowns."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'results.json')
+        assert main(['run', '--problems', 'ackley', '--strategies', 'FULL_VARIANCE',
+                     '--dimensions', '2', '--population-sizes', '4', '--generations', '2',
+                     '--no-memory', '--output', path]) == 0
+        assert main(['compare', path, path]) == 0
+
+        with open(path, encoding='utf-8') as file:
+            results = json.load(file)
+        results['results'][0]['generations_per_second'] *= 2
+        slower_path = os.path.join(directory, 'slower.json')
+        with open(slower_path, 'w', encoding='utf-8') as file:
+            json.dump(results, file)
+        assert main(['compare', slower_path, path]) == 1
+
+        results['results'][0]['generations_per_second'] /= 2
+        for name, peak_memory in [('smaller.json', 1000), ('larger.json', 1200)]:
+            results['results'][0]['peak_memory'] = peak_memory
+            with open(os.path.join(directory, name), 'w', encoding='utf-8') as file:
+                json.dump(results, file)
+        smaller_path, larger_path = (os.path.join(directory, name)
+                                     for name in ['smaller.json', 'larger.json'])
+        assert main(['compare', smaller_path, larger_path]) == 1
+        assert main(['compare', smaller_path, larger_path, '--memory-threshold', '0.5']) == 0
+        assert main(['compare', larger_path, smaller_path]) == 0
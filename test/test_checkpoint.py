@@ -0,0 +1,129 @@
+"""Tests for checkpointing and resuming runs."""
+import os
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from evopy import Checkpointer, EvoPy, Strategy, Surrogate, TournamentSelection
+from evopy.checkpoint import load_checkpoint
+
+
+class _Preempted(Exception):
+    """Raised by a reporter to simulate the run being killed."""
+
+
+def _fitness(genotype):
+    return np.sum(genotype ** 2)
+
+
+def _preempt_at(generation, reports):
+    def reporter(report):
+        if report.generation == generation:
+            raise _Preempted()
+        reports.append((report.generation, report.best_fitness))
+    return reporter
+
+
+def test_resume_is_identical():
+    """Test whether a resumed run continues exactly like an uninterrupted run."""
+    for strategy in Strategy:
+        expected_reports = []
+        expected = EvoPy(_fitness, 3, generations=20, strategy=strategy, random_seed=42,
+                         selection=TournamentSelection(size=3),
+                         reporter=_preempt_at(None, expected_reports)).run()
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'run.npz')
+            reports = []
+            try:
+                EvoPy(_fitness, 3, generations=20, strategy=strategy, random_seed=42,
+                      selection=TournamentSelection(size=3), reporter=_preempt_at(12, reports),
+                      checkpoint=Checkpointer(path, every=5)).run()
+            except _Preempted:
+                pass
+            assert int(load_checkpoint(path)['generation']) == 10
+
+            reports = reports[:10]
+            result = EvoPy(_fitness, 3, generations=20, strategy=strategy,
+                           selection=TournamentSelection(size=3),
+                           reporter=_preempt_at(None, reports)).resume(path)
+
+        assert np.array_equal(expected, result)
+        assert reports == expected_reports
+
+
+def test_resume_with_generator():
+    """Test whether a run seeded with a Generator resumes identically."""
+    expected = EvoPy(_fitness, 3, generations=12, random_seed=np.random.SeedSequence(42)).run()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.npz')
+        try:
+            EvoPy(_fitness, 3, generations=12, random_seed=np.random.SeedSequence(42),
+                  reporter=_preempt_at(8, []), checkpoint=Checkpointer(path, every=4)).run()
+        except _Preempted:
+            pass
+        result = EvoPy(_fitness, 3, generations=12).resume(path)
+    assert np.array_equal(expected, result)
+
+
+def test_resume_with_surrogate():
+    """Test whether the surrogate archive and model are restored when resuming."""
+    def fitness(genotypes):
+        return np.sum(genotypes ** 2, axis=1)
+
+    def create(**options):
+        return EvoPy(fitness, 3, generations=12, num_children=3, vectorized=True,
+                     surrogate=Surrogate(archive_size=40), **options)
+
+    expected = create(random_seed=42).run()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.npz')
+        try:
+            create(random_seed=42, reporter=_preempt_at(8, []),
+                   checkpoint=Checkpointer(path, every=4)).run()
+        except _Preempted:
+            pass
+        result = create().resume(path)
+    assert np.array_equal(expected, result)
+
+
+def test_resume_with_empty_surrogate():
+    """Test whether a checkpoint can be taken before the surrogate archive holds any point."""
+    def fitness(genotypes):
+        return np.sum(genotypes ** 2, axis=1)
+
+    def create(**options):
+        return EvoPy(fitness, 3, warm_start=np.full(3, 10.0), generations=6, vectorized=True,
+                     constraint=lambda genotypes: genotypes[:, 0] < 5, surrogate=Surrogate(),
+                     **options)
+
+    expected = create(random_seed=42).run()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.npz')
+        try:
+            create(random_seed=42, reporter=_preempt_at(3, []),
+                   checkpoint=Checkpointer(path, every=1)).run()
+        except _Preempted:
+            pass
+        assert len(load_checkpoint(path)['surrogate_genotypes']) == 0
+        result = create().resume(path)
+    assert np.array_equal(expected, result)
+
+
+def test_checkpoint_is_replaced_atomically():
+    """Test whether checkpoints overwrite each other without leaving temporary files behind."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.npz')
+        EvoPy(_fitness, 2, generations=7, checkpoint=Checkpointer(path, every=3)).run()
+
+        assert os.listdir(directory) == ['run.npz']
+        state = load_checkpoint(path)
+        assert int(state['generation']) == 6
+        assert state['genotypes'].shape == (30, 2)
+
+
+@raises(ValueError)
+def test_checkpointer_needs_a_schedule():
+    """Test whether an error is raised when neither generations nor interval are given."""
+    Checkpointer('run.npz')
@@ -0,0 +1,104 @@
+"""Tests for the CMA strategy."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import EvoPy, Strategy
+from evopy.cma import CovarianceMatrixAdaptation
+from evopy.population import Population
+
+
+def _rotated_ellipsoid(length, condition=1e6, random_seed=0):
+    """Return a vectorized ill-conditioned ellipsoid in a random rotation, minimal at the origin."""
+    rotation, _ = np.linalg.qr(np.random.RandomState(random_seed).randn(length, length))
+    weights = condition ** (np.arange(length) / (length - 1))
+    return lambda genotypes: np.sum(weights * (genotypes @ rotation) ** 2, axis=1)
+
+
+def _run(strategy, fitness_function, length, generations, **options):
+    reports = []
+    EvoPy(fitness_function, length, generations=generations, population_size=10,
+          strategy=strategy, random_seed=1, vectorized=True, warm_start=np.ones(length),
+          reporter=reports.append, **options).run()
+    return reports
+
+
+def test_converges_on_ill_conditioned_problem():
+    """Test whether CMA solves a rotated ill-conditioned problem the other strategies can not."""
+    fitness_function = _rotated_ellipsoid(10)
+    cma = _run(Strategy.CMA, fitness_function, 10, 600)
+    full_variance = _run(Strategy.FULL_VARIANCE, fitness_function, 10, 600)
+
+    assert cma[-1].best_fitness < 1e-8
+    assert cma[-1].best_fitness < 1e-6 * full_variance[-1].best_fitness
+
+
+def test_maximize():
+    """Test whether CMA climbs towards the maximum when maximizing."""
+    reports = _run(Strategy.CMA, lambda genotypes: -np.sum(genotypes ** 2, axis=1), 5, 150,
+                   maximize=True)
+    assert reports[-1].best_fitness > -1e-8
+
+
+def test_warm_start_and_early_stop():
+    """Test whether the distribution starts at the warm start and the fitness target stops it."""
+    warm_start = np.full(4, 100.0)
+    reports = []
+    evopy = EvoPy(lambda genotypes: np.floor(np.sum((genotypes - 100) ** 2, axis=1) * 100), 4,
+                  warm_start=warm_start, std=0.1, population_size=8, strategy=Strategy.CMA,
+                  vectorized=True, random_seed=3, target_fitness_value=0,
+                  reporter=reports.append)
+    best = evopy.run()
+    assert np.allclose(best, warm_start, atol=0.1)
+    assert reports[-1].best_fitness == 0
+    assert len(reports) < evopy.generations
+
+
+def test_eigendecomposition_is_lazy():
+    """Test whether the eigendecomposition is refreshed less often than every generation."""
+    length, generations = 30, 100
+    decompositions = []
+    original = CovarianceMatrixAdaptation._decompose
+
+    def decompose(cma):
+        decompositions.append(cma.evaluations)
+        original(cma)
+
+    CovarianceMatrixAdaptation._decompose = decompose
+    try:
+        _run(Strategy.CMA, _rotated_ellipsoid(length), length, generations)
+    finally:
+        CovarianceMatrixAdaptation._decompose = original
+    assert 0 < len(decompositions) < generations / 2
+
+
+def test_population_size_and_num_children():
+    """Test whether each generation samples population_size * num_children offspring."""
+    sizes = []
+
+    def fitness_function(genotypes):
+        sizes.append(len(genotypes))
+        return np.sum(genotypes ** 2, axis=1)
+
+    EvoPy(fitness_function, 3, generations=2, population_size=6, num_children=2,
+          strategy=Strategy.CMA, vectorized=True).run()
+    assert sizes == [12, 12, 12]
+
+
+@raises(ValueError)
+def test_individuals_do_not_reproduce():
+    """Test whether CMA populations refuse to reproduce without the shared distribution."""
+    Population(np.zeros((2, 3)), Strategy.CMA, np.zeros((2, 0))).reproduce()
+
+
+def test_stops_when_diverging():
+    """Test whether only finite genotypes are evaluated on a problem which is unbounded below."""
+    evaluated = []
+
+    def unbounded(genotypes):
+        evaluated.append(genotypes.copy())
+        return -genotypes[:, 0]
+
+    with np.errstate(all='raise'):
+        reports = _run(Strategy.CMA, unbounded, 2, 10000)
+    assert np.all(np.isfinite(np.concatenate(evaluated)))
+    assert 0 < len(reports) < 10000
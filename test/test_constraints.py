@@ -0,0 +1,95 @@
+"""Tests for box constraints and feasibility filtering."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import EvoPy, Repair, Strategy
+from evopy.utils import reflect
+
+
+def _run(**options):
+    evaluated = []
+    reports = []
+
+    def fitness_function(genotypes):
+        assert len(genotypes) > 0
+        evaluated.append(genotypes.copy())
+        return np.sum((genotypes - 2) ** 2, axis=1)
+
+    best = EvoPy(fitness_function, 2, generations=30, num_children=2, random_seed=3,
+                 vectorized=True, reporter=reports.append, **options).run()
+    return best, np.concatenate(evaluated) if evaluated else np.empty((0, 2)), reports
+
+
+def test_reflect():
+    """Test whether values are mirrored into finite and one-sided bounds."""
+    values = np.array([[-0.5, 1.25, 3.5, 0.5], [5.5, -2.0, 0.25, -7.0]])
+    lower = np.array([0.0, 0.0, 0.0, -np.inf])
+    upper = np.array([1.0, 1.0, 1.0, -1.0])
+    assert np.allclose(reflect(values, lower, upper),
+                       [[0.5, 0.75, 0.5, -2.5], [0.5, 0.0, 0.25, -7.0]])
+
+
+def test_fixed_allele():
+    """Test whether an allele of which the lower and upper bound coincide is kept fixed."""
+    assert np.array_equal(reflect(np.array([[0.5, 3.0]]), np.array([1.0, 1.0]),
+                                  np.array([1.0, 1.0])), [[1.0, 1.0]])
+    for repair in [Repair.CLIP, Repair.REFLECT]:
+        best, evaluated, _ = _run(bounds=([1, -1], [1, 1]), repair=repair)
+        assert np.all(evaluated[:, 0] == 1)
+        assert best[0] == 1 and np.all(np.isfinite(best))
+
+
+def test_repaired_children_stay_in_bounds():
+    """Test whether clipped and reflected children are evaluated within the bounds only."""
+    for repair in [Repair.CLIP, Repair.REFLECT, Repair.RESAMPLE, Repair.REJECT]:
+        best, evaluated, reports = _run(bounds=(-1, [1, 0.5]), repair=repair)
+        assert np.all((evaluated >= -1) & (evaluated <= [1, 0.5]))
+        assert np.allclose(best, [1, 0.5], atol=0.1)
+        assert sum(report.repaired_children + report.rejected_children for report in reports) > 0
+        if repair in (Repair.CLIP, Repair.REFLECT):
+            assert all(report.rejected_children == 0 for report in reports)
+        if repair == Repair.REJECT:
+            assert all(report.repaired_children == 0 for report in reports)
+            assert len(evaluated) + sum(report.rejected_children for report in reports) \
+                <= 30 + 30 * 2 * 30
+
+
+def test_constraint_predicate():
+    """Test whether children violating the constraint are resampled or rejected unevaluated."""
+    def constraint(genotypes):
+        return np.sum(genotypes, axis=1) <= 1
+
+    for repair in [Repair.CLIP, Repair.RESAMPLE]:
+        best, evaluated, reports = _run(constraint=constraint, repair=repair)
+        assert np.all(np.sum(evaluated, axis=1) <= 1)
+        assert np.allclose(best, [0.5, 0.5], atol=0.1)
+        assert reports[0].saved_evaluations is None
+        infeasible = [report.repaired_children if repair == Repair.RESAMPLE
+                      else report.rejected_children for report in reports]
+        assert sum(infeasible) > 0
+
+
+def test_cma_with_bounds():
+    """Test whether the CMA strategy resamples its offspring into the bounds."""
+    best, evaluated, _ = _run(bounds=(-1, 1), repair=Repair.RESAMPLE, strategy=Strategy.CMA)
+    assert np.all(np.abs(evaluated) <= 1)
+    assert np.allclose(best, [1, 1], atol=0.1)
+
+
+def test_all_children_rejected():
+    """Test whether a run without any feasible child finishes without evaluating anything."""
+    best, evaluated, reports = _run(constraint=lambda genotypes: np.zeros(len(genotypes)))
+    assert best.shape == (2,) and len(evaluated) == 0
+    assert len(reports) == 30 and reports[-1].best_fitness == np.inf
+
+
+def test_no_constraints():
+    """Test whether no counts are reported when neither bounds nor a constraint are given."""
+    _, _, reports = _run()
+    assert reports[0].repaired_children is None and reports[0].rejected_children is None
+
+
+@raises(ValueError)
+def test_invalid_bounds():
+    """Test whether an error is raised when a lower bound exceeds its upper bound."""
+    EvoPy(lambda x: x, 2, bounds=([0, 1], [1, 0]))
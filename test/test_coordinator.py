@@ -0,0 +1,171 @@
+"""Tests for evaluating fitness functions on remote workers."""
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from nose.tools import raises
+
+from evopy import Coordinator, EvoPy
+from evopy.protocol import HELLO, TASK, ProtocolError, receive_message, send_message
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def sphere(genotypes):
+    """A vectorized sphere fitness function, which workers can import.
+
+    Workers started with EVOPY_TEST_EXIT set exit while evaluating, and workers started with
+    EVOPY_TEST_DELAY sleep that many seconds per genotype.
+    """
+    if 'EVOPY_TEST_EXIT' in os.environ:
+        os._exit(1)
+    time.sleep(float(os.environ.get('EVOPY_TEST_DELAY', 0)) * len(genotypes))
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def scalar_sphere(genotype):
+    """A sphere fitness function, which workers can import."""
+    return np.sum(genotype ** 2)
+
+
+def failing_sphere(genotype):
+    """A fitness function which fails for every genotype."""
+    raise ArithmeticError("Can not evaluate %s" % genotype)
+
+
+def _start_worker(coordinator, **environment):
+    return subprocess.Popen(
+        [sys.executable, '-m', 'evopy.worker', '%s:%d' % coordinator.address],
+        cwd=_ROOT, env=dict(os.environ, **environment))
+
+
+@contextmanager
+def _workers(coordinator, *environments):
+    processes = [_start_worker(coordinator, **environment) for environment in environments]
+    try:
+        yield processes
+    finally:
+        coordinator.close()
+        for process in processes:
+            process.wait(timeout=10)
+
+
+def test_matches_in_process_run():
+    """Test whether remote evaluation gives the same result as in-process evaluation."""
+    for fitness_function, vectorized in [(sphere, True), (scalar_sphere, False)]:
+        expected = EvoPy(fitness_function, 3, generations=10, random_seed=42,
+                         vectorized=vectorized).run()
+        with Coordinator() as coordinator, _workers(coordinator, {}, {}, {}):
+            result = EvoPy(fitness_function, 3, generations=10, random_seed=42,
+                           vectorized=vectorized, executor=coordinator).run()
+            assert np.array_equal(expected, result)
+            assert sum(coordinator.evaluations.values()) == 30 + 10 * 30
+
+
+def test_lost_work_is_redispatched():
+    """Test whether the work of a worker which exits is evaluated by the others."""
+    expected = EvoPy(sphere, 3, generations=10, random_seed=42, vectorized=True).run()
+    with Coordinator() as coordinator, _workers(coordinator, {'EVOPY_TEST_EXIT': '1'}, {}, {}):
+        result = EvoPy(sphere, 3, generations=10, random_seed=42, vectorized=True,
+                       executor=coordinator).run()
+        assert np.array_equal(expected, result)
+        assert coordinator.num_workers == 2
+
+
+def test_workers_can_join():
+    """Test whether workers joining during a run take part in the evaluation."""
+    coordinator = Coordinator()
+    with _workers(coordinator, {}) as processes:
+        def reporter(report):
+            if report.generation == 1:
+                processes.extend(_start_worker(coordinator) for _ in range(2))
+            if report.generation > 1:
+                time.sleep(0.05)
+
+        EvoPy(sphere, 3, generations=20, random_seed=42, vectorized=True, executor=coordinator,
+              reporter=reporter).run()
+        assert coordinator.num_workers == 3
+        assert len(coordinator.evaluations) == 3
+
+
+def test_load_balancing():
+    """Test whether faster workers are sent more genotypes than slower ones."""
+    coordinator = Coordinator()
+    with _workers(coordinator, {'EVOPY_TEST_DELAY': '0.002'}, {}):
+        EvoPy(sphere, 3, generations=10, population_size=50, random_seed=42, vectorized=True,
+              executor=coordinator).run()
+        slow, fast = sorted(coordinator.evaluations.values())
+        assert fast > 3 * slow
+
+
+def test_junk_connections():
+    """Test whether connections which do not speak the protocol are dropped without harm."""
+    expected = EvoPy(sphere, 3, generations=10, random_seed=42, vectorized=True).run()
+    intruders = []
+
+    def reporter(report):
+        if report.generation == 1:
+            for junk in [b'GET / HTTP/1.1\r\nHost: localhost\r\nUser-Agent: probe\r\n\r\n',
+                         b'GET / HTTP/1.1\r\n', b'']:
+                intruder = socket.create_connection(coordinator.address)
+                intruder.sendall(junk)
+                intruders.append(intruder)
+
+    with Coordinator(handshake_timeout=0.2) as coordinator, _workers(coordinator, {}, {}):
+        result = EvoPy(sphere, 3, generations=10, random_seed=42, vectorized=True,
+                       executor=coordinator, reporter=reporter).run()
+        assert np.array_equal(expected, result)
+        assert coordinator.num_workers == 2
+    for intruder in intruders:
+        intruder.close()
+
+
+def test_stalled_workers():
+    """Test whether a worker which stalls halfway through a message is dropped."""
+    expected = EvoPy(sphere, 3, generations=5, random_seed=42, vectorized=True).run()
+    with Coordinator(message_timeout=0.3) as coordinator:
+        stalled = socket.create_connection(coordinator.address)
+        send_message(stalled, HELLO, b'stalled')
+        stalled.sendall(b'\x04')
+        with stalled, _workers(coordinator, {}):
+            start = time.time()
+            result = EvoPy(sphere, 3, generations=5, random_seed=42, vectorized=True,
+                           executor=coordinator).run()
+            assert np.array_equal(expected, result)
+            assert coordinator.num_workers == 1 and 'stalled' not in coordinator.evaluations
+            assert time.time() - start < 10
+
+
+def test_invalid_headers():
+    """Test whether messages with an invalid header are refused before allocating a payload."""
+    header = struct.Struct('<BcQQQd')
+    for message in [header.pack(71, b'd', 0, 1, 1, 0.0), header.pack(TASK, b'E', 0, 1, 1, 0.0),
+                    header.pack(TASK, b'O', 0, 1, 1, 0.0),
+                    header.pack(TASK, b'd', 0, 1 << 40, 1 << 20, 0.0)]:
+        sender, receiver = socket.socketpair()
+        with sender, receiver:
+            sender.sendall(message)
+            try:
+                receive_message(receiver)
+            except ProtocolError:
+                continue
+            raise AssertionError("Accepted an invalid header.")
+
+
+@raises(RuntimeError)
+def test_worker_errors():
+    """Test whether an error is raised when a worker fails to evaluate its genotypes."""
+    with Coordinator() as coordinator, _workers(coordinator, {}):
+        EvoPy(failing_sphere, 3, generations=1, executor=coordinator).run()
+
+
+@raises(TimeoutError)
+def test_no_workers():
+    """Test whether an error is raised when no worker connects in time."""
+    with Coordinator(worker_timeout=0.2) as coordinator:
+        EvoPy(sphere, 3, generations=1, executor=coordinator).run()
@@ -1,5 +1,6 @@
 """End to end tests for evopy."""
 import numpy as np
+from nose.tools import raises
 
 from evopy import EvoPy
 
@@ -69,3 +70,46 @@ def test_multi_dimensional_use_case():
     assert best_individual is not None
     assert isinstance(best_individual, np.ndarray)
     assert best_individual.size == 2
+
+
+def test_vectorized_use_case():
+    """Test whether a vectorized fitness function is called once per generation on a matrix."""
+    shapes = []
+
+    def fitness(genotypes):
+        shapes.append(genotypes.shape)
+        return np.sum(genotypes ** 2, axis=1)
+
+    evopy = EvoPy(fitness, 3, generations=5, population_size=10, num_children=2,
+                  vectorized=True)
+    best_individual = evopy.run()
+    assert best_individual.size == 3
+    assert shapes == [(10, 3)] + [(20, 3)] * 5
+
+
+def test_vectorized_matches_scalar():
+    """Test whether the vectorized mode gives the same results as the scalar mode."""
+    x_first = EvoPy(lambda x: np.sum(x ** 2), 2, random_seed=42).run()
+    x_second = EvoPy(lambda X: np.sum(X ** 2, axis=1), 2, random_seed=42, vectorized=True).run()
+    assert np.array_equal(x_first, x_second)
+
+
+def test_reduced_precision():
+    """Test whether a float32 run evolves float32 genotypes and still converges."""
+    genotypes = []
+
+    def fitness_function(batch):
+        genotypes.append(batch)
+        return np.sum(batch ** 2, axis=1)
+
+    best = EvoPy(fitness_function, 3, generations=50, random_seed=42, vectorized=True,
+                 dtype=np.float32).run()
+    assert best.dtype == np.float32
+    assert all(batch.dtype == np.float32 for batch in genotypes)
+    assert np.sum(best ** 2) < 1e-2
+
+
+@raises(ValueError)
+def test_invalid_dtype():
+    """Test whether an error is raised for floating point types other than float32 and float64."""
+    EvoPy(lambda x: x, 1, dtype=np.float16)
@@ -0,0 +1,77 @@
+"""Tests for evaluating individuals only once and caching fitness values."""
+import numpy as np
+
+from evopy import EvoPy
+from evopy.fitness_cache import FitnessCache
+
+
+def test_survivors_are_not_re_evaluated():
+    """Test whether each individual is evaluated exactly once over a run."""
+    count = [0]
+
+    def fitness(genotype):
+        count[0] += 1
+        return pow(genotype[0], 2)
+
+    EvoPy(fitness, 1, generations=3, population_size=5, num_children=2, random_seed=42).run()
+
+    assert count[0] == 5 + 3 * 5 * 2
+
+
+def test_cache_hits_duplicate_genotypes():
+    """Test whether duplicate genotypes are only evaluated once."""
+    count = [0]
+
+    def fitness(genotype):
+        count[0] += 1
+        return genotype.sum()
+
+    cache = FitnessCache(10)
+    for _ in range(3):
+        cache.evaluate(fitness, np.array([1.0, 2.0]))
+    cache.evaluate(fitness, np.array([2.0, 1.0]))
+
+    assert count[0] == 2
+    assert cache.hits == 2
+    assert cache.misses == 2
+
+
+def test_cache_evicts_least_recently_used():
+    """Test whether the cache stays within its size and evicts the least recently used value."""
+    cache = FitnessCache(2)
+    for value in [1.0, 2.0, 1.0, 3.0]:
+        cache.evaluate(lambda genotype: genotype[0], np.array([value]))
+    cache.evaluate(lambda genotype: genotype[0], np.array([2.0]))
+
+    assert len(cache) == 2
+    assert cache.hits == 1
+    assert cache.misses == 4
+
+
+def test_cached_run_is_consistent():
+    """Test whether enabling the cache does not change the outcome of a seeded run."""
+    x_first = EvoPy(lambda x: pow(x[0], 2), 1, random_seed=42).run()
+    evopy = EvoPy(lambda x: pow(x[0], 2), 1, random_seed=42, cache_size=100)
+    x_second = evopy.run()
+
+    assert x_first == x_second
+    assert evopy.fitness_cache.misses > 0
+
+
+def test_batch_evaluation_uses_cache():
+    """Test whether batched evaluation only passes unseen, unique genotypes to the function."""
+    calls = []
+
+    def fitness(genotypes):
+        calls.append(len(genotypes))
+        return genotypes.sum(axis=1)
+
+    cache = FitnessCache(10)
+    first = cache.evaluate_batch(fitness, np.array([[1.0, 2.0], [3.0, 4.0], [1.0, 2.0]]))
+    second = cache.evaluate_batch(fitness, np.array([[3.0, 4.0], [5.0, 6.0]]))
+
+    assert np.array_equal(first, [3.0, 7.0, 3.0])
+    assert np.array_equal(second, [7.0, 11.0])
+    assert calls == [2, 1]
+    assert cache.hits == 2
+    assert cache.misses == 3
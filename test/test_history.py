@@ -0,0 +1,144 @@
+"""Tests for iterating over generations and recording the history of a run."""
+import os
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from evopy import EvoPy, History, Strategy
+from evopy.checkpoint import Checkpointer
+
+
+def _sphere(genotypes):
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def _create(**options):
+    return EvoPy(_sphere, 3, generations=25, random_seed=42, vectorized=True, **options)
+
+
+def test_iterate_matches_reporter():
+    """Test whether iterating yields the same reports as the reporter callback."""
+    reports = []
+    expected = _create(reporter=reports.append).run()
+    iterated = list(_create().iterate())
+
+    assert [report.generation for report in iterated] == list(range(25))
+    assert [report.best_fitness for report in iterated] \
+        == [report.best_fitness for report in reports]
+    assert np.array_equal(iterated[-1].best_genotype, expected)
+
+
+def test_iterate_can_pause():
+    """Test whether an iteration which was stopped early can be continued by iterating again."""
+    expected = list(_create().iterate())
+    evopy = _create()
+    first = []
+    for report in evopy.iterate():
+        first.append(report)
+        if report.generation == 9:
+            break
+    rest = list(evopy.iterate())
+
+    assert [report.best_fitness for report in first + rest] \
+        == [report.best_fitness for report in expected]
+
+
+def test_iterate_resumes_after_an_exception():
+    """Test whether iterating again evaluates the generation during which evaluation failed."""
+    expected = list(_create().iterate())
+    failures = [RuntimeError("Evaluation failed.")]
+
+    def failing_sphere(genotypes):
+        if failures:
+            raise failures.pop()
+        return _sphere(genotypes)
+
+    evopy = EvoPy(failing_sphere, 3, generations=25, random_seed=42, vectorized=True)
+    try:
+        next(evopy.iterate())
+        raise AssertionError("The evaluation did not fail.")
+    except RuntimeError:
+        pass
+    resumed = list(evopy.iterate())
+
+    assert [report.best_fitness for report in resumed] \
+        == [report.best_fitness for report in expected]
+
+
+def test_iterate_after_ask():
+    """Test whether iterating evaluates the children which were asked for but not told."""
+    expected = list(_create().iterate())
+    evopy = _create()
+    genotypes = evopy.ask()
+    evopy.tell(genotypes[:5], _sphere(genotypes[:5]))
+    evopy.ask()
+    iterated = list(evopy.iterate())
+
+    assert [report.best_fitness for report in iterated] \
+        == [report.best_fitness for report in expected]
+
+
+def test_closing_a_paused_iteration():
+    """Test whether closing a paused iteration does not affect a newer iteration."""
+    expected = list(_create().iterate())
+    evopy = _create()
+    paused = evopy.iterate()
+    first = [next(paused)]
+    iteration = evopy.iterate()
+    first.append(next(iteration))
+    paused.close()
+    rest = list(iteration)
+
+    assert [report.best_fitness for report in first + rest] \
+        == [report.best_fitness for report in expected]
+
+
+def test_reports_hold_copies():
+    """Test whether reports do not keep the population of their generation alive."""
+    report = next(_create().iterate())
+    assert report.best_genotype.base is None
+
+
+def test_history_is_recorded_in_chunks():
+    """Test whether the history holds all generations, written in bounded chunks."""
+    with tempfile.TemporaryDirectory() as directory:
+        history = History(directory, genotype_interval=10, chunk_size=7)
+        reports = []
+        best = _create(history=history, reporter=reports.append,
+                       strategy=Strategy.MULTIPLE_VARIANCE).run()
+        stats, genotypes = History.load(directory)
+
+        assert len(history._stats) == 7
+        assert np.array_equal(stats['generation'], np.arange(25))
+        assert np.array_equal(stats['best_fitness'], [report.best_fitness for report in reports])
+        assert np.all(stats['best_fitness'] <= stats['median_fitness'])
+        assert np.all(stats['median_fitness'] <= stats['worst_fitness'])
+        assert np.all(stats['sigma_min'] <= stats['sigma_max'])
+        assert np.array_equal(genotypes['generation'], [0, 10, 20])
+        assert np.array_equal(genotypes['genotype'][-1], reports[20].best_genotype)
+        assert np.sum(best ** 2) <= stats['best_fitness'][20]
+
+
+def test_history_continues_after_resume():
+    """Test whether a resumed run replaces the history recorded after its checkpoint."""
+    with tempfile.TemporaryDirectory() as directory:
+        expected_directory = os.path.join(directory, 'expected')
+        _create(history=History(expected_directory, genotype_interval=5, chunk_size=4)).run()
+
+        path = os.path.join(directory, 'checkpoint.npz')
+        history_directory = os.path.join(directory, 'history')
+        _create(history=History(history_directory, genotype_interval=5, chunk_size=4),
+                checkpoint=Checkpointer(path, every=10)).run()
+        _create(history=History(history_directory, genotype_interval=5, chunk_size=4)) \
+            .resume(path)
+
+        for records, expected in zip(History.load(history_directory),
+                                     History.load(expected_directory)):
+            assert np.array_equal(records, expected)
+
+
+@raises(ValueError)
+def test_invalid_chunk_size():
+    """Test whether an error is raised for an empty buffer."""
+    History('history', chunk_size=0)
@@ -0,0 +1,58 @@
+"""Tests for the per-phase timing instrumentation."""
+from contextlib import contextmanager
+
+import numpy as np
+
+from evopy import EvoPy
+from evopy.instrumentation import Instrumentation
+
+
+def test_reports_without_instrumentation():
+    """Test whether reports carry no instrumentation values when it is disabled."""
+    reports = []
+    evopy = EvoPy(lambda x: np.sum(x ** 2), 2, generations=3, reporter=reports.append)
+    evopy.run()
+
+    assert evopy.instrumentation is None
+    assert all(report.timings is None and report.evaluations is None for report in reports)
+
+
+def test_reports_with_instrumentation():
+    """Test whether each report holds the timings and counts of its generation."""
+    reports = []
+    evopy = EvoPy(lambda x: np.sum(np.round(x) ** 2), 2, generations=5, population_size=10,
+                  num_children=2, reporter=reports.append, cache_size=1000, instrument=True)
+    evopy.run()
+
+    for report in reports:
+        assert set(report.timings) == set(Instrumentation.PHASES)
+        assert report.timings['init'] == 0
+        assert report.timings['reproduction'] > 0
+        assert report.timings['evaluation'] > 0
+        assert report.evaluations + report.cache_hits == 20
+
+    totals = evopy.instrumentation
+    assert totals.timings['init'] > 0
+    assert totals.timings['reporting'] > 0
+    assert totals.evaluations == evopy.fitness_cache.misses
+    assert totals.cache_hits == evopy.fitness_cache.hits
+    assert totals.evaluations + totals.cache_hits == 10 + 5 * 20
+
+
+def test_phase_hook():
+    """Test whether the phase hook wraps every phase of every generation."""
+    phases = []
+
+    @contextmanager
+    def hook(phase, generation):
+        phases.append(('enter', phase, generation))
+        yield
+        phases.append(('exit', phase, generation))
+
+    EvoPy(lambda x: np.sum(x ** 2), 2, generations=2, phase_hook=hook).run()
+
+    assert phases[:4] == [('enter', 'init', 0), ('exit', 'init', 0),
+                          ('enter', 'evaluation', 0), ('exit', 'evaluation', 0)]
+    assert ('exit', 'selection', 1) in phases
+    assert ('enter', 'reporting', 0) not in phases
+    assert len(phases) == 2 * (2 + 3 * 2)
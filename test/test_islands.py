@@ -0,0 +1,103 @@
+"""Tests for the island model."""
+import multiprocessing
+import threading
+
+import numpy as np
+from nose.tools import raises
+
+from evopy import IslandModel, Strategy, Topology
+from evopy.islands import _run_island
+
+
+def rastrigin(genotype):
+    """The Rastrigin function, defined at module level so that it can be pickled."""
+    return 10 * len(genotype) + np.sum(genotype ** 2 - 10 * np.cos(2 * np.pi * genotype))
+
+
+def test_islands_are_reproducible():
+    """Test whether seeded island runs give the same result for each topology."""
+    for topology in Topology:
+        results = [IslandModel(rastrigin, 2, num_islands=3, migration_interval=5,
+                               topology=topology, generations=20, random_seed=42,
+                               population_size=10).run()
+                   for _ in range(2)]
+        assert np.array_equal(results[0], results[1])
+
+
+def test_islands_report_merged_progress():
+    """Test whether all generations are reported once, with the best fitness over all islands."""
+    reports = []
+    model = IslandModel(rastrigin, 2, num_islands=2, migration_interval=4, generations=10,
+                        random_seed=42, reporter=reports.append, population_size=10)
+    best = model.run()
+
+    assert [report.generation for report in reports] == list(range(10))
+    fitness = [report.best_fitness for report in reports]
+    assert fitness == sorted(fitness, reverse=True)
+    assert rastrigin(best) == fitness[-1]
+    assert all(report.island in [0, 1] for report in reports)
+
+
+def test_islands_stop_early():
+    """Test whether all islands stop once one of them reaches the target fitness value."""
+    reports = []
+    IslandModel(rastrigin, 1, num_islands=2, migration_interval=3, generations=100,
+                reporter=reports.append, target_fitness_value=0, max_run_time=0).run()
+    assert len(reports) == 1
+
+
+def test_migrants_do_not_replace_the_best():
+    """Test whether an island keeps its best individual when all of its rows are replaced."""
+    connection, island_connection = multiprocessing.Pipe()
+    island = threading.Thread(target=_run_island, args=(
+        island_connection, {'fitness_function': rastrigin, 'individual_length': 2,
+                            'warm_start': np.full(2, 5.0), 'generations': 10, 'random_seed': 42,
+                            'population_size': 1, 'num_children': 10}, 1, 1), daemon=True)
+    island.start()
+    running = True
+    while running:
+        running, fitness, genotypes, (_, strategy_parameters, _) = connection.recv()
+        assert all(np.isclose(rastrigin(genotype), value)
+                   for genotype, value in zip(genotypes, fitness))
+        connection.send((np.full((1, 2), 10.0), strategy_parameters, np.array([200.0]))
+                        if running else None)
+    island.join()
+
+
+def test_migration_changes_outcome():
+    """Test whether migrants take part in the evolution of the receiving islands."""
+    results = [IslandModel(rastrigin, 2, num_islands=2, migration_interval=interval,
+                           generations=20, random_seed=42, population_size=10).run()
+               for interval in [2, 1000]]
+    assert not np.array_equal(results[0], results[1])
+
+
+@raises(ValueError)
+def test_cma_islands():
+    """Test whether an error is raised for the CMA strategy, which migration would not affect."""
+    IslandModel(rastrigin, 2, strategy=Strategy.CMA)
+
+
+@raises(ValueError)
+def test_invalid_topology():
+    """Test whether an error is raised when the topology is not a Topology."""
+    IslandModel(rastrigin, 2, topology='ring')
+
+
+def test_migration_routes():
+    """Test whether migrants are routed along the topology."""
+    emigrants = [(np.full((1, 2), island), np.zeros((1, 1)), np.array([island]))
+                 for island in range(3)]
+    random = np.random.default_rng(42)
+
+    ring = IslandModel(rastrigin, 2, topology=Topology.RING)._migrate(emigrants, random)
+    assert [list(fitness) for _, _, fitness in ring] == [[2], [0], [1]]
+
+    full = IslandModel(rastrigin, 2, topology=Topology.FULLY_CONNECTED)._migrate(emigrants,
+                                                                                random)
+    assert [list(fitness) for _, _, fitness in full] == [[1, 2], [0, 2], [0, 1]]
+
+    shuffled = IslandModel(rastrigin, 2, topology=Topology.RANDOM)._migrate(emigrants, random)
+    received = sorted(int(value) for _, _, fitness in shuffled for value in fitness)
+    assert received == [0, 1, 2]
+    assert all(island not in fitness for island, (_, _, fitness) in enumerate(shuffled))
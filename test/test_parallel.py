@@ -0,0 +1,60 @@
+"""Tests for evaluating fitness functions through an executor."""
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from evopy import EvoPy
+
+
+def sphere(genotype):
+    """A sphere fitness function, defined at module level so that it can be pickled."""
+    return np.sum(genotype ** 2)
+
+
+def vectorized_sphere(genotypes):
+    """A vectorized sphere fitness function, defined at module level so that it can be pickled."""
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def test_thread_pool_is_reproducible():
+    """Test whether a thread pool gives the same result as sequential evaluation."""
+    expected = EvoPy(sphere, 3, generations=20, random_seed=42).run()
+
+    def slow_sphere(genotype):
+        time.sleep(0.001 * np.random.RandomState().rand())
+        return sphere(genotype)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        result = EvoPy(slow_sphere, 3, generations=20, random_seed=42, executor=executor).run()
+
+    assert np.array_equal(expected, result)
+
+
+def test_process_pool_is_reproducible():
+    """Test whether a process pool gives the same result as sequential evaluation."""
+    expected = EvoPy(sphere, 3, generations=10, random_seed=42).run()
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        result = EvoPy(sphere, 3, generations=10, random_seed=42, executor=executor,
+                       chunksize=8).run()
+
+    assert np.array_equal(expected, result)
+
+
+def test_vectorized_chunks():
+    """Test whether a vectorized fitness function is called on chunks of the given size."""
+    shapes = []
+
+    def fitness(genotypes):
+        shapes.append(genotypes.shape)
+        return vectorized_sphere(genotypes)
+
+    expected = EvoPy(vectorized_sphere, 2, generations=5, population_size=10, random_seed=42,
+                     vectorized=True).run()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = EvoPy(fitness, 2, generations=5, population_size=10, random_seed=42,
+                       vectorized=True, executor=executor, chunksize=4).run()
+
+    assert np.array_equal(expected, result)
+    assert sorted(set(shapes)) == [(2, 2), (4, 2)]
@@ -0,0 +1,83 @@
+"""Tests for the array-backed population."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import Strategy
+from evopy.individual import Individual
+from evopy.population import Population
+
+
+def _population(strategy, size=4, length=3):
+    random = np.random.RandomState(42)
+    num_parameters = Population.num_strategy_parameters(strategy, length)
+    return Population(random.randn(size, length), strategy,
+                      np.abs(random.randn(size, num_parameters)), random_seed=random)
+
+
+def test_reproduce_shapes():
+    """Test whether bulk reproduction creates the right number of unevaluated children."""
+    for strategy in [Strategy.SINGLE_VARIANCE, Strategy.MULTIPLE_VARIANCE,
+                     Strategy.FULL_VARIANCE]:
+        children = _population(strategy).reproduce(num_children=3)
+        assert children.genotypes.shape == (12, 3)
+        assert children.strategy_parameters.shape == (
+            12, Population.num_strategy_parameters(strategy, 3))
+        assert np.all(np.isnan(children.fitness))
+
+
+def test_variances_are_bounded():
+    """Test whether mutated variances never drop below the minimum variance."""
+    for strategy in [Strategy.SINGLE_VARIANCE, Strategy.MULTIPLE_VARIANCE]:
+        population = _population(strategy)
+        population.strategy_parameters[:] = 0
+        children = population.reproduce()
+        assert np.all(children.strategy_parameters >= Individual._EPSILON)
+
+
+def test_individual_views():
+    """Test whether indexing a population returns an Individual viewing its rows."""
+    population = _population(Strategy.MULTIPLE_VARIANCE)
+    population.fitness[1] = 5.0
+    individual = population[1]
+
+    assert isinstance(individual, Individual)
+    assert individual.fitness == 5.0
+    assert population[0].fitness is None
+    individual.genotype[0] = 100.0
+    assert population.genotypes[1, 0] == 100.0
+
+
+def test_take_and_concatenate():
+    """Test whether selecting and combining populations keeps the rows together."""
+    population = _population(Strategy.SINGLE_VARIANCE)
+    population.fitness[:] = [3.0, 1.0, 2.0, 0.0]
+    combined = population.take([3, 1]).concatenate(population.take([0]))
+
+    assert np.array_equal(combined.fitness, [0.0, 1.0, 3.0])
+    assert np.array_equal(combined.genotypes, population.genotypes[[3, 1, 0]])
+
+
+@raises(ValueError)
+def test_invalid_strategy_parameters():
+    """Test whether an error is raised when the strategy parameters have the wrong shape."""
+    Population(np.zeros((2, 3)), Strategy.MULTIPLE_VARIANCE, np.zeros((2, 1)))
+
+
+def test_reduced_precision():
+    """Test whether populations keep their floating point type through reproduction."""
+    for strategy in [Strategy.SINGLE_VARIANCE, Strategy.MULTIPLE_VARIANCE,
+                     Strategy.FULL_VARIANCE]:
+        population = _population(strategy)
+        population = Population(population.genotypes, strategy, population.strategy_parameters,
+                                random_seed=1, dtype=np.float32)
+        children = population.reproduce(num_children=2).concatenate(population)
+        assert children.genotypes.dtype == np.float32
+        assert children.strategy_parameters.dtype == np.float32
+        assert children.fitness.dtype == np.float64
+
+
+def test_memory_footprint():
+    """Test whether the memory footprint covers genotype, strategy parameters and fitness."""
+    assert Population.memory_footprint(Strategy.MULTIPLE_VARIANCE, 2000) == 32008
+    assert Population.memory_footprint(Strategy.MULTIPLE_VARIANCE, 2000, np.float32) == 16008
+    assert Population.memory_footprint(Strategy.CMA, 10, np.float32) == 48
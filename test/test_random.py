@@ -2,7 +2,8 @@
 import numpy as np
 from nose.tools import raises
 
-from evopy.utils import random_with_seed
+from evopy import EvoPy
+from evopy.utils import get_random_state, random_with_seed, restore_random, spawn_generators
 
 
 def random_integer_seed_test():
@@ -18,13 +19,58 @@ def random_state_seed_test():
 
 
 def random_none_seed_test():
-    """Test if none is given the original random is used."""
+    """Test if none gives a fresh generator, leaving the global random state alone."""
     np.random.seed(42)
     random = random_with_seed(None)
-    assert random.randint(100) == 51
+    assert isinstance(random, np.random.Generator)
+    assert random is not random_with_seed(None)
+    random.standard_normal(10)
+    assert np.random.randint(100) == 51
 
 
 @raises(ValueError)
 def random_invalid_seed_test():
     """Test if an error is raised when an incorrect parameter is supplied."""
     random_with_seed(4.0)
+
+
+def random_generator_seed_test():
+    """Test if generators are used as they are."""
+    generator = np.random.default_rng(42)
+    assert random_with_seed(generator) is generator
+
+
+def random_seed_sequence_test():
+    """Test if seed sequences give reproducible PCG64 generators."""
+    first = random_with_seed(np.random.SeedSequence(42))
+    second = random_with_seed(np.random.SeedSequence(42))
+    assert isinstance(first, np.random.Generator)
+    assert isinstance(first.bit_generator, np.random.PCG64)
+    assert first.standard_normal() == second.standard_normal()
+
+
+def spawn_generators_test():
+    """Test if spawned generators are reproducible and independent."""
+    first = [generator.standard_normal(3) for generator in spawn_generators(42, 3)]
+    second = [generator.standard_normal(3) for generator in spawn_generators(42, 3)]
+    assert np.array_equal(first, second)
+    assert len({tuple(sample) for sample in first}) == 3
+
+
+def random_state_roundtrip_test():
+    """Test if both kinds of generators continue identically after restoring their state."""
+    for random in [np.random.RandomState(42), np.random.default_rng(42),
+                   np.random.Generator(np.random.Philox(42))]:
+        random.standard_normal()
+        restored = restore_random(get_random_state(random))
+        assert isinstance(restored, type(random))
+        if isinstance(random, np.random.Generator):
+            assert isinstance(restored.bit_generator, type(random.bit_generator))
+        assert np.array_equal(random.standard_normal(5), restored.standard_normal(5))
+
+
+def evopy_generator_seed_test():
+    """Test if runs seeded with a seed sequence are reproducible."""
+    x_first = EvoPy(lambda x: np.sum(x ** 2), 2, random_seed=np.random.SeedSequence(42)).run()
+    x_second = EvoPy(lambda x: np.sum(x ** 2), 2, random_seed=np.random.SeedSequence(42)).run()
+    assert np.array_equal(x_first, x_second)
@@ -0,0 +1,87 @@
+"""Tests for the correlated mutations of the full variance strategy."""
+import numpy as np
+
+from evopy import Strategy
+from evopy.individual import Individual
+from evopy.population import Population
+from evopy.utils import rotate
+
+
+# pylint: disable=invalid-name
+def _dense_full_variance(genotype, strategy_parameters, random):
+    """The original implementation of the full variance strategy, building T explicitly."""
+    length = len(genotype)
+    global_scale_factor = random.randn() * np.sqrt(1 / (2 * length))
+    scale_factors = [random.randn() * np.sqrt(1 / 2 * np.sqrt(length)) for _ in range(length)]
+    new_variances = [max(np.exp(global_scale_factor + scale_factors[i])
+                         * strategy_parameters[i], Individual._EPSILON)
+                     for i in range(length)]
+    new_rotations = [strategy_parameters[i] + random.randn() * Individual._BETA
+                     for i in range(length, len(strategy_parameters))]
+    new_rotations = [rotation if abs(rotation) < np.pi
+                     else rotation - np.sign(rotation) * 2 * np.pi
+                     for rotation in new_rotations]
+    T = np.identity(length)
+    for p in range(length - 1):
+        for q in range(p + 1, length):
+            j = int((2 * length - p) * (p + 1) / 2 - 2 * length + q)
+            T_pq = np.identity(length)
+            T_pq[p][p] = T_pq[q][q] = np.cos(new_rotations[j])
+            T_pq[p][q] = -np.sin(new_rotations[j])
+            T_pq[q][p] = -T_pq[p][q]
+            T = np.matmul(T, T_pq)
+    return genotype + T @ random.randn(length), new_variances + new_rotations, T
+
+
+def test_matches_dense_implementation():
+    """Test whether reproduction gives exactly the offspring of the original implementation."""
+    for length in range(1, 7):
+        setup = np.random.RandomState(length)
+        genotype = setup.randn(length)
+        parameters = setup.randn(length * (length + 1) // 2) * 3
+        for seed in range(5):
+            expected_genotype, expected_parameters, _ = _dense_full_variance(
+                genotype, parameters, np.random.RandomState(seed))
+            child = Individual(genotype, Strategy.FULL_VARIANCE, parameters,
+                               random_seed=np.random.RandomState(seed)).reproduce()
+            assert np.allclose(child.genotype, expected_genotype)
+            assert np.allclose(child.strategy_parameters, expected_parameters)
+
+
+def test_batched_rotation_matches_matrix():
+    """Test whether rotating a batch of vectors applies each vector's own rotation matrix."""
+    length = 5
+    random = np.random.RandomState(42)
+    rotations = random.uniform(-np.pi, np.pi, size=(3, length * (length - 1) // 2))
+    vectors = random.randn(3, length)
+    rotated = rotate(rotations, vectors)
+    for rotation, vector, result in zip(rotations, vectors, rotated):
+        parameters = np.concatenate((np.ones(length), rotation))
+        _, _, matrix = _dense_full_variance(np.zeros(length), parameters, _ZeroRandom())
+        assert np.allclose(matrix @ vector, result)
+        assert np.allclose(rotate(rotation, vector), result)
+
+
+def test_batched_reproduction_distribution():
+    """Test whether batched reproduction samples the same mutation distribution."""
+    length = 3
+    random = np.random.RandomState(42)
+    genotype = np.zeros(length)
+    parameters = random.uniform(-1, 1, size=length * (length + 1) // 2)
+    samples = 20000
+    population = Population(np.tile(genotype, (samples, 1)), Strategy.FULL_VARIANCE,
+                            np.tile(parameters, (samples, 1)), random_seed=random)
+    batched = population.reproduce().genotypes
+    dense = np.array([_dense_full_variance(genotype, parameters, random)[0]
+                      for _ in range(samples)])
+    assert np.allclose(np.cov(batched.T), np.cov(dense.T), atol=0.05)
+    assert np.allclose(batched.mean(axis=0), dense.mean(axis=0), atol=0.05)
+
+
+class _ZeroRandom:
+    """A stand-in random state which only samples zeros, leaving the rotations unmutated."""
+
+    @staticmethod
+    def randn(*size):
+        """Return zeros of the given size."""
+        return np.zeros(size) if size else 0.0
@@ -0,0 +1,71 @@
+"""Tests for the survivor selection schemes."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import CommaSelection, EvoPy, PlusSelection, TournamentSelection, \
+    TruncationSelection
+from evopy.selection import top_k
+
+
+def _sphere(sign):
+    """Return a sphere fitness function, negated when the sign is -1."""
+    return lambda genotype: sign * np.sum(genotype ** 2)
+
+
+def test_top_k():
+    """Test whether top_k returns the lowest scores in order."""
+    scores = np.array([5.0, 1.0, 4.0, 2.0, 3.0])
+    assert np.array_equal(top_k(scores, 3), [1, 3, 4])
+    assert np.array_equal(top_k(scores, 10), [1, 3, 4, 2, 0])
+    assert len(top_k(scores, 0)) == 0
+
+
+def test_plus_selection():
+    """Test whether plus selection picks the best of children and parents together."""
+    survivors = PlusSelection().select(np.array([3.0, 0.0]), np.array([1.0, 2.0]), 3, None)
+    assert np.array_equal(survivors, [1, 2, 3])
+
+
+def test_comma_selection():
+    """Test whether comma selection only picks children."""
+    survivors = CommaSelection().select(np.array([3.0, 0.0, 5.0]), np.array([1.0]), 2, None)
+    assert np.array_equal(survivors, [1, 0])
+
+
+@raises(ValueError)
+def test_comma_selection_needs_enough_children():
+    """Test whether comma selection refuses to pick more survivors than there are children."""
+    CommaSelection().select(np.array([3.0]), np.array([1.0, 2.0]), 2, None)
+
+
+def test_truncation_selection():
+    """Test whether truncation selection keeps the elite parents and fills up with children."""
+    selection = TruncationSelection(elitism=1)
+    survivors = selection.select(np.array([0.5, 4.0, 3.0]), np.array([1.0, 0.0]), 3, None)
+    assert np.array_equal(survivors, [4, 0, 2])
+
+    survivors = selection.select(np.array([0.5]), np.array([1.0, 0.0, 2.0]), 3, None)
+    assert np.array_equal(survivors, [2, 0, 1])
+
+
+def test_tournament_selection():
+    """Test whether tournament winners are the best of their group, and ordered."""
+    scores = np.arange(10.0)
+    survivors = TournamentSelection(size=10).select(scores[:5], scores[5:], 3,
+                                                    np.random.RandomState(42))
+    assert len(survivors) == 3
+    assert np.all(np.diff(scores[survivors]) >= 0)
+
+    survivors = TournamentSelection(size=1).select(scores[:5], scores[5:], 100,
+                                                   np.random.RandomState(42))
+    assert len(set(survivors)) > 5
+
+
+def test_selection_schemes_optimize():
+    """Test whether each selection scheme can be used to minimize and maximize."""
+    for selection in [PlusSelection(), CommaSelection(), TruncationSelection(elitism=2),
+                      TournamentSelection(size=3)]:
+        for maximize in [False, True]:
+            best = EvoPy(_sphere(-1 if maximize else 1), 2, num_children=3, maximize=maximize,
+                         selection=selection, random_seed=42).run()
+            assert np.sum(best ** 2) < 0.1
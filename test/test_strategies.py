@@ -26,6 +26,8 @@ class TestStrategies(TestCase):
         [Strategy.MULTIPLE_VARIANCE, True],
         [Strategy.FULL_VARIANCE, False],
         [Strategy.FULL_VARIANCE, True],
+        [Strategy.CMA, False],
+        [Strategy.CMA, True],
     ])
     def test_strategies(self, strategy, multi_dimensional):
         """Tests the given strategy with the given problem dimensionality."""
@@ -0,0 +1,85 @@
+"""Tests for surrogate-assisted pre-screening."""
+import numpy as np
+from nose.tools import raises
+
+from evopy import CommaSelection, EvoPy, Strategy, Surrogate
+
+
+def _sphere(genotypes):
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def _run(surrogate, **options):
+    evaluations = []
+    reports = []
+
+    def fitness_function(genotypes):
+        evaluations.append(len(genotypes))
+        return _sphere(genotypes)
+
+    EvoPy(fitness_function, 3, generations=40, num_children=4, random_seed=5, vectorized=True,
+          reporter=reports.append, surrogate=surrogate, **options).run()
+    return evaluations, reports
+
+
+def test_archive_is_bounded():
+    """Test whether the archive evicts the oldest points and keeps its model consistent."""
+    surrogate = Surrogate(archive_size=10, cross_terms=False)
+    random = np.random.RandomState(0)
+    for _ in range(3):
+        surrogate.add(random.randn(7, 2), random.randn(7))
+    genotypes = random.randn(4, 2)
+    surrogate.add(genotypes, np.array([1.0, np.nan, 2.0, 3.0]))
+    gram = surrogate._gram.copy()
+    surrogate._refit()
+
+    assert len(surrogate) == 10
+    assert np.array_equal(surrogate._genotypes[[1, 2, 3]], genotypes[[0, 2, 3]])
+    assert np.allclose(gram, surrogate._gram)
+
+
+def test_predicts_quadratic_functions():
+    """Test whether a quadratic function with cross terms is predicted exactly."""
+    def fitness_function(genotypes):
+        return (genotypes[:, 0] - 1) ** 2 + genotypes[:, 0] * genotypes[:, 1] + 3
+
+    random = np.random.RandomState(1)
+    surrogate = Surrogate()
+    assert not surrogate.ready()
+    genotypes = random.randn(20, 2)
+    surrogate.add(genotypes, fitness_function(genotypes))
+    assert surrogate.cross_terms and surrogate.ready()
+
+    genotypes = random.randn(5, 2)
+    assert np.allclose(surrogate.predict(genotypes), fitness_function(genotypes))
+    assert np.array_equal(surrogate.screen(genotypes, minimum=2),
+                          np.sort(np.argsort(fitness_function(genotypes))[:3]))
+    assert np.array_equal(surrogate.screen(genotypes, maximize=True),
+                          np.sort(np.argsort(fitness_function(genotypes))[2:]))
+    assert surrogate.saved_evaluations == 4
+
+
+def test_saves_evaluations():
+    """Test whether pre-screening evaluates fewer children and reports the savings."""
+    baseline_evaluations, baseline_reports = _run(None)
+    evaluations, reports = _run(Surrogate(fraction=0.25))
+
+    assert baseline_reports[0].saved_evaluations is None
+    assert sum(evaluations) < sum(baseline_evaluations) / 2
+    assert sum(evaluations) + sum(report.saved_evaluations for report in reports) \
+        == sum(baseline_evaluations)
+    assert reports[-1].best_fitness <= baseline_reports[-1].best_fitness
+
+
+def test_keeps_enough_children():
+    """Test whether enough children are evaluated for comma selection and CMA."""
+    evaluations, _ = _run(Surrogate(fraction=0.1), selection=CommaSelection())
+    assert min(evaluations) == 30
+    evaluations, _ = _run(Surrogate(fraction=0.1), strategy=Strategy.CMA)
+    assert min(evaluations) == 60
+
+
+@raises(ValueError)
+def test_invalid_fraction():
+    """Test whether an error is raised when no children would be evaluated."""
+    Surrogate(fraction=0)
@@ -0,0 +1,159 @@
+"""Tests for stagnation-aware termination and restarts."""
+import os
+import tempfile
+
+import numpy as np
+from nose.tools import raises
+
+from evopy import Checkpointer, EvoPy, IslandModel, Strategy, Termination
+
+
+class _Preempted(Exception):
+    """Raised by a reporter to simulate the run being killed."""
+
+
+def _sphere(genotypes):
+    return np.sum(genotypes ** 2, axis=1)
+
+
+def _rastrigin(genotypes):
+    return 10 * genotypes.shape[1] \
+        + np.sum(genotypes ** 2 - 10 * np.cos(2 * np.pi * genotypes), axis=1)
+
+
+def test_tolerance():
+    """Test whether a converged run stops once its fitness stalls within the tolerance."""
+    reports = []
+    termination = Termination(tolerance=1e-12)
+    EvoPy(_sphere, 3, generations=1000, strategy=Strategy.CMA, random_seed=42, vectorized=True,
+          termination=termination, reporter=reports.append).run()
+    assert termination.reason == 'tolerance'
+    assert len(reports) < 1000
+    assert reports[-1].best_fitness < 1e-12
+    assert reports[-1].restarts == 0
+
+
+def test_step_size_collapse():
+    """Test whether a run stops once the step sizes of the best individual stay at their minimum."""
+    reports = []
+    termination = Termination()
+    evopy = EvoPy(_sphere, 3, generations=1000, random_seed=42, vectorized=True,
+                  termination=termination, reporter=reports.append)
+    evopy.run()
+    assert termination.reason == 'step_size'
+    assert len(reports) < 1000
+    assert np.all(evopy._step_sizes()[0] <= 0.01)
+
+
+def test_evaluation_budget():
+    """Test whether a run stops once it has used up its evaluation budget."""
+    batches = []
+
+    def fitness(genotypes):
+        batches.append(len(genotypes))
+        return _sphere(genotypes)
+
+    termination = Termination(max_evaluations=500)
+    EvoPy(fitness, 3, generations=1000, random_seed=42, vectorized=True,
+          termination=termination).run()
+    assert termination.reason == 'evaluations'
+    assert 500 <= sum(batches) < 500 + 30
+
+
+def test_restarts_grow_population():
+    """Test whether stagnated runs restart with a larger population, keeping the best so far."""
+    batches = []
+
+    def fitness(genotypes):
+        batches.append(len(genotypes))
+        return _rastrigin(genotypes)
+
+    reports = []
+    termination = Termination(tolerance=1e-8, restarts=3, population_growth=2)
+    EvoPy(fitness, 4, generations=2000, strategy=Strategy.CMA, std=3, random_seed=42,
+          vectorized=True, termination=termination, reporter=reports.append).run()
+    assert termination.num_restarts == 3
+    assert sorted(set(batches)) == [30, 60, 120, 240]
+    assert [report.restarts for report in reports] == sorted(report.restarts for report in reports)
+    fitness = [report.best_fitness for report in reports]
+    assert fitness == sorted(fitness, reverse=True)
+
+    without_restarts = EvoPy(_rastrigin, 4, generations=2000, strategy=Strategy.CMA, std=3,
+                             random_seed=42, vectorized=True,
+                             termination=Termination(tolerance=1e-8)).run()
+    assert fitness[-1] < _rastrigin(without_restarts[np.newaxis])[0]
+
+
+def test_no_criteria():
+    """Test whether a run without any termination criteria is unchanged."""
+    expected = EvoPy(_sphere, 3, generations=50, random_seed=42, vectorized=True).run()
+    result = EvoPy(_sphere, 3, generations=50, random_seed=42, vectorized=True,
+                   termination=Termination(collapse=False, restarts=2)).run()
+    assert np.array_equal(expected, result)
+
+
+def test_resume_after_restart():
+    """Test whether a run which restarted resumes exactly like an uninterrupted run."""
+    def create(**options):
+        return EvoPy(_rastrigin, 2, generations=300, strategy=Strategy.CMA, std=3,
+                     random_seed=42, vectorized=True,
+                     termination=Termination(tolerance=1e-8, restarts=3), **options)
+
+    reports = []
+    expected = create(reporter=reports.append).run()
+    restart = next(report.generation for report in reports if report.restarts > 0)
+
+    def preempt(report):
+        if report.generation == restart + 10:
+            raise _Preempted()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'run.npz')
+        try:
+            create(reporter=preempt, checkpoint=Checkpointer(path, every=5)).run()
+        except _Preempted:
+            pass
+        resumed = []
+        result = create(reporter=resumed.append).resume(path)
+    assert np.array_equal(expected, result)
+    assert [report.restarts for report in resumed] \
+        == [report.restarts for report in reports[-len(resumed):]]
+
+
+def _logged_sphere(genotypes):
+    """A sphere fitness function which logs the number of genotypes per call to a file."""
+    with open(os.environ['EVOPY_TEST_BATCHES'], 'a', encoding='utf-8') as batches:
+        batches.write('%d\n' % len(genotypes))
+    return _sphere(genotypes)
+
+
+def test_islands_restart():
+    """Test whether islands keep migrating when their runs restart."""
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for num_migrants in [1, 0]:
+            path = os.path.join(directory, 'batches%d.txt' % num_migrants)
+            os.environ['EVOPY_TEST_BATCHES'] = path
+            try:
+                reports = []
+                results.append(IslandModel(
+                    _logged_sphere, 2, num_islands=2, migration_interval=5,
+                    num_migrants=num_migrants, generations=150, random_seed=42, vectorized=True,
+                    reporter=reports.append, termination=Termination(restarts=10)).run())
+            finally:
+                del os.environ['EVOPY_TEST_BATCHES']
+            assert len(reports) == 150
+            assert 60 in np.loadtxt(path, dtype=int)
+    assert not np.array_equal(results[0], results[1])
+
+
+@raises(ValueError)
+def test_invalid_window():
+    """Test whether an error is raised when the window is empty."""
+    Termination(window=0)
+
+
+@raises(ValueError)
+def test_shrinking_population():
+    """Test whether an error is raised when the population would shrink on restarts."""
+    Termination(population_growth=0.5)